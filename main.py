@@ -1,21 +1,85 @@
+import argparse
+import sys
+
 from src.config import Config
 from src.assistant import Assistant
 
 def main():
+    parser = argparse.ArgumentParser(description="NOVA virtual assistant")
+    parser.add_argument("--async-pipeline", action="store_true",
+                        help="Keep listening while earlier requests are handled")
+    parser.add_argument("--listen-while-speaking", action="store_true",
+                        help="Keep the microphone open while --async-pipeline speaks "
+                             "(headset or echo-cancelling setups only)")
+    parser.add_argument("--headless", action="store_true",
+                        help="Process JSONL utterances without audio and write JSONL results to stdout")
+    parser.add_argument("--input", help="JSONL input file for --headless (defaults to stdin)")
+    parser.add_argument("--workers", type=int, default=4, help="Concurrent utterances for --headless")
+    parser.add_argument("--server", action="store_true",
+                        help="Serve concurrent text sessions over local HTTP without audio")
+    parser.add_argument("--port", type=int, help="Port for --server (defaults to SERVER_PORT)")
+    args = parser.parse_args()
+    
     try:
         # Initialize configuration
         config = Config()
         
+        if args.headless:
+            from src.headless import HeadlessRunner
+            assistant = Assistant(config, enable_speech=False)
+            # Batch results should not depend on when the transformer finished loading
+            assistant.intent_classifier.load_transformer()
+            
+            # Classify intents in forked processes when NLU_WORKERS is set
+            intent_pool = None
+            if config.get('nlu', 'workers', 0) > 0:
+                from src.nlu.worker_pool import IntentWorkerPool
+                intent_pool = IntentWorkerPool(assistant.intent_classifier,
+                                               n_workers=config.get('nlu', 'workers'),
+                                               torch_threads=config.get('nlu', 'worker_threads', 1))
+            
+            runner = HeadlessRunner(assistant, workers=args.workers, intent_pool=intent_pool)
+            try:
+                if args.input:
+                    with open(args.input, 'r', encoding='utf-8') as f:
+                        runner.run_stream(f, sys.stdout)
+                else:
+                    runner.run_stream(sys.stdin, sys.stdout)
+            finally:
+                if intent_pool is not None:
+                    intent_pool.shutdown()
+            return
+        
+        if args.server:
+            from src.server import AssistantServer
+            assistant = Assistant(config, enable_speech=False)
+            server = AssistantServer(
+                assistant,
+                host=config.get('server', 'host', '127.0.0.1'),
+                port=args.port or config.get('server', 'port', 8765),
+                max_sessions=config.get('server', 'max_sessions', 64),
+                idle_timeout=config.get('server', 'idle_timeout', 900),
+                max_inflight=config.get('server', 'max_inflight', 8),
+                queue_timeout=config.get('server', 'queue_timeout', 5),
+                persist_sessions=config.get('server', 'persist_sessions', True)
+            )
+            server.serve_forever()
+            return
+        
         # Create and start assistant
         assistant = Assistant(config)
         
         print("Starting virtual assistant...")
-        assistant.start()
+        if args.async_pipeline:
+            from src.async_assistant import AsyncAssistant
+            AsyncAssistant(assistant, listen_while_speaking=args.listen_while_speaking).start()
+        else:
+            assistant.start()
         
     except KeyboardInterrupt:
         print("\nShutting down...")
     except Exception as e:
-        print(f"Error: {str(e)}")
+        print(f"Error: {str(e)}", file=sys.stderr if args.headless else sys.stdout)
         
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -1,24 +1,32 @@
 import logging
-from typing import Dict, Any, Optional, List
+from typing import Dict, Any, Optional, List, Callable
 from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
 import json
+import queue
+import time
 
 from src.config import Config
-from src.speech.speech_to_text import SpeechToText
-from src.speech.text_to_speech import TextToSpeech
 from src.nlu.intent_classifier import IntentClassifier
 from src.nlu.entity_extractor import EntityExtractor
+from src.nlu.pipeline import NLUPipeline
+from src.handler_registry import HandlerRegistry
 from src.tasks.reminder import ReminderService
 from src.tasks.weather import WeatherService
 from src.tasks.email_sender import EmailSender
+from src.utils.metrics import MetricsRecorder
+from src.utils.model_registry import model_registry
+from src.utils.context_manager import ContextManager
 
 class Assistant:
-    def __init__(self, config: Config):
+    def __init__(self, config: Config, enable_speech: bool = True):
         """
         Initialize the virtual assistant.
         
         Args:
             config (Config): Application configuration object
+            enable_speech (bool): Set up the microphone and TTS engine; without
+                them only text input through handle_input and process_text works
         """
         # Set up logging
         self.logger = logging.getLogger(__name__)
@@ -28,21 +36,84 @@ class Assistant:
             # Initialize configuration
             self.config = config
             
-            # Initialize core services
-            self.speech_to_text = SpeechToText()
-            self.text_to_speech = TextToSpeech()
-            self.intent_classifier = IntentClassifier()
-            self.entity_extractor = EntityExtractor()
+            # Per-stage latency histograms (no-ops unless enabled)
+            self.metrics = MetricsRecorder(
+                enabled=config.get('metrics', 'enabled', False),
+                window=config.get('metrics', 'window', 300)
+            )
             
-            # Initialize task services
-            self.reminder_service = ReminderService(config)
-            self.weather_service = WeatherService(config)
-            self.email_service = EmailSender(config)
+            # Build NLU and task services concurrently; speech I/O stays on this thread
+            with ThreadPoolExecutor(max_workers=5, thread_name_prefix="assistant-init") as pool:
+                intent_future = pool.submit(
+                    IntentClassifier,
+                    model_name=config.get('nlu', 'intent_model', 'distilbert-base-uncased'),
+                    intents_file=config.get('nlu', 'intents_file'),
+                    backend=config.get('nlu', 'backend', 'fp32'),
+                    check_parity=config.get('nlu', 'check_parity', False),
+                    load_mode=config.get('nlu', 'load_mode', 'background'),
+                    use_head=config.get('nlu', 'use_head', False)
+                )
+                entity_future = pool.submit(
+                    EntityExtractor,
+                    model_name=config.get('nlu', 'spacy_model', 'en_core_web_sm'),
+                    profile=config.get('nlu', 'spacy_profile', 'ner-only'),
+                    use_gazetteer=config.get('nlu', 'use_gazetteer', True),
+                    gazetteer_path=config.get('nlu', 'gazetteer_file'),
+                    gazetteer_min_population=config.get('nlu', 'gazetteer_min_population', 100000),
+                    cache_size=config.get('nlu', 'entity_cache_size', 1024),
+                    language=config.get('speech', 'language', 'en-US'),
+                    language_models=config.get('nlu', 'language_models'),
+                    detect_language=config.get('nlu', 'detect_language', False),
+                    max_loaded_languages=config.get('nlu', 'max_loaded_languages', 2),
+                    language_idle_timeout=config.get('nlu', 'language_idle_timeout', 600)
+                )
+                reminder_future = pool.submit(ReminderService, config)
+                weather_future = pool.submit(WeatherService, config)
+                email_future = pool.submit(EmailSender, config)
+                
+                # Initialize core services
+                self.speech_to_text = None
+                self.text_to_speech = None
+                if enable_speech:
+                    # Imported here so headless use needs no audio libraries
+                    from src.speech.speech_to_text import SpeechToText
+                    from src.speech.text_to_speech import TextToSpeech
+                    self.speech_to_text = SpeechToText()
+                    self.text_to_speech = TextToSpeech()
+                self.intent_classifier = intent_future.result()
+                self.entity_extractor = entity_future.result()
+                
+                # Initialize task services
+                self.reminder_service = reminder_future.result()
+                self.weather_service = weather_future.result()
+                self.email_service = email_future.result()
+            
+            # Single-pass NLU over the classifier and extractor
+            self.nlu = NLUPipeline(
+                self.intent_classifier, self.entity_extractor,
+                parallel=config.get('nlu', 'parallel', True),
+                max_workers=config.get('nlu', 'threads', 4)
+            )
+            
+            # Intent handlers; handlers calling external services get deadlines
+            self.handlers = HandlerRegistry(
+                max_workers=config.get('handlers', 'workers', 4),
+                default_deadline=config.get('handlers', 'deadline', 5.0)
+            )
+            self._register_builtin_handlers()
+            self.handlers.load_modules(config.get('handlers', 'modules', []), self)
+            
+            # Results of handlers that missed their deadline, spoken when they arrive
+            self.late_responses: "queue.Queue[str]" = queue.Queue()
+            self.late_response_callback: Optional[Callable[[str], None]] = None
             
             # State management
             self.conversation_context = {}
             self.is_listening = False
             
+            if self.metrics.enabled:
+                self._start_metrics_export()
+            
             self.logger.info("Assistant initialized successfully")
             
         except Exception as e:
@@ -56,15 +127,56 @@ class Assistant:
             format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
         )
     
+    def _start_metrics_export(self):
+        """Start the configured metrics endpoint and file writer"""
+        try:
+            port = self.config.get('metrics', 'port', 0)
+            if port:
+                self.metrics.start_server(port)
+            
+            file_path = self.config.get('metrics', 'file')
+            if file_path:
+                self.metrics.start_file_writer(file_path, self.config.get('metrics', 'file_interval', 10))
+        except Exception as e:
+            self.logger.error(f"Error starting metrics export: {str(e)}")
+    
+    def listen(self) -> Dict[str, Any]:
+        """
+        Listen for one utterance, timing it as the "listen" stage.
+        
+        Returns:
+            Dict[str, Any]: Speech recognition result
+        """
+        started = time.perf_counter()
+        speech_result = self.speech_to_text.listen()
+        self.metrics.record("listen", (time.perf_counter() - started) * 1000,
+                            error=not speech_result["success"])
+        return speech_result
+    
+    def speak(self, text: str):
+        """
+        Speak a response, timing it as the "speak" stage.
+        
+        Args:
+            text (str): Text to speak
+        """
+        with self.metrics.span("speak"):
+            self.text_to_speech.speak(text)
+    
     def start(self):
         """Start the assistant"""
+        if self.speech_to_text is None or self.text_to_speech is None:
+            raise RuntimeError("The assistant was created without speech I/O")
+        
         try:
             self.is_listening = True
-            self.text_to_speech.speak("Hello! How can I help you today?")
+            self.speak("Hello! How can I help you today?")
             
             while self.is_listening:
+                self._speak_late_responses()
+                
                 # Listen for user input
-                speech_result = self.speech_to_text.listen()
+                speech_result = self.listen()
                 
                 if speech_result["success"]:
                     user_input = speech_result["text"]
@@ -74,7 +186,7 @@ class Assistant:
                     self.process_input(user_input)
                 else:
                     self.logger.error(f"Speech recognition error: {speech_result['error']}")
-                    self.text_to_speech.speak("I'm sorry, I didn't catch that. Could you please repeat?")
+                    self.speak("I'm sorry, I didn't catch that. Could you please repeat?")
         
         except KeyboardInterrupt:
             self.stop()
@@ -89,88 +201,216 @@ class Assistant:
         Args:
             user_input (str): User's speech input
         """
-        try:
-            # Classify intent
-            intent_result = self.intent_classifier.classify(user_input)
-            intent = intent_result["intent"]
-            confidence = intent_result["confidence"]
+        response = self.handle_input(user_input)
+        
+        # Speak response
+        if response and self.text_to_speech is not None:
+            self.speak(response)
+    
+    def _speak_late_responses(self):
+        """Speak results of slow handlers that arrived since the last turn"""
+        while True:
+            try:
+                response = self.late_responses.get_nowait()
+            except queue.Empty:
+                return
+            self.speak(response)
+    
+    def _deliver_late_response(self, intent: str, response: Optional[str]):
+        """
+        Deliver the result of a handler that missed its deadline.
+        
+        Args:
+            intent (str): Intent of the handler
+            response (Optional[str]): Handler response
+        """
+        if not response:
+            return
+        
+        self.logger.info(f"Late response for intent {intent} arrived")
+        if self.late_response_callback is not None:
+            self.late_response_callback(response)
+        else:
+            self.late_responses.put(response)
+    
+    def handle_input(self, user_input: str) -> Optional[str]:
+        """
+        Understand user input and run the matching task, without speaking.
+        
+        Args:
+            user_input (str): User's speech or text input
+            
+        Returns:
+            Optional[str]: Response for the user
+        """
+        return self.process_text(user_input)["response"]
+    
+    def process_text(self, user_input: str, wait_for_handlers: bool = False,
+                     context: Optional[ContextManager] = None,
+                     on_late_result: Optional[Callable[[str, Optional[str]], None]] = None,
+                     intent_result: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """
+        Understand user input and run the matching task, reporting every stage.
+        
+        Args:
+            user_input (str): User's speech or text input
+            wait_for_handlers (bool): Wait for slow handlers instead of answering
+                with their pending response once the deadline passes
+            context (Optional[ContextManager]): Conversation context of the
+                session the input belongs to (defaults to the assistant's own)
+            on_late_result (Optional[Callable[[str, Optional[str]], None]]): Receives
+                the intent and response of a handler that misses its deadline
+                (defaults to speaking it on the next turn)
+            intent_result (Optional[Dict[str, Any]]): Intent classification
+                computed elsewhere, e.g. by an IntentWorkerPool
             
-            self.logger.info(f"Detected intent: {intent} (confidence: {confidence:.2f})")
+        Returns:
+            Dict[str, Any]: Intent, confidence, entities, response and
+                per-stage timings in milliseconds
+        """
+        result = {
+            "text": user_input,
+            "intent": None,
+            "confidence": 0.0,
+            "entities": {},
+            "response": None,
+            "timings_ms": {}
+        }
+        started = time.perf_counter()
+        tier = None
+        
+        try:
+            # Classify intent and extract the entities it needs in one pass
+            analysis = self.nlu.analyze(user_input, intent_result=intent_result)
+            tier = analysis.tier
+            intent = analysis.intent
+            entities = analysis.entities
+            result.update(intent=intent, confidence=analysis.confidence, entities=entities)
+            result["timings_ms"].update(analysis.timings_ms)
             
-            # Extract entities
-            entities = self.entity_extractor.extract_entities(user_input)
+            self.logger.info(f"Detected intent: {intent} (confidence: {analysis.confidence:.2f})")
             
             # Update conversation context
-            self.conversation_context.update({
-                "last_intent": intent,
-                "last_entities": entities,
-                "timestamp": datetime.now().isoformat()
-            })
+            if context is None:
+                self.conversation_context.update({
+                    "last_intent": intent,
+                    "last_entities": entities,
+                    "timestamp": datetime.now().isoformat()
+                })
+            else:
+                context.update_context({"last_intent": intent, "last_entities": entities})
+                context.add_to_history(user_input, speaker="user", intent=intent)
             
             # Handle intent
-            response = self._handle_intent(intent, entities)
+            handler_started = time.perf_counter()
+            result["response"] = self._handle_intent(intent, entities, wait=wait_for_handlers,
+                                                     on_late_result=on_late_result)
+            result["timings_ms"]["handler"] = (time.perf_counter() - handler_started) * 1000
             
-            # Speak response
-            if response:
-                self.text_to_speech.speak(response)
+            if context is not None and result["response"]:
+                context.add_to_history(result["response"], speaker="assistant", intent=intent)
+            
+            # A farewell ends the assistant's own conversation; a session's
+            # farewell is left to whoever owns the session
+            if intent == "farewell" and context is None:
+                self.stop()
             
         except Exception as e:
             self.logger.error(f"Error processing input: {str(e)}")
-            self.text_to_speech.speak("I'm sorry, I encountered an error processing your request.")
+            result["response"] = "I'm sorry, I encountered an error processing your request."
+            result["error"] = str(e)
+        
+        result["timings_ms"]["total"] = (time.perf_counter() - started) * 1000
+        self._record_turn(result, tier)
+        return result
     
-    def _handle_intent(self, intent: str, entities: Dict[str, Any]) -> str:
+    def _record_turn(self, result: Dict[str, Any], tier: Optional[str]):
         """
-        Handle different intents and generate appropriate responses.
+        Record the stage timings of a processed utterance.
+        
+        Args:
+            result (Dict[str, Any]): Result of process_text
+            tier (Optional[str]): Classifier tier that decided the intent
+        """
+        if not self.metrics.enabled:
+            return
+        
+        intent = result["intent"]
+        timings = result["timings_ms"]
+        for stage in ("intent", "entities", "nlu"):
+            if stage in timings:
+                self.metrics.record(stage, timings[stage], intent=intent)
+        if tier:
+            self.metrics.record(f"intent.{tier}", timings["intent"])
+        if "handler" in timings:
+            self.metrics.record("handler", timings["handler"], intent=intent,
+                                error=result["response"] == HandlerRegistry.ERROR_RESPONSE)
+        self.metrics.record("turn", timings["total"], intent=intent, error="error" in result)
+    
+    def _register_builtin_handlers(self):
+        """Register the handlers of the built-in intents"""
+        self.handlers.register("greeting", lambda entities: "Hello! How can I help you today?", deadline=None)
+        self.handlers.register("farewell", self._handle_farewell_intent, deadline=None)
+        self.handlers.register("weather", self._handle_weather_intent,
+                               pending_response="I'm still checking the weather, I'll tell you in a moment.")
+        self.handlers.register("reminder", self._handle_reminder_intent)
+        self.handlers.register("email", self._handle_email_intent,
+                               pending_response="I'm still sending your email, I'll let you know once it's out.")
+    
+    def _handle_intent(self, intent: str, entities: Dict[str, Any], wait: bool = False,
+                       on_late_result: Optional[Callable[[str, Optional[str]], None]] = None) -> str:
+        """
+        Dispatch an intent to its registered handler.
         
         Args:
             intent (str): Classified intent
             entities (Dict[str, Any]): Extracted entities
+            wait (bool): Wait for the handler even past its deadline
+            on_late_result (Optional[Callable[[str, Optional[str]], None]]): Receives
+                a late handler result (defaults to _deliver_late_response)
             
         Returns:
             str: Response to be spoken
         """
         try:
-            if intent == "greeting":
-                return "Hello! How can I help you today?"
-            
-            elif intent == "farewell":
-                self.stop()
-                return "Goodbye! Have a great day!"
-            
-            elif intent == "weather":
-                return self._handle_weather_intent(entities)
-            
-            elif intent == "reminder":
-                return self._handle_reminder_intent(entities)
-            
-            elif intent == "email":
-                return self._handle_email_intent(entities)
-            
-            else:
-                return "I'm not sure how to help with that yet."
+            return self.handlers.dispatch(intent, entities,
+                                          on_late_result=on_late_result or self._deliver_late_response,
+                                          wait=wait)
             
         except Exception as e:
             self.logger.error(f"Error handling intent {intent}: {str(e)}")
             return "I'm sorry, I encountered an error handling your request."
     
+    def _handle_farewell_intent(self, entities: Dict[str, Any]) -> str:
+        """Handle farewell intents (process_text stops the assistant afterwards)"""
+        return "Goodbye! Have a great day!"
+    
     def _handle_weather_intent(self, entities: Dict[str, Any]) -> str:
         """Handle weather-related intents"""
         try:
-            location = None
-            for entity in entities.get("GPE", []):  # Location entities
-                location = entity["text"]
+            location = place = None
+            for entity in entities.get("standard", []):  # Location entities
+                if entity["label"] != "GPE":
+                    continue
+                place = entity.get("canonical", entity["text"])
+                if "latitude" in entity:
+                    # Gazetteer matches skip the geocoding request
+                    location = f"{entity['latitude']},{entity['longitude']}"
+                else:
+                    location = place
                 break
             
             if not location:
                 return "Which city would you like to know the weather for?"
             
-            weather = self.weather_service.get_current_weather(location)
+            with self.metrics.span("weather_api"):
+                weather = self.weather_service.get_current_weather(location)
             if weather:
                 return (f"The current weather in {weather.location} is "
                        f"{weather.temperature:.1f}°C with {weather.description}. "
                        f"The humidity is {weather.humidity}%.")
             else:
-                return f"I'm sorry, I couldn't get the weather information for {location}."
+                return f"I'm sorry, I couldn't get the weather information for {place}."
             
         except Exception as e:
             self.logger.error(f"Error handling weather intent: {str(e)}")
@@ -229,6 +469,8 @@ class Assistant:
     def stop(self):
         """Stop the assistant"""
         self.is_listening = False
+        if self.metrics.enabled and self.config.get('metrics', 'file'):
+            self.metrics.write_file(self.config.get('metrics', 'file'))
         self.logger.info("Assistant stopped")
     
     def get_status(self) -> Dict[str, Any]:
@@ -240,6 +482,9 @@ class Assistant:
         """
         return {
             "is_listening": self.is_listening,
+            "handlers": self.handlers.get_stats(),
+            "metrics": self.metrics.get_snapshot(),
+            "models": model_registry.get_memory_report(),
             "conversation_context": self.conversation_context,
             "last_update": datetime.now().isoformat()
         }
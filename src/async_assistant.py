@@ -0,0 +1,193 @@
+import asyncio
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict
+
+from src.assistant import Assistant
+
+# Marks the end of a stage's input
+_STOP = object()
+
+class AsyncAssistant:
+    def __init__(self,
+                 assistant: Assistant,
+                 queue_size: int = 4,
+                 listen_while_speaking: bool = False):
+        """
+        Initialize an asyncio pipeline around an assistant.
+
+        Capture, understanding/task execution and speech run as concurrent
+        stages connected by bounded queues, so the microphone keeps listening
+        while earlier utterances are still being handled. Capture pauses while
+        a response is spoken unless listen_while_speaking is set. Blocking
+        libraries run in executors; the microphone and the TTS engine each get
+        a dedicated thread because neither is safe to drive from several threads.
+
+        Args:
+            assistant (Assistant): Assistant providing speech I/O and handle_input
+            queue_size (int): Maximum number of items waiting between two stages
+            listen_while_speaking (bool): Keep capturing while a response is spoken;
+                only for full-duplex setups (headset or echo cancellation), as
+                a microphone near the speaker hears the assistant's own voice
+        """
+        # Set up logging
+        self.logger = logging.getLogger(__name__)
+        self._setup_logging()
+
+        self.assistant = assistant
+        self.queue_size = queue_size
+        self.listen_while_speaking = listen_while_speaking
+
+        self.capture_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="assistant-capture")
+        self.task_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="assistant-task")
+        self.speech_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="assistant-speech")
+
+        self.stats = {"captured": 0, "handled": 0, "spoken": 0, "capture_errors": 0, "discarded": 0}
+        # Responses whose speech has started, to spot captures overlapping speech
+        self._speech_count = 0
+
+    def _setup_logging(self):
+        """Configure logging for the async assistant"""
+        logging.basicConfig(
+            level=logging.INFO,
+            format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+        )
+
+    async def run(self):
+        """Run the pipeline until the assistant is stopped"""
+        utterances: asyncio.Queue = asyncio.Queue(maxsize=self.queue_size)
+        responses: asyncio.Queue = asyncio.Queue(maxsize=self.queue_size)
+        self._not_speaking = asyncio.Event()
+        self._not_speaking.set()
+
+        self.assistant.is_listening = True
+        await responses.put("Hello! How can I help you today?")
+
+        # Results of slow handlers join the speech queue when they arrive
+        loop = asyncio.get_running_loop()
+        self.assistant.late_response_callback = (
+            lambda response: asyncio.run_coroutine_threadsafe(responses.put(response), loop)
+        )
+
+        try:
+            await asyncio.gather(
+                self._capture_stage(utterances, responses),
+                self._task_stage(utterances, responses),
+                self._speech_stage(responses)
+            )
+        finally:
+            self.assistant.late_response_callback = None
+            self.assistant.stop()
+            for executor in (self.capture_executor, self.task_executor, self.speech_executor):
+                executor.shutdown(wait=False)
+
+    async def _capture_stage(self, utterances: asyncio.Queue, responses: asyncio.Queue):
+        """
+        Listen continuously and queue recognized utterances.
+
+        Args:
+            utterances (asyncio.Queue): Output queue of recognized text
+            responses (asyncio.Queue): Speech queue, used for "didn't catch that" replies
+        """
+        loop = asyncio.get_running_loop()
+        try:
+            while self.assistant.is_listening:
+                if not self.listen_while_speaking:
+                    await self._not_speaking.wait()
+                speech_count = self._speech_count
+
+                speech_result = await loop.run_in_executor(
+                    self.capture_executor, self.assistant.listen
+                )
+                if not self.assistant.is_listening:
+                    break
+
+                # A response started while the microphone was open; what it
+                # heard may be the assistant itself
+                if not self.listen_while_speaking and (
+                        speech_count != self._speech_count or not self._not_speaking.is_set()):
+                    self.logger.info("Discarding capture that overlapped speech")
+                    self.stats["discarded"] += 1
+                    continue
+
+                if speech_result["success"]:
+                    self.logger.info(f"User said: {speech_result['text']}")
+                    self.stats["captured"] += 1
+                    await utterances.put(speech_result["text"])
+                else:
+                    self.logger.error(f"Speech recognition error: {speech_result['error']}")
+                    self.stats["capture_errors"] += 1
+                    await responses.put("I'm sorry, I didn't catch that. Could you please repeat?")
+        except Exception as e:
+            self.logger.error(f"Error in capture stage: {str(e)}")
+            self.assistant.stop()
+        finally:
+            await utterances.put(_STOP)
+
+    async def _task_stage(self, utterances: asyncio.Queue, responses: asyncio.Queue):
+        """
+        Understand utterances and run their tasks, in arrival order.
+
+        Args:
+            utterances (asyncio.Queue): Input queue of recognized text
+            responses (asyncio.Queue): Output queue of responses to speak
+        """
+        loop = asyncio.get_running_loop()
+        try:
+            while True:
+                user_input = await utterances.get()
+                if user_input is _STOP:
+                    break
+
+                response = await loop.run_in_executor(
+                    self.task_executor, self.assistant.handle_input, user_input
+                )
+                self.stats["handled"] += 1
+                if response:
+                    await responses.put(response)
+        except Exception as e:
+            self.logger.error(f"Error in task stage: {str(e)}")
+            self.assistant.stop()
+        finally:
+            await responses.put(_STOP)
+
+    async def _speech_stage(self, responses: asyncio.Queue):
+        """
+        Speak responses one at a time.
+
+        Args:
+            responses (asyncio.Queue): Input queue of responses to speak
+        """
+        loop = asyncio.get_running_loop()
+        while True:
+            response = await responses.get()
+            if response is _STOP:
+                break
+
+            self._not_speaking.clear()
+            self._speech_count += 1
+            try:
+                await loop.run_in_executor(
+                    self.speech_executor, self.assistant.speak, response
+                )
+                self.stats["spoken"] += 1
+            except Exception as e:
+                self.logger.error(f"Error in speech stage: {str(e)}")
+            finally:
+                self._not_speaking.set()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get pipeline counters.
+
+        Returns:
+            Dict[str, Any]: Captured, handled, spoken and discarded utterance counts
+        """
+        return dict(self.stats)
+
+    def start(self):
+        """Run the pipeline on a new event loop, blocking until it stops"""
+        try:
+            asyncio.run(self.run())
+        except KeyboardInterrupt:
+            self.assistant.stop()
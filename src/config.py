@@ -24,6 +24,10 @@ class Config:
         self.speech = self._load_speech_config()
         self.database = self._load_database_config()
         self.api_keys = self._load_api_config()
+        self.nlu = self._load_nlu_config()
+        self.handlers = self._load_handlers_config()
+        self.metrics = self._load_metrics_config()
+        self.server = self._load_server_config()
     
     def _setup_logging(self):
         """Configure logging"""
@@ -95,6 +99,63 @@ class Config:
             'news_api_key': os.getenv('NEWS_API_KEY')
         }
     
+    def _load_nlu_config(self) -> Dict[str, Any]:
+        """Load natural language understanding configuration"""
+        return {
+            'intent_model': os.getenv('NLU_INTENT_MODEL', 'distilbert-base-uncased'),
+            'intents_file': os.getenv('NLU_INTENTS_FILE'),
+            'backend': os.getenv('NLU_BACKEND', 'fp32'),
+            'check_parity': os.getenv('NLU_CHECK_PARITY', 'False').lower() == 'true',
+            'load_mode': os.getenv('NLU_LOAD_MODE', 'background'),
+            'use_head': os.getenv('NLU_USE_HEAD', 'False').lower() == 'true',
+            'workers': int(os.getenv('NLU_WORKERS', '0')),
+            'worker_threads': int(os.getenv('NLU_WORKER_THREADS', '1')),
+            'spacy_model': os.getenv('NLU_SPACY_MODEL', 'en_core_web_sm'),
+            'spacy_profile': os.getenv('NLU_SPACY_PROFILE', 'ner-only'),
+            'use_gazetteer': os.getenv('NLU_USE_GAZETTEER', 'True').lower() == 'true',
+            'gazetteer_file': os.getenv('NLU_GAZETTEER_FILE'),
+            'gazetteer_min_population': int(os.getenv('NLU_GAZETTEER_MIN_POPULATION', '100000')),
+            'entity_cache_size': int(os.getenv('NLU_ENTITY_CACHE_SIZE', '1024')),
+            'language_models': dict(
+                item.split('=', 1) for item in os.getenv('NLU_LANGUAGE_MODELS', '').split(',') if '=' in item
+            ),
+            'detect_language': os.getenv('NLU_DETECT_LANGUAGE', 'False').lower() == 'true',
+            'max_loaded_languages': int(os.getenv('NLU_MAX_LOADED_LANGUAGES', '2')),
+            'language_idle_timeout': float(os.getenv('NLU_LANGUAGE_IDLE_TIMEOUT', '600')),
+            'parallel': os.getenv('NLU_PARALLEL', 'True').lower() == 'true',
+            'threads': int(os.getenv('NLU_THREADS', '4'))
+        }
+    
+    def _load_handlers_config(self) -> Dict[str, Any]:
+        """Load intent handler configuration"""
+        return {
+            'workers': int(os.getenv('HANDLER_WORKERS', '4')),
+            'deadline': float(os.getenv('HANDLER_DEADLINE', '5')),
+            'modules': [name.strip() for name in os.getenv('HANDLER_MODULES', '').split(',') if name.strip()]
+        }
+    
+    def _load_metrics_config(self) -> Dict[str, Any]:
+        """Load latency metrics configuration"""
+        return {
+            'enabled': os.getenv('METRICS_ENABLED', 'False').lower() == 'true',
+            'window': float(os.getenv('METRICS_WINDOW', '300')),
+            'port': int(os.getenv('METRICS_PORT', '0')),
+            'file': os.getenv('METRICS_FILE') or None,
+            'file_interval': float(os.getenv('METRICS_FILE_INTERVAL', '10'))
+        }
+    
+    def _load_server_config(self) -> Dict[str, Any]:
+        """Load multi-session server configuration"""
+        return {
+            'host': os.getenv('SERVER_HOST', '127.0.0.1'),
+            'port': int(os.getenv('SERVER_PORT', '8765')),
+            'max_sessions': int(os.getenv('SERVER_MAX_SESSIONS', '64')),
+            'idle_timeout': float(os.getenv('SERVER_IDLE_TIMEOUT', '900')),
+            'max_inflight': int(os.getenv('SERVER_MAX_INFLIGHT', '8')),
+            'queue_timeout': float(os.getenv('SERVER_QUEUE_TIMEOUT', '5')),
+            'persist_sessions': os.getenv('SERVER_PERSIST_SESSIONS', 'True').lower() == 'true'
+        }
+    
     def get(self, section: str, key: str, default: Any = None) -> Any:
         """
         Get configuration value.
@@ -147,6 +208,10 @@ class Config:
             },
             'speech': self.speech,
             'database': self.database,
+            'nlu': self.nlu,
+            'handlers': self.handlers,
+            'metrics': self.metrics,
+            'server': self.server,
             'api_keys': {
                 k: '****' if v else None 
                 for k, v in self.api_keys.items()
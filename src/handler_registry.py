@@ -0,0 +1,199 @@
+import importlib
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional
+
+# Handlers take the extracted entities and return the response to give
+HandlerFunc = Callable[[Dict[str, Any]], Optional[str]]
+
+# Marks a handler registered without an explicit deadline
+_DEFAULT_DEADLINE = object()
+
+@dataclass
+class IntentHandler:
+    intent: str
+    func: HandlerFunc
+    deadline: Optional[float] = None
+    pending_response: str = "I'm still working on that. I'll let you know when it's done."
+
+class HandlerRegistry:
+    FALLBACK_RESPONSE = "I'm not sure how to help with that yet."
+    ERROR_RESPONSE = "I'm sorry, I encountered an error handling your request."
+    BUSY_RESPONSE = "I'm sorry, I'm busy with other requests. Please try again in a moment."
+
+    def __init__(self, max_workers: int = 4, default_deadline: Optional[float] = 5.0):
+        """
+        Initialize a registry dispatching intents to handlers.
+
+        Handlers with a deadline run on a bounded thread pool. If one does not
+        finish in time, dispatch returns its pending response at once and the
+        result is delivered through a callback when it arrives. Handlers
+        without a deadline run inline on the caller's thread.
+
+        Args:
+            max_workers (int): Maximum handlers running concurrently
+            default_deadline (Optional[float]): Deadline in seconds for handlers
+                registered without one (None runs them inline)
+        """
+        # Set up logging
+        self.logger = logging.getLogger(__name__)
+        self._setup_logging()
+
+        self.max_workers = max(1, max_workers)
+        self.default_deadline = default_deadline
+        self.handlers: Dict[str, IntentHandler] = {}
+
+        self.executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="intent-handler")
+        # Bounds queued plus running handlers, so slow services cannot pile up work
+        self._slots = threading.BoundedSemaphore(self.max_workers)
+
+        self.stats = {"dispatched": 0, "late": 0, "errors": 0, "rejected": 0}
+        self._stats_lock = threading.Lock()
+
+    def _setup_logging(self):
+        """Configure logging for the handler registry"""
+        logging.basicConfig(
+            level=logging.INFO,
+            format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+        )
+
+    def _count(self, key: str):
+        """Increment a statistics counter"""
+        with self._stats_lock:
+            self.stats[key] += 1
+
+    def register(self, intent: str, func: HandlerFunc,
+                 deadline: Any = _DEFAULT_DEADLINE,
+                 pending_response: Optional[str] = None):
+        """
+        Register the handler of an intent, replacing any previous one.
+
+        Args:
+            intent (str): Intent name
+            func (HandlerFunc): Function mapping entities to a response
+            deadline (Optional[float]): Seconds to wait before answering with the
+                pending response (defaults to default_deadline, None runs inline)
+            pending_response (Optional[str]): Response given when the deadline passes
+        """
+        handler = IntentHandler(intent, func, self.default_deadline if deadline is _DEFAULT_DEADLINE else deadline)
+        if pending_response:
+            handler.pending_response = pending_response
+        self.handlers[intent] = handler
+        self.logger.info(f"Registered handler for intent: {intent}")
+
+    def unregister(self, intent: str) -> bool:
+        """
+        Remove the handler of an intent.
+
+        Args:
+            intent (str): Intent name
+
+        Returns:
+            bool: True if a handler was registered
+        """
+        return self.handlers.pop(intent, None) is not None
+
+    def load_modules(self, module_names: List[str], context: Any = None):
+        """
+        Import third-party handler modules.
+
+        Every module must define register_handlers(registry, context).
+
+        Args:
+            module_names (List[str]): Importable module names
+            context (Any): Object passed to register_handlers (the assistant)
+        """
+        for module_name in module_names:
+            try:
+                module = importlib.import_module(module_name)
+                module.register_handlers(self, context)
+                self.logger.info(f"Loaded handlers from {module_name}")
+            except Exception as e:
+                self.logger.error(f"Error loading handler module {module_name}: {str(e)}")
+
+    def _run(self, handler: IntentHandler, entities: Dict[str, Any]) -> Optional[str]:
+        """Run a handler, turning exceptions into the error response"""
+        try:
+            return handler.func(entities)
+        except Exception as e:
+            self._count("errors")
+            self.logger.error(f"Error handling intent {handler.intent}: {str(e)}")
+            return self.ERROR_RESPONSE
+
+    def dispatch(self, intent: Optional[str], entities: Dict[str, Any],
+                 on_late_result: Optional[Callable[[str, Optional[str]], None]] = None,
+                 wait: bool = False) -> Optional[str]:
+        """
+        Run the handler of an intent within its deadline.
+
+        Args:
+            intent (Optional[str]): Classified intent
+            entities (Dict[str, Any]): Extracted entities
+            on_late_result (Optional[Callable[[str, Optional[str]], None]]): Called
+                with the intent and response of a handler that missed its deadline
+            wait (bool): Ignore the deadline and wait for the result
+
+        Returns:
+            Optional[str]: Handler response, or its pending response if it is late
+        """
+        handler = self.handlers.get(intent)
+        if handler is None:
+            return self.FALLBACK_RESPONSE
+
+        self._count("dispatched")
+        if handler.deadline is None:
+            return self._run(handler, entities)
+
+        # The deadline covers waiting for a free slot as well as running
+        expires = time.monotonic() + handler.deadline
+        if not self._slots.acquire(timeout=None if wait else handler.deadline):
+            self._count("rejected")
+            self.logger.warning(f"No handler slot free for intent {intent}")
+            return self.BUSY_RESPONSE
+
+        try:
+            future = self.executor.submit(self._run, handler, entities)
+        except Exception:
+            self._slots.release()
+            raise
+        future.add_done_callback(lambda _: self._slots.release())
+
+        try:
+            return future.result(timeout=None if wait else max(0.0, expires - time.monotonic()))
+        except FutureTimeoutError:
+            self._count("late")
+            self.logger.warning(f"Handler for intent {intent} missed its {handler.deadline}s deadline")
+            if on_late_result is not None:
+                future.add_done_callback(lambda done: self._deliver(on_late_result, intent, done))
+            return handler.pending_response
+
+    def _deliver(self, callback: Callable[[str, Optional[str]], None], intent: str, future):
+        """Hand a late result to its callback"""
+        try:
+            callback(intent, future.result())
+        except Exception as e:
+            self.logger.error(f"Error delivering late result for intent {intent}: {str(e)}")
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get dispatch statistics.
+
+        Returns:
+            Dict[str, Any]: Dispatch, late, error and rejection counters and registered intents
+        """
+        with self._stats_lock:
+            stats = dict(self.stats)
+        stats["intents"] = sorted(self.handlers)
+        return stats
+
+    def shutdown(self, wait: bool = False):
+        """
+        Stop the handler pool.
+
+        Args:
+            wait (bool): Wait for running handlers to finish
+        """
+        self.executor.shutdown(wait=wait)
@@ -0,0 +1,163 @@
+import json
+import logging
+import time
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Dict, Iterable, Iterator, Optional, TextIO, Tuple
+
+from src.assistant import Assistant
+from src.nlu.worker_pool import IntentWorkerPool
+
+class HeadlessRunner:
+    def __init__(self, assistant: Assistant, workers: int = 4, max_pending: Optional[int] = None,
+                 intent_pool: Optional[IntentWorkerPool] = None):
+        """
+        Initialize a runner pushing text utterances through the assistant without audio.
+
+        Args:
+            assistant (Assistant): Assistant created with enable_speech=False
+            workers (int): Number of utterances processed concurrently
+            max_pending (Optional[int]): Maximum utterances read ahead of the
+                output (defaults to four per worker)
+            intent_pool (Optional[IntentWorkerPool]): Worker processes classifying
+                intents as lines are read, so the transformer tier uses every core
+        """
+        # Set up logging
+        self.logger = logging.getLogger(__name__)
+        self._setup_logging()
+
+        self.assistant = assistant
+        self.workers = max(1, workers)
+        self.max_pending = max_pending or 4 * self.workers
+        self.intent_pool = intent_pool
+
+    def _setup_logging(self):
+        """Configure logging for the headless runner"""
+        logging.basicConfig(
+            level=logging.INFO,
+            format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+        )
+
+    @staticmethod
+    def parse_line(line: str) -> Dict[str, Any]:
+        """
+        Parse one input line.
+
+        Args:
+            line (str): JSON object with a "text" field (other fields are echoed
+                back), or a JSON string
+
+        Returns:
+            Dict[str, Any]: Request with a "text" field
+        """
+        record = json.loads(line)
+        if isinstance(record, str):
+            return {"text": record}
+        if not isinstance(record, dict) or not isinstance(record.get("text"), str):
+            raise ValueError("expected a JSON string or an object with a 'text' field")
+        return record
+
+    def _parse(self, line: str) -> Tuple[Optional[Dict[str, Any]], Optional[Future], Optional[str]]:
+        """
+        Parse one input line, sending its text to the intent pool if there is one.
+
+        Args:
+            line (str): Raw input line
+
+        Returns:
+            Tuple[Optional[Dict[str, Any]], Optional[Future], Optional[str]]: The
+                request, its pending intent classification and the parse error
+        """
+        try:
+            request = self.parse_line(line)
+        except Exception as e:
+            return None, None, f"invalid input: {str(e)}"
+
+        intent_future = self.intent_pool.submit(request["text"]) if self.intent_pool is not None else None
+        return request, intent_future, None
+
+    def _process(self, line_number: int, request: Optional[Dict[str, Any]],
+                 intent_future: Optional[Future] = None, error: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Process one parsed input line.
+
+        Args:
+            line_number (int): 1-based input line number
+            request (Optional[Dict[str, Any]]): Parsed request, None if invalid
+            intent_future (Optional[Future]): Classification from the intent pool
+            error (Optional[str]): Why the line could not be parsed
+
+        Returns:
+            Dict[str, Any]: Output record
+        """
+        if request is None:
+            return {"line": line_number, "error": error}
+
+        intent_result = None
+        if intent_future is not None:
+            try:
+                intent_result = intent_future.result()
+            except Exception as e:
+                # The pipeline classifies in this process instead
+                self.logger.error(f"Intent worker failed on line {line_number}: {str(e)}")
+
+        # Batch results should be complete, so slow handlers are waited for
+        result = self.assistant.process_text(request["text"], wait_for_handlers=True,
+                                             intent_result=intent_result)
+        extra = {key: value for key, value in request.items() if key != "text"}
+        return {"line": line_number, **extra, **result}
+
+    def run(self, lines: Iterable[str]) -> Iterator[Dict[str, Any]]:
+        """
+        Process utterances concurrently, yielding results in input order.
+
+        Lines are read lazily and at most max_pending are in flight, so memory
+        stays bounded for arbitrarily long inputs.
+
+        Args:
+            lines (Iterable[str]): JSONL input lines
+
+        Yields:
+            Dict[str, Any]: One output record per non-blank input line
+        """
+        pending = deque()
+        with ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="headless") as pool:
+            for line_number, line in enumerate(lines, start=1):
+                if not line.strip():
+                    continue
+                pending.append(pool.submit(self._process, line_number, *self._parse(line)))
+                if len(pending) >= self.max_pending:
+                    yield pending.popleft().result()
+
+            while pending:
+                yield pending.popleft().result()
+
+    def run_stream(self, input_stream: TextIO, output_stream: TextIO) -> Dict[str, Any]:
+        """
+        Stream JSONL results for a JSONL input stream.
+
+        Args:
+            input_stream (TextIO): Input lines
+            output_stream (TextIO): Destination of the JSONL results
+
+        Returns:
+            Dict[str, Any]: Summary with counts and throughput
+        """
+        started = time.perf_counter()
+        processed = errors = 0
+
+        for record in self.run(input_stream):
+            output_stream.write(json.dumps(record, default=str) + "\n")
+            output_stream.flush()
+            processed += 1
+            errors += "error" in record
+
+        elapsed = time.perf_counter() - started
+        summary = {
+            "processed": processed,
+            "errors": errors,
+            "seconds": elapsed,
+            "throughput_per_s": processed / elapsed if elapsed else 0.0
+        }
+        self.logger.info(f"Headless run finished: {summary}")
+        return summary
@@ -0,0 +1,222 @@
+from typing import List, Optional, Tuple
+import logging
+from pathlib import Path
+import numpy as np
+
+class IVFIndex:
+    def __init__(self,
+                 n_lists: Optional[int] = None,
+                 n_probe: int = 8,
+                 n_iter: int = 10,
+                 seed: int = 0):
+        """
+        Initialize an inverted-file (IVF) index over normalized pattern embeddings.
+
+        Vectors are clustered with spherical k-means; a query is only compared
+        with the vectors in the n_probe clusters whose centroids are closest.
+
+        Args:
+            n_lists (Optional[int]): Number of clusters (defaults to sqrt of the vector count)
+            n_probe (int): Number of clusters searched per query
+            n_iter (int): Number of k-means iterations when building
+            seed (int): Random seed for centroid initialization
+        """
+        # Set up logging
+        self.logger = logging.getLogger(__name__)
+        self._setup_logging()
+
+        self.n_lists = n_lists
+        self.n_probe = n_probe
+        self.n_iter = n_iter
+        self.rng = np.random.default_rng(seed)
+
+        self.centroids = np.zeros((0, 0), dtype=np.float32)
+        self.list_vectors: List[np.ndarray] = []
+        self.list_labels: List[np.ndarray] = []
+        self.label_names: List[str] = []
+        self.key = None
+
+    def _setup_logging(self):
+        """Configure logging for the ANN index"""
+        logging.basicConfig(
+            level=logging.INFO,
+            format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+        )
+
+    def __len__(self) -> int:
+        return sum(len(labels) for labels in self.list_labels)
+
+    def _label_ids(self, labels: List[str]) -> np.ndarray:
+        """Map label names to integer ids, registering new names"""
+        index = {name: i for i, name in enumerate(self.label_names)}
+        ids = []
+        for name in labels:
+            if name not in index:
+                index[name] = len(self.label_names)
+                self.label_names.append(name)
+            ids.append(index[name])
+        return np.asarray(ids, dtype=np.int32)
+
+    def build(self, vectors: np.ndarray, labels: List[str], key: Optional[str] = None):
+        """
+        Cluster the vectors and build the inverted lists.
+
+        Args:
+            vectors (np.ndarray): Normalized vectors of shape (n, dim)
+            labels (List[str]): Label (intent name) of every vector
+            key (Optional[str]): Identifier of the data the index was built from
+        """
+        vectors = np.asarray(vectors, dtype=np.float32)
+        n_lists = self.n_lists or max(1, int(np.sqrt(len(vectors))))
+        n_lists = min(n_lists, max(1, len(vectors)))
+
+        # Train centroids on a sample to bound build time
+        sample_size = min(len(vectors), 256 * n_lists)
+        sample = vectors[self.rng.choice(len(vectors), sample_size, replace=False)]
+        centroids = sample[self.rng.choice(len(sample), n_lists, replace=False)].copy()
+
+        for _ in range(self.n_iter):
+            assignment = np.argmax(sample @ centroids.T, axis=1)
+            for c in range(n_lists):
+                members = sample[assignment == c]
+                if len(members):
+                    centroid = members.sum(axis=0)
+                else:
+                    # Re-seed empty clusters with a random sample point
+                    centroid = sample[self.rng.integers(len(sample))]
+                centroids[c] = centroid / max(np.linalg.norm(centroid), 1e-12)
+
+        self.centroids = centroids
+        self.list_vectors = [np.zeros((0, vectors.shape[1]), dtype=np.float32) for _ in range(n_lists)]
+        self.list_labels = [np.zeros(0, dtype=np.int32) for _ in range(n_lists)]
+        self.label_names = []
+        self.key = key
+
+        self.add(vectors, labels)
+        self.logger.info(f"Built ANN index with {len(self)} vectors in {n_lists} lists")
+
+    def add(self, vectors: np.ndarray, labels: List[str]):
+        """
+        Insert vectors into their nearest inverted lists.
+
+        Args:
+            vectors (np.ndarray): Normalized vectors of shape (n, dim)
+            labels (List[str]): Label (intent name) of every vector
+        """
+        if len(vectors) == 0:
+            return
+
+        vectors = np.asarray(vectors, dtype=np.float32)
+        label_ids = self._label_ids(labels)
+        assignment = np.argmax(vectors @ self.centroids.T, axis=1)
+
+        for c in np.unique(assignment):
+            members = assignment == c
+            self.list_vectors[c] = np.concatenate([self.list_vectors[c], vectors[members]])
+            self.list_labels[c] = np.concatenate([self.list_labels[c], label_ids[members]])
+
+    def remove(self, label: str):
+        """
+        Remove every vector with the given label.
+
+        Args:
+            label (str): Label (intent name) to remove
+        """
+        if label not in self.label_names:
+            return
+
+        label_id = self.label_names.index(label)
+        for c in range(len(self.list_labels)):
+            keep = self.list_labels[c] != label_id
+            self.list_vectors[c] = self.list_vectors[c][keep]
+            self.list_labels[c] = self.list_labels[c][keep]
+
+    def search(self, query: np.ndarray, k: int = 5) -> List[Tuple[str, float]]:
+        """
+        Find the top-k labels by their best-matching vector.
+
+        Args:
+            query (np.ndarray): Normalized query vector of shape (dim,)
+            k (int): Number of labels to return
+
+        Returns:
+            List[Tuple[str, float]]: (label, cosine similarity) pairs, best first
+        """
+        if len(self.centroids) == 0:
+            return []
+
+        query = np.asarray(query, dtype=np.float32).reshape(-1)
+        n_probe = min(self.n_probe, len(self.centroids))
+        probe = np.argpartition(-(self.centroids @ query), n_probe - 1)[:n_probe]
+
+        vectors = np.concatenate([self.list_vectors[c] for c in probe])
+        labels = np.concatenate([self.list_labels[c] for c in probe])
+        if len(labels) == 0:
+            return []
+
+        # Best score per label, then the top-k labels
+        scores = vectors @ query
+        order = np.argsort(-scores)
+        results, seen = [], set()
+        for i in order:
+            label_id = int(labels[i])
+            if label_id not in seen:
+                seen.add(label_id)
+                results.append((self.label_names[label_id], float(scores[i])))
+                if len(results) == k:
+                    break
+        return results
+
+    def save(self, file_path: str):
+        """
+        Save the index to a .npz file.
+
+        Args:
+            file_path (str): Path to save the index to
+        """
+        try:
+            sizes = np.asarray([len(labels) for labels in self.list_labels], dtype=np.int64)
+            dim = self.centroids.shape[1] if self.centroids.ndim == 2 else 0
+            with open(file_path, 'wb') as f:
+                np.savez(
+                    f,
+                    centroids=self.centroids,
+                    sizes=sizes,
+                    vectors=np.concatenate(self.list_vectors) if self.list_vectors
+                    else np.zeros((0, dim), dtype=np.float32),
+                    labels=np.concatenate(self.list_labels) if self.list_labels
+                    else np.zeros(0, dtype=np.int32),
+                    label_names=np.asarray(self.label_names, dtype=str),
+                    key=np.asarray(self.key or "")
+                )
+            self.logger.info(f"Saved ANN index to {file_path}")
+        except Exception as e:
+            self.logger.error(f"Error saving ANN index: {str(e)}")
+
+    def load(self, file_path: str) -> bool:
+        """
+        Load an index saved with save.
+
+        Args:
+            file_path (str): Path of the saved index
+
+        Returns:
+            bool: Success status
+        """
+        if not Path(file_path).exists():
+            return False
+
+        try:
+            with np.load(file_path) as data:
+                offsets = np.concatenate([[0], np.cumsum(data["sizes"])])
+                vectors, labels = data["vectors"], data["labels"]
+                self.centroids = data["centroids"]
+                self.list_vectors = [vectors[a:b] for a, b in zip(offsets[:-1], offsets[1:])]
+                self.list_labels = [labels[a:b] for a, b in zip(offsets[:-1], offsets[1:])]
+                self.label_names = [str(name) for name in data["label_names"]]
+                self.key = str(data["key"]) or None
+            self.logger.info(f"Loaded ANN index from {file_path}")
+            return True
+        except Exception as e:
+            self.logger.error(f"Error loading ANN index: {str(e)}")
+            return False
@@ -0,0 +1,363 @@
+from typing import Any, Dict, List, Optional, Tuple
+import argparse
+import json
+import logging
+import os
+import platform
+import random
+import tempfile
+import time
+from collections import Counter
+from datetime import datetime
+import numpy as np
+
+from src.config import Config
+from src.nlu.intent_classifier import IntentClassifier
+
+# Phrases wrapped around intent patterns to build synthetic utterances
+PREFIXES = ["", "please", "can you", "hey nova", "i want to", "could you"]
+SUFFIXES = ["", "now", "for me", "please", "today", "thanks"]
+
+def split_patterns(intents: Dict[str, Dict],
+                   holdout_fraction: float = 0.3,
+                   seed: int = 0) -> Tuple[Dict[str, Dict], Dict[str, Dict]]:
+    """
+    Hold out a share of every intent's patterns for evaluation.
+
+    Evaluating on patterns the classifier indexes would hit the rule tier at
+    Jaccard 1.0 and overstate both accuracy and the rule-tier share. Intents
+    with a single pattern keep it for training and are not evaluated.
+
+    Args:
+        intents (Dict[str, Dict]): Intent definitions
+        holdout_fraction (float): Share of each intent's patterns held out
+        seed (int): Random seed
+
+    Returns:
+        Tuple[Dict[str, Dict], Dict[str, Dict]]: Training and held-out intents
+    """
+    rng = random.Random(seed)
+    train, held_out = {}, {}
+
+    for intent, data in intents.items():
+        patterns = list(data["patterns"])
+        rng.shuffle(patterns)
+        n_held = min(len(patterns) - 1, max(1, round(holdout_fraction * len(patterns))))
+        if n_held <= 0:
+            train[intent] = data
+            continue
+        train[intent] = {**data, "patterns": patterns[n_held:]}
+        held_out[intent] = {**data, "patterns": patterns[:n_held]}
+
+    return train, held_out
+
+def generate_corpus(intents: Dict[str, Dict],
+                    samples_per_pattern: int = 3,
+                    seed: int = 0) -> List[Tuple[str, str]]:
+    """
+    Generate a labelled synthetic utterance corpus from intent patterns.
+
+    Every pattern is used verbatim once, then perturbed with filler prefixes,
+    suffixes, dropped words and punctuation.
+
+    Args:
+        intents (Dict[str, Dict]): Intent definitions
+        samples_per_pattern (int): Number of perturbed utterances per pattern
+        seed (int): Random seed
+
+    Returns:
+        List[Tuple[str, str]]: (utterance, expected intent) pairs
+    """
+    rng = random.Random(seed)
+    corpus = []
+
+    for intent, data in intents.items():
+        for pattern in data["patterns"]:
+            corpus.append((pattern, intent))
+
+            for _ in range(samples_per_pattern):
+                words = pattern.split()
+                if len(words) > 2 and rng.random() < 0.3:
+                    words.pop(rng.randrange(len(words)))
+                utterance = " ".join(
+                    part for part in (rng.choice(PREFIXES), " ".join(words), rng.choice(SUFFIXES))
+                    if part
+                )
+                if rng.random() < 0.3:
+                    utterance = utterance.capitalize() + rng.choice(["?", "!", "."])
+                corpus.append((utterance, intent))
+
+    rng.shuffle(corpus)
+    return corpus
+
+def latency_summary(latencies_ms: List[float]) -> Dict[str, float]:
+    """
+    Summarize latencies.
+
+    Args:
+        latencies_ms (List[float]): Latencies in milliseconds
+
+    Returns:
+        Dict[str, float]: Count, mean, max and p50/p95/p99 in milliseconds
+    """
+    if not latencies_ms:
+        return {"count": 0}
+
+    values = np.asarray(latencies_ms)
+    p50, p95, p99 = np.percentile(values, [50, 95, 99])
+    return {
+        "count": len(values),
+        "mean": float(values.mean()),
+        "p50": float(p50),
+        "p95": float(p95),
+        "p99": float(p99),
+        "max": float(values.max())
+    }
+
+def benchmark_intents(classifier: IntentClassifier,
+                      corpus: List[Tuple[str, str]],
+                      batch_size: int = 32) -> Dict[str, Any]:
+    """
+    Measure classify latency, tier breakdown and accuracy, plus classify_batch throughput.
+
+    Args:
+        classifier (IntentClassifier): Classifier under test
+        corpus (List[Tuple[str, str]]): (utterance, expected intent) pairs
+        batch_size (int): Batch size for the classify_batch run
+
+    Returns:
+        Dict[str, Any]: Benchmark results
+    """
+    latencies: List[float] = []
+    tier_latencies: Dict[str, List[float]] = {}
+    tiers: Counter = Counter()
+    correct = 0
+
+    start = time.perf_counter()
+    for text, expected in corpus:
+        t0 = time.perf_counter()
+        result = classifier.classify(text)
+        elapsed = (time.perf_counter() - t0) * 1000
+
+        # Empty inputs return without going through any tier
+        tier = result.get("tier") or ("empty" if not text.strip() else "none")
+        latencies.append(elapsed)
+        tier_latencies.setdefault(tier, []).append(elapsed)
+        tiers[tier] += 1
+        correct += result["intent"] == expected
+    total = time.perf_counter() - start
+
+    # Otherwise the batch pass is served from the cache the sequential pass filled
+    classifier.cache.clear()
+
+    start = time.perf_counter()
+    batch_results = classifier.classify_batch([text for text, _ in corpus], batch_size=batch_size)
+    batch_total = time.perf_counter() - start
+    batch_correct = sum(r["intent"] == expected for r, (_, expected) in zip(batch_results, corpus))
+
+    return {
+        "latency_ms": latency_summary(latencies),
+        "throughput_per_s": len(corpus) / total if total else 0.0,
+        "accuracy": correct / len(corpus) if corpus else 0.0,
+        "tier_share": {tier: count / len(corpus) for tier, count in tiers.items()},
+        "tier_latency_ms": {tier: latency_summary(values) for tier, values in tier_latencies.items()},
+        "batch": {
+            "batch_size": batch_size,
+            "throughput_per_s": len(corpus) / batch_total if batch_total else 0.0,
+            "accuracy": batch_correct / len(corpus) if corpus else 0.0
+        }
+    }
+
+def benchmark_worker_pool(classifier: IntentClassifier,
+                          corpus: List[Tuple[str, str]],
+                          n_workers: int,
+                          torch_threads: int = 1,
+                          chunk_size: int = 64) -> Dict[str, Any]:
+    """
+    Measure classification throughput across forked worker processes.
+
+    Args:
+        classifier (IntentClassifier): Classifier shared with the workers
+        corpus (List[Tuple[str, str]]): (utterance, expected intent) pairs
+        n_workers (int): Number of worker processes
+        torch_threads (int): Torch threads per worker
+        chunk_size (int): Number of texts handed to a worker at once
+
+    Returns:
+        Dict[str, Any]: Benchmark results
+    """
+    from src.nlu.worker_pool import IntentWorkerPool
+
+    # Workers inherit the cache at fork; start them cold like the other passes
+    classifier.cache.clear()
+    with IntentWorkerPool(classifier, n_workers=n_workers, torch_threads=torch_threads) as pool:
+        start = time.perf_counter()
+        results = pool.classify_many([text for text, _ in corpus], chunk_size=chunk_size)
+        total = time.perf_counter() - start
+
+    correct = sum(r["intent"] == expected for r, (_, expected) in zip(results, corpus))
+    return {
+        "workers": n_workers,
+        "torch_threads": torch_threads,
+        "throughput_per_s": len(corpus) / total if total else 0.0,
+        "accuracy": correct / len(corpus) if corpus else 0.0
+    }
+
+def benchmark_entities(extractor, texts: List[str]) -> Dict[str, Any]:
+    """
+    Measure extract_entities latency with the extractor's result cache cleared.
+
+    Args:
+        extractor (EntityExtractor): Extractor under test
+        texts (List[str]): Utterances to process
+
+    Returns:
+        Dict[str, Any]: Benchmark results
+    """
+    latencies = []
+    entity_count = 0
+    extractor.cache.clear()
+
+    start = time.perf_counter()
+    for text in texts:
+        t0 = time.perf_counter()
+        entities = extractor.extract_entities(text)
+        latencies.append((time.perf_counter() - t0) * 1000)
+        entity_count += sum(len(v) for v in entities.values())
+    total = time.perf_counter() - start
+
+    return {
+        "latency_ms": latency_summary(latencies),
+        "throughput_per_s": len(texts) / total if total else 0.0,
+        "entities_per_utterance": entity_count / len(texts) if texts else 0.0
+    }
+
+def run_benchmark(args: argparse.Namespace) -> Dict[str, Any]:
+    """
+    Run the NLU benchmark described by the command line arguments.
+
+    Args:
+        args (argparse.Namespace): Parsed command line arguments
+
+    Returns:
+        Dict[str, Any]: Benchmark report
+    """
+    # Only the rule tier is built here, to read the full intent catalog
+    intents = IntentClassifier(intents_file=args.intents_file, load_mode="lazy",
+                               embedding_cache_dir=None).intents
+    train_intents, test_intents = split_patterns(intents, args.holdout_fraction, args.seed)
+
+    # The classifier under test only knows the training patterns
+    with tempfile.NamedTemporaryFile('w', suffix=".json", delete=False) as f:
+        json.dump(train_intents, f)
+    try:
+        started = time.perf_counter()
+        classifier = IntentClassifier(
+            model_name=args.model,
+            intents_file=f.name,
+            backend=args.backend,
+            cache_size=args.cache_size,
+            load_mode="eager",
+            use_head=args.use_head,
+            # The reduced pattern set must not touch the assistant's persisted matrices
+            embedding_cache_dir=None
+        )
+        startup_s = time.perf_counter() - started
+    finally:
+        os.unlink(f.name)
+
+    corpus = generate_corpus(test_intents, args.samples_per_pattern, args.seed)
+    report = {
+        "timestamp": datetime.now().isoformat(),
+        "environment": {
+            "python": platform.python_version(),
+            "machine": platform.machine()
+        },
+        "config": {
+            "model": args.model,
+            "backend": args.backend,
+            "cache_size": args.cache_size,
+            "use_head": args.use_head,
+            "workers": args.workers,
+            "spacy_model": args.spacy_model,
+            "spacy_profile": args.spacy_profile,
+            "samples_per_pattern": args.samples_per_pattern,
+            "holdout_fraction": args.holdout_fraction,
+            "seed": args.seed
+        },
+        "corpus": {
+            "utterances": len(corpus),
+            "intents": len(classifier.intents),
+            "training_patterns": sum(len(d["patterns"]) for d in train_intents.values()),
+            "held_out_patterns": sum(len(d["patterns"]) for d in test_intents.values())
+        },
+        "intent_startup_s": startup_s,
+        "intent": benchmark_intents(classifier, corpus, args.batch_size)
+    }
+
+    if args.workers > 0:
+        report["intent"]["worker_pool"] = benchmark_worker_pool(
+            classifier, corpus, args.workers, args.worker_threads, args.batch_size
+        )
+    classifier.release_models()
+
+    if not args.skip_entities:
+        from src.nlu.entity_extractor import EntityExtractor
+        # The corpus repeats texts, so a result cache would time lookups instead of spaCy
+        extractor = EntityExtractor(model_name=args.spacy_model, profile=args.spacy_profile, cache_size=0)
+        report["entities"] = benchmark_entities(extractor, [text for text, _ in corpus])
+
+    return report
+
+def main(argv: Optional[List[str]] = None):
+    config = Config()
+    parser = argparse.ArgumentParser(description="Benchmark NOVA intent classification and entity extraction")
+    parser.add_argument("--intents-file", help="Custom intents JSON file")
+    parser.add_argument("--model", default="distilbert-base-uncased", help="Transformer model name")
+    parser.add_argument("--backend", default="fp32", choices=IntentClassifier.BACKENDS)
+    parser.add_argument("--use-head", action="store_true", help="Use the trained classification head")
+    parser.add_argument("--cache-size", type=int, default=0,
+                        help="Classification cache size (0 measures uncached tiers)")
+    parser.add_argument("--samples-per-pattern", type=int, default=3)
+    parser.add_argument("--holdout-fraction", type=float, default=0.3,
+                        help="Share of each intent's patterns kept out of the classifier for evaluation")
+    parser.add_argument("--batch-size", type=int, default=32)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--workers", type=int, default=config.get('nlu', 'workers', 0),
+                        help="Also measure a forked worker pool of this size (0 skips it)")
+    parser.add_argument("--worker-threads", type=int, default=config.get('nlu', 'worker_threads', 1),
+                        help="Torch threads per worker process")
+    parser.add_argument("--spacy-model", default=config.get('nlu', 'spacy_model', 'en_core_web_sm'),
+                        help="spaCy model of the entity extractor (defaults to NLU_SPACY_MODEL)")
+    parser.add_argument("--spacy-profile", default=config.get('nlu', 'spacy_profile', 'ner-only'),
+                        help="Entity extractor pipeline profile (defaults to NLU_SPACY_PROFILE, "
+                             "the one the assistant runs)")
+    parser.add_argument("--skip-entities", action="store_true", help="Skip the entity extraction benchmark")
+    parser.add_argument("--output", default="nlu_benchmark.json", help="Path of the JSON report")
+    args = parser.parse_args(argv)
+
+    logging.getLogger().setLevel(logging.WARNING)
+    report = run_benchmark(args)
+
+    with open(args.output, 'w') as f:
+        json.dump(report, f, indent=4)
+
+    intent = report["intent"]
+    print(f"Utterances: {report['corpus']['utterances']}")
+    print(f"Intent latency p50/p95/p99 (ms): {intent['latency_ms']['p50']:.2f} / "
+          f"{intent['latency_ms']['p95']:.2f} / {intent['latency_ms']['p99']:.2f}")
+    print(f"Intent throughput: {intent['throughput_per_s']:.1f}/s "
+          f"(batched: {intent['batch']['throughput_per_s']:.1f}/s)")
+    if "worker_pool" in intent:
+        print(f"Worker pool throughput: {intent['worker_pool']['throughput_per_s']:.1f}/s "
+              f"({intent['worker_pool']['workers']} workers)")
+    print(f"Intent accuracy: {intent['accuracy']:.3f}")
+    print(f"Tier share: {', '.join(f'{k}={v:.1%}' for k, v in intent['tier_share'].items())}")
+    if "entities" in report:
+        entities = report["entities"]
+        print(f"Entity latency p50/p95/p99 (ms): {entities['latency_ms']['p50']:.2f} / "
+              f"{entities['latency_ms']['p95']:.2f} / {entities['latency_ms']['p99']:.2f}")
+    print(f"Report written to {args.output}")
+
+if __name__ == "__main__":
+    main()
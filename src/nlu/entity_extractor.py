@@ -1,36 +1,130 @@
 import spacy
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Iterable, Iterator, Tuple
 import logging
+import hashlib
 from pathlib import Path
 import json
 from datetime import datetime
 import re
+import threading
+import time
+from collections import OrderedDict
+
+from src.nlu.gazetteer import Gazetteer
+from src.utils.cache import LRUCache
+from src.utils.model_registry import ModelHandle, model_registry
+
+# Pipeline components excluded at load time by each profile. The extractor only
+# reads doc.ents, token attributes and custom matches, so tagging, parsing and
+# lemmatization are never needed.
+PIPELINE_PROFILES = {
+    "full": [],
+    "ner-only": ["tok2vec", "tagger", "morphologizer", "parser", "senter",
+                 "attribute_ruler", "lemmatizer"],
+    "tokens-only": ["tok2vec", "tagger", "morphologizer", "parser", "senter",
+                    "attribute_ruler", "lemmatizer", "ner"]
+}
+
+# spaCy models per language code, loaded on first use when routing is enabled
+LANGUAGE_MODELS = {
+    "en": "en_core_web_sm",
+    "de": "de_core_news_sm",
+    "fr": "fr_core_news_sm",
+    "es": "es_core_news_sm",
+    "it": "it_core_news_sm",
+    "pt": "pt_core_news_sm",
+    "nl": "nl_core_news_sm"
+}
+
+# Numbered backreferences and group conditions, which would point at the wrong
+# group once a pattern is embedded in an alternation
+NUMBERED_REFERENCE = re.compile(r"(?<!\\)(?:\\\\)*\\[1-9]|\(\?\(\d")
 
 class EntityExtractor:
     def __init__(self, model_name: str = "en_core_web_sm", 
-                 custom_entities_path: Optional[str] = None):
+                 custom_entities_path: Optional[str] = None,
+                 profile: str = "full",
+                 use_gazetteer: bool = True,
+                 gazetteer_path: Optional[str] = None,
+                 gazetteer_min_population: int = 100000,
+                 cache_size: int = 1024,
+                 cache_ttl: Optional[float] = None,
+                 language: str = "en",
+                 language_models: Optional[Dict[str, str]] = None,
+                 detect_language: bool = False,
+                 max_loaded_languages: int = 2,
+                 language_idle_timeout: Optional[float] = 600):
         """
         Initialize the entity extractor.
         
         Args:
             model_name (str): Name of the spaCy model to use
             custom_entities_path (Optional[str]): Path to custom entities JSON file
+            profile (str): Pipeline profile ("full", "ner-only" or "tokens-only")
+            use_gazetteer (bool): Detect city names with the trie gazetteer
+            gazetteer_path (Optional[str]): City list for the gazetteer (defaults to built-in cities)
+            gazetteer_min_population (int): Smallest population of a city from
+                gazetteer_path whose single-word names are matched
+            cache_size (int): Maximum number of cached extraction results (0 disables)
+            cache_ttl (Optional[float]): Lifetime of cached results in seconds
+            language (str): Default language (e.g. "en" or "en-US"); model_name serves it
+            language_models (Optional[Dict[str, str]]): spaCy models of other languages,
+                merged over LANGUAGE_MODELS
+            detect_language (bool): Guess the language of texts without an explicit one
+            max_loaded_languages (int): Pipelines of non-default languages kept loaded
+            language_idle_timeout (Optional[float]): Seconds after which an unused
+                non-default pipeline is unloaded (None keeps it until evicted)
         """
         # Set up logging
         self.logger = logging.getLogger(__name__)
         self._setup_logging()
         
         try:
-            # Load spaCy model
-            self.nlp = spacy.load(model_name)
-            self.logger.info(f"Loaded spaCy model: {model_name}")
+            if profile not in PIPELINE_PROFILES:
+                raise ValueError(f"Unknown pipeline profile: {profile}")
+            self.profile = profile
+            
+            # Load spaCy model without the components the profile does not need,
+            # sharing it with every extractor in the process using the same profile
+            self.nlp_handle = model_registry.get(
+                "spacy", model_name, lambda: self._load_pipeline(model_name, profile), profile=profile
+            )
+            self.nlp = self.nlp_handle.model
+            self.logger.info(f"Loaded spaCy model: {model_name} ({profile}: {', '.join(self.nlp.pipe_names) or 'tokenizer'})")
+            
+            # Other languages are routed to their own pipelines, loaded on first use
+            self.language = self._language_code(language)
+            self.language_models = {**LANGUAGE_MODELS, **(language_models or {})}
+            self.language_models[self.language] = model_name
+            self.detect_language = detect_language
+            self.max_loaded_languages = max_loaded_languages
+            self.language_idle_timeout = language_idle_timeout
+            self._pipelines: "OrderedDict[str, List]" = OrderedDict()  # language -> [handle, last used]
+            self._unavailable_languages = set()
+            self._stop_words: Dict[str, set] = {}
+            self._pipelines_lock = threading.Lock()
+            self._idle_unloader: Optional[threading.Thread] = None
             
             # Custom entity patterns
             self.custom_patterns = self._load_custom_patterns(custom_entities_path)
             
-            # Add custom pattern matcher
+            # Results keyed by text hash and pattern version
+            self.cache = LRUCache(max_size=cache_size, ttl=cache_ttl)
+            self.pattern_version = 0
+            
+            # Combined custom pattern regex, compiled on first use
             self._setup_custom_patterns()
             
+            # City gazetteer, shared like the spaCy pipeline
+            self.gazetteer = None
+            if use_gazetteer:
+                # The pipeline's stop words are never taken as city names
+                self.gazetteer = model_registry.get(
+                    "gazetteer", gazetteer_path or "builtin",
+                    lambda: Gazetteer(gazetteer_path, gazetteer_min_population, self.nlp.Defaults.stop_words),
+                    min_population=gazetteer_min_population
+                ).model
+            
         except Exception as e:
             self.logger.error(f"Failed to initialize entity extractor: {str(e)}")
             raise
@@ -42,6 +136,29 @@ class EntityExtractor:
             format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
         )
     
+    def _load_pipeline(self, model_name: str, profile: str):
+        """
+        Load a spaCy pipeline with the components of a profile excluded.
+        
+        Args:
+            model_name (str): Name of the spaCy model to use
+            profile (str): Pipeline profile
+            
+        Returns:
+            Language: Loaded spaCy pipeline
+        """
+        exclude = PIPELINE_PROFILES[profile]
+        nlp = spacy.load(model_name, exclude=exclude)
+        
+        try:
+            # Components listening to a shared tok2vec fail without it
+            nlp("warm up")
+        except Exception:
+            self.logger.warning(f"Profile {profile} needs tok2vec for {model_name}, keeping it")
+            nlp = spacy.load(model_name, exclude=[name for name in exclude if name != "tok2vec"])
+        
+        return nlp
+    
     def _load_custom_patterns(self, custom_entities_path: Optional[str]) -> Dict:
         """
         Load custom entity patterns from JSON file.
@@ -82,20 +199,65 @@ class EntityExtractor:
         return default_patterns
     
     def _setup_custom_patterns(self):
-        """Set up custom pattern matching rules"""
-        self.matcher = spacy.matcher.Matcher(self.nlp.vocab)
+        """Mark the custom pattern regexes for recompilation and drop stale results"""
+        self._custom_regexes = None
+        self.pattern_version += 1
+        self.cache.clear()
+    
+    def _compile_custom_patterns(self) -> List[Tuple[str, "re.Pattern"]]:
+        """
+        Compile the custom patterns into as few regexes per entity type as possible.
+        
+        Entity types are matched separately, so spans of different types may
+        overlap. Within a type, patterns are joined into one alternation;
+        patterns that cannot be embedded in it (global inline flags such as
+        "(?i)", numbered backreferences or group conditions) keep a regex of
+        their own, and invalid patterns are skipped.
         
-        # Add patterns for custom entity types
+        Returns:
+            List[Tuple[str, re.Pattern]]: (entity type, regex) pairs
+        """
+        regexes = []
         for entity_type, patterns in self.custom_patterns.items():
+            combined, standalone = [], []
             for pattern in patterns:
-                self.matcher.add(entity_type, [[{"TEXT": {"REGEX": pattern}}]])
+                try:
+                    regex = re.compile(pattern)
+                except re.error as e:
+                    self.logger.warning(f"Skipping invalid {entity_type} pattern {pattern!r}: {str(e)}")
+                    continue
+                
+                if NUMBERED_REFERENCE.search(pattern) is None and self._combine(combined + [pattern]) is not None:
+                    combined.append(pattern)
+                else:
+                    standalone.append(regex)
+            
+            if combined:
+                regexes.append((entity_type, self._combine(combined)))
+            regexes.extend((entity_type, regex) for regex in standalone)
+        
+        self._custom_regexes = regexes
+        return regexes
     
-    def extract_entities(self, text: str) -> Dict[str, List[Dict[str, Any]]]:
+    @staticmethod
+    def _combine(patterns: List[str]) -> Optional["re.Pattern"]:
+        """Join patterns into one alternation, None if they cannot be combined"""
+        try:
+            return re.compile("|".join(f"(?:{p})" for p in patterns))
+        except re.error:
+            return None
+    
+    def extract_entities(self, text: str, language: Optional[str] = None,
+                         raise_errors: bool = False) -> Dict[str, List[Dict[str, Any]]]:
         """
         Extract entities from text using both spaCy and custom patterns.
         
         Args:
             text (str): Input text to extract entities from
+            language (Optional[str]): Language of the text (defaults to the detected
+                language if detection is enabled, else the default language)
+            raise_errors (bool): Re-raise extraction errors instead of returning an
+                empty result, for callers that must tell a failure from no entities
             
         Returns:
             Dict[str, List[Dict[str, Any]]]: Dictionary of extracted entities
@@ -104,23 +266,303 @@ class EntityExtractor:
             return {}
         
         try:
-            # Process text with spaCy
-            doc = self.nlp(text)
-            
-            # Initialize results dictionary
-            entities = {
-                "standard": self._extract_spacy_entities(doc),
-                "custom": self._extract_custom_entities(doc),
-                "numeric": self._extract_numeric_entities(doc)
-            }
+            language = self.resolve_language(text, language)
+            key = self._cache_key(text, language)
+            cached = self.cache.get(key)
+            if cached is not None:
+                return self._thaw(cached)
+            
+            # Process text with the language's spaCy pipeline. Inference only
+            # reads the shared pipeline, so concurrent calls need no lock
+            doc = self.get_pipeline(language)(text)
+            entities = self._entities_from_doc(doc)
+            self.cache.put(key, self._freeze(entities))
             
             self.logger.info(f"Extracted {sum(len(v) for v in entities.values())} entities from text")
             return entities
             
         except Exception as e:
             self.logger.error(f"Error extracting entities: {str(e)}")
+            if raise_errors:
+                raise
             return {}
     
+    def _cache_key(self, text: str, language: str) -> Tuple[bytes, str, int]:
+        """Build the result cache key from a digest of the text, the language and the pattern version"""
+        return hashlib.blake2b(text.encode("utf-8"), digest_size=16).digest(), language, self.pattern_version
+    
+    @staticmethod
+    def _freeze(entities: Dict[str, List[Dict[str, Any]]]) -> Tuple:
+        """
+        Convert extraction results to nested tuples for caching.
+        
+        Args:
+            entities (Dict[str, List[Dict[str, Any]]]): Extracted entities
+            
+        Returns:
+            Tuple: Immutable (group, ((field, value), ...) per entity) records
+        """
+        return tuple(
+            (group, tuple(tuple(entity.items()) for entity in group_entities))
+            for group, group_entities in entities.items()
+        )
+    
+    @staticmethod
+    def _thaw(records: Tuple) -> Dict[str, List[Dict[str, Any]]]:
+        """Rebuild fresh entity dictionaries from cached records"""
+        return {group: [dict(entity) for entity in group_entities] for group, group_entities in records}
+    
+    def extract_entities_batch(self,
+                               texts: Iterable[str],
+                               batch_size: int = 64,
+                               n_process: int = 1,
+                               language: Optional[str] = None) -> Iterator[Dict[str, List[Dict[str, Any]]]]:
+        """
+        Stream entities for many texts through spaCy's nlp.pipe.
+        
+        Texts are consumed lazily and results are yielded in input order, so
+        memory stays bounded by the batch size rather than the input size.
+        
+        Args:
+            texts (Iterable[str]): Input texts to extract entities from
+            batch_size (int): Number of texts spaCy processes per batch
+            n_process (int): Number of spaCy worker processes
+            language (Optional[str]): Language of all texts (defaults to the default language)
+            
+        Yields:
+            Dict[str, List[Dict[str, Any]]]: Extracted entities for each text
+        """
+        count = 0
+        nlp = self.get_pipeline(self._language_code(language) if language else self.language)
+        for doc in nlp.pipe((text or "" for text in texts),
+                                 batch_size=batch_size, n_process=n_process):
+            count += 1
+            if not doc.text:
+                yield {}
+                continue
+            
+            try:
+                yield self._entities_from_doc(doc)
+            except Exception as e:
+                self.logger.error(f"Error extracting entities: {str(e)}")
+                yield {}
+        
+        self.logger.info(f"Extracted entities from {count} texts")
+    
+    @staticmethod
+    def _language_code(language: str) -> str:
+        """Reduce a locale such as "en-US" to its language code"""
+        return re.split(r"[-_]", language.strip().lower())[0]
+    
+    def resolve_language(self, text: str, language: Optional[str] = None) -> str:
+        """
+        Decide which language pipeline handles a text.
+        
+        Args:
+            text (str): Input text
+            language (Optional[str]): Explicit language, if known
+            
+        Returns:
+            str: Language code
+        """
+        if language:
+            return self._language_code(language)
+        if self.detect_language:
+            return self._detect_language(text)
+        return self.language
+    
+    def _detect_language(self, text: str) -> str:
+        """
+        Guess the language of a text by counting stop words of each routed language.
+        
+        Args:
+            text (str): Input text
+            
+        Returns:
+            str: Best language code, the default language on ties or no evidence
+        """
+        words = re.findall(r"\w+", text.lower())
+        best, best_hits = self.language, 0
+        for language in self.language_models:
+            if language in self._unavailable_languages:
+                continue
+            if language not in self._stop_words:
+                try:
+                    self._stop_words[language] = spacy.util.get_lang_class(language).Defaults.stop_words
+                except Exception:
+                    self._stop_words[language] = set()
+            hits = sum(word in self._stop_words[language] for word in words)
+            if hits > best_hits or (hits == best_hits and hits and language == self.language):
+                best, best_hits = language, hits
+        return best
+    
+    def get_pipeline(self, language: str):
+        """
+        Get the spaCy pipeline of a language, loading it on first use.
+        
+        Args:
+            language (str): Language code
+            
+        Returns:
+            Language: spaCy pipeline
+        """
+        return self.get_pipeline_handle(language).model
+    
+    def get_pipeline_handle(self, language: str) -> ModelHandle:
+        """
+        Get the registry handle of a language's spaCy pipeline, loading it on first use.
+        
+        Pipelines are shared across extractors and threads; inference only
+        reads them, so callers run them without taking the handle's lock.
+        
+        Non-default pipelines live in a bounded LRU; the least recently used one
+        is released when the bound is exceeded, and a background thread releases
+        those unused for language_idle_timeout even if no further call comes.
+        Languages without an installed model fall back to
+        the default pipeline.
+        
+        Args:
+            language (str): Language code
+            
+        Returns:
+            ModelHandle: Handle of the spaCy pipeline
+        """
+        self.unload_idle_pipelines()
+        if (language == self.language or language not in self.language_models
+                or language in self._unavailable_languages):
+            return self.nlp_handle
+        
+        with self._pipelines_lock:
+            entry = self._pipelines.get(language)
+            if entry is not None:
+                entry[1] = time.monotonic()
+                self._pipelines.move_to_end(language)
+                return entry[0]
+        
+        # Load outside the lock; the registry serializes loads of the same model
+        model_name = self.language_models[language]
+        try:
+            handle = model_registry.get(
+                "spacy", model_name, lambda: self._load_pipeline(model_name, self.profile), profile=self.profile
+            )
+        except Exception as e:
+            self.logger.warning(f"No pipeline for language {language} ({str(e)}), using {self.language}")
+            self._unavailable_languages.add(language)
+            return self.nlp_handle
+        
+        evicted: List[ModelHandle] = []
+        with self._pipelines_lock:
+            if language in self._pipelines:
+                # Another thread loaded it meanwhile
+                evicted.append(handle)
+                handle = self._pipelines[language][0]
+            self._pipelines[language] = [handle, time.monotonic()]
+            self._pipelines.move_to_end(language)
+            while len(self._pipelines) > max(0, self.max_loaded_languages):
+                _, (old_handle, _) = self._pipelines.popitem(last=False)
+                evicted.append(old_handle)
+        
+        for old_handle in evicted:
+            model_registry.release(old_handle)
+        self._start_idle_unloader()
+        
+        self.logger.info(f"Routed language {language} to {model_name}")
+        return handle
+    
+    def _start_idle_unloader(self):
+        """Release idle pipelines from a daemon thread while non-default ones are loaded"""
+        if self.language_idle_timeout is None:
+            return
+        
+        with self._pipelines_lock:
+            if self._idle_unloader is not None or not self._pipelines:
+                return
+            self._idle_unloader = threading.Thread(target=self._idle_unload_loop,
+                                                   name="spacy-idle-unload", daemon=True)
+            self._idle_unloader.start()
+    
+    def _idle_unload_loop(self):
+        """Check for idle pipelines until none is loaded, so a quiet process frees them too"""
+        interval = max(0.05, self.language_idle_timeout / 2)
+        while True:
+            time.sleep(interval)
+            try:
+                self.unload_idle_pipelines()
+            except Exception as e:
+                self.logger.error(f"Error unloading idle pipelines: {str(e)}")
+            
+            with self._pipelines_lock:
+                if not self._pipelines:
+                    self._idle_unloader = None
+                    return
+    
+    def unload_idle_pipelines(self) -> List[str]:
+        """
+        Release non-default pipelines unused for longer than language_idle_timeout.
+        
+        Returns:
+            List[str]: Languages whose pipelines were released
+        """
+        if self.language_idle_timeout is None or not self._pipelines:
+            return []
+        
+        now = time.monotonic()
+        idle = []
+        with self._pipelines_lock:
+            for language, (handle, last_used) in list(self._pipelines.items()):
+                if now - last_used > self.language_idle_timeout:
+                    del self._pipelines[language]
+                    idle.append((language, handle))
+        
+        for language, handle in idle:
+            model_registry.release(handle)
+            self.logger.info(f"Unloaded idle pipeline for language {language}")
+        return [language for language, _ in idle]
+    
+    def _entities_from_doc(self, doc) -> Dict[str, List[Dict[str, Any]]]:
+        """
+        Collect all entity groups from a processed document.
+        
+        Args:
+            doc: spaCy document
+            
+        Returns:
+            Dict[str, List[Dict[str, Any]]]: Dictionary of extracted entities
+        """
+        return {
+            "standard": self._extract_standard_entities(doc),
+            "custom": self._extract_custom_entities(doc),
+            "numeric": self._extract_numeric_entities(doc)
+        }
+    
+    def _extract_standard_entities(self, doc) -> List[Dict[str, Any]]:
+        """
+        Extract spaCy entities merged with gazetteer locations.
+        
+        Gazetteer matches carry coordinates, so they replace any spaCy
+        location entity they overlap.
+        
+        Args:
+            doc: spaCy document
+            
+        Returns:
+            List[Dict[str, Any]]: Standard entities ordered by position
+        """
+        entities = self._extract_spacy_entities(doc)
+        if self.gazetteer is None:
+            return entities
+        
+        locations = self.gazetteer.find(doc.text)
+        if not locations:
+            return entities
+        
+        entities = [
+            ent for ent in entities
+            if ent["label"] not in ("GPE", "LOC")
+            or not any(ent["start"] < loc["end"] and loc["start"] < ent["end"] for loc in locations)
+        ]
+        return sorted(entities + locations, key=lambda ent: ent["start"])
+    
     def _extract_spacy_entities(self, doc) -> List[Dict[str, Any]]:
         """Extract standard spaCy entities"""
         return [
@@ -137,20 +579,30 @@ class EntityExtractor:
     def _extract_custom_entities(self, doc) -> List[Dict[str, Any]]:
         """Extract entities using custom patterns"""
         custom_entities = []
-        matches = self.matcher(doc)
+        regexes = self._custom_regexes
+        if regexes is None:
+            regexes = self._compile_custom_patterns()
         
-        for match_id, start, end in matches:
-            span = doc[start:end]
-            entity_type = self.nlp.vocab.strings[match_id]
-            
-            custom_entities.append({
-                "text": span.text,
-                "label": entity_type,
-                "start": span.start_char,
-                "end": span.end_char,
-                "confidence": 0.9  # Custom confidence score for pattern matches
-            })
+        # One pass over the raw text per entity type; matches may span several tokens
+        for entity_type, regex in regexes:
+            for match in regex.finditer(doc.text):
+                if match.start() == match.end():
+                    continue
+                
+                # Map the character span back to whole tokens
+                span = doc.char_span(match.start(), match.end(), alignment_mode="expand")
+                if span is None:
+                    continue
+                
+                custom_entities.append({
+                    "text": span.text,
+                    "label": entity_type,
+                    "start": span.start_char,
+                    "end": span.end_char,
+                    "confidence": 0.9  # Custom confidence score for pattern matches
+                })
         
+        custom_entities.sort(key=lambda entity: entity["start"])
         return custom_entities
     
     def _extract_numeric_entities(self, doc) -> List[Dict[str, Any]]:
@@ -188,16 +640,31 @@ class EntityExtractor:
             pattern (str): Regex pattern for matching
         """
         try:
+            # Reject invalid patterns; valid ones that cannot join the type's
+            # alternation are matched on their own
+            re.compile(pattern)
+            
             if entity_type not in self.custom_patterns:
                 self.custom_patterns[entity_type] = []
             
             self.custom_patterns[entity_type].append(pattern)
-            self.matcher.add(entity_type, [[{"TEXT": {"REGEX": pattern}}]])
+            self._setup_custom_patterns()
             
             self.logger.info(f"Added new pattern for entity type: {entity_type}")
         except Exception as e:
             self.logger.error(f"Error adding custom pattern: {str(e)}")
     
+    def get_cache_stats(self) -> Dict[str, Any]:
+        """
+        Get extraction result cache statistics.
+        
+        Returns:
+            Dict[str, Any]: Hit/miss counters, hit rate, current size and pattern version
+        """
+        stats = self.cache.get_stats()
+        stats["pattern_version"] = self.pattern_version
+        return stats
+    
     def get_supported_entities(self) -> Dict[str, List[str]]:
         """
         Get list of supported entity types.
@@ -206,6 +673,10 @@ class EntityExtractor:
             Dict[str, List[str]]: Dictionary of supported entity types
         """
         return {
-            "spacy": [ent for ent in self.nlp.pipe_labels['ner']],
-            "custom": list(self.custom_patterns.keys())
+            "spacy": list(self.nlp.pipe_labels.get('ner', [])),
+            "custom": list(self.custom_patterns.keys()),
+            "gazetteer": ["GPE"] if self.gazetteer is not None else [],
+            "profile": [self.profile],
+            "components": list(self.nlp.pipe_names),
+            "languages": [self.language, *self._pipelines.keys()]
         }
\ No newline at end of file
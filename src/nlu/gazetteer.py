@@ -0,0 +1,315 @@
+from typing import Any, Dict, Iterable, List, Optional
+import json
+import logging
+import re
+import unicodedata
+from pathlib import Path
+import marisa_trie
+
+# Built-in cities used when no city list is configured:
+# (name, country, latitude, longitude, population, aliases)
+DEFAULT_CITIES = [
+    ("New York", "US", 40.7128, -74.0060, 8336817, ["nyc", "new york city"]),
+    ("Los Angeles", "US", 34.0522, -118.2437, 3979576, ["la"]),
+    ("Chicago", "US", 41.8781, -87.6298, 2693976, []),
+    ("Houston", "US", 29.7604, -95.3698, 2320268, []),
+    ("Phoenix", "US", 33.4484, -112.0740, 1680992, []),
+    ("Philadelphia", "US", 39.9526, -75.1652, 1584064, ["philly"]),
+    ("San Francisco", "US", 37.7749, -122.4194, 881549, ["sf", "san fran"]),
+    ("Seattle", "US", 47.6062, -122.3321, 753675, []),
+    ("Boston", "US", 42.3601, -71.0589, 692600, []),
+    ("Washington", "US", 38.9072, -77.0369, 705749, ["washington dc", "washington d c"]),
+    ("Miami", "US", 25.7617, -80.1918, 467963, []),
+    ("Toronto", "CA", 43.6532, -79.3832, 2731571, []),
+    ("Vancouver", "CA", 49.2827, -123.1207, 631486, []),
+    ("Montreal", "CA", 45.5017, -73.5673, 1704694, []),
+    ("Mexico City", "MX", 19.4326, -99.1332, 9209944, []),
+    ("Sao Paulo", "BR", -23.5505, -46.6333, 12325232, []),
+    ("Rio de Janeiro", "BR", -22.9068, -43.1729, 6747815, ["rio"]),
+    ("Buenos Aires", "AR", -34.6037, -58.3816, 3075646, []),
+    ("London", "GB", 51.5074, -0.1278, 8982000, []),
+    ("Manchester", "GB", 53.4808, -2.2426, 553230, []),
+    ("Dublin", "IE", 53.3498, -6.2603, 554554, []),
+    ("Paris", "FR", 48.8566, 2.3522, 2161000, []),
+    ("Nice", "FR", 43.7102, 7.2620, 342669, []),
+    ("Berlin", "DE", 52.5200, 13.4050, 3645000, []),
+    ("Munich", "DE", 48.1351, 11.5820, 1472000, ["muenchen"]),
+    ("Madrid", "ES", 40.4168, -3.7038, 3223000, []),
+    ("Barcelona", "ES", 41.3851, 2.1734, 1620000, []),
+    ("Rome", "IT", 41.9028, 12.4964, 2873000, ["roma"]),
+    ("Milan", "IT", 45.4642, 9.1900, 1352000, ["milano"]),
+    ("Amsterdam", "NL", 52.3676, 4.9041, 872680, []),
+    ("Stockholm", "SE", 59.3293, 18.0686, 975551, []),
+    ("Moscow", "RU", 55.7558, 37.6173, 12506468, []),
+    ("Istanbul", "TR", 41.0082, 28.9784, 15462452, []),
+    ("Cairo", "EG", 30.0444, 31.2357, 9539673, []),
+    ("Lagos", "NG", 6.5244, 3.3792, 8048430, []),
+    ("Nairobi", "KE", -1.2921, 36.8219, 4397073, []),
+    ("Johannesburg", "ZA", -26.2041, 28.0473, 5635127, ["joburg"]),
+    ("Dubai", "AE", 25.2048, 55.2708, 3331420, []),
+    ("Mumbai", "IN", 19.0760, 72.8777, 12442373, ["bombay"]),
+    ("Delhi", "IN", 28.7041, 77.1025, 11034555, ["new delhi"]),
+    ("Bangalore", "IN", 12.9716, 77.5946, 8443675, ["bengaluru"]),
+    ("Beijing", "CN", 39.9042, 116.4074, 21540000, ["peking"]),
+    ("Shanghai", "CN", 31.2304, 121.4737, 24870895, []),
+    ("Hong Kong", "HK", 22.3193, 114.1694, 7482500, []),
+    ("Singapore", "SG", 1.3521, 103.8198, 5685800, []),
+    ("Tokyo", "JP", 35.6762, 139.6503, 13960000, []),
+    ("Seoul", "KR", 37.5665, 126.9780, 9776000, []),
+    ("Bangkok", "TH", 13.7563, 100.5018, 10539000, []),
+    ("Sydney", "AU", -33.8688, 151.2093, 5312163, []),
+    ("Melbourne", "AU", -37.8136, 144.9631, 5078193, []),
+]
+
+# Single-word names that are also common words; a capitalized one at the
+# start of a sentence is not taken as a city
+AMBIGUOUS_NAMES = {"nice", "reading", "mobile", "bath", "split", "la", "rio", "sf"}
+
+# Words right before a place name ("in Paris", "to paris")
+LOCATIVE_WORDS = {"in", "at", "to", "from", "near", "around", "for"}
+
+# Words that make a place name likely anywhere in the utterance
+LOCATION_TOPIC_WORDS = {"weather", "forecast", "temperature", "rain", "raining", "snow",
+                        "snowing", "sunny", "humidity", "wind", "windy"}
+
+class Gazetteer:
+    # Longest name, in words, considered for a match
+    MAX_NAME_WORDS = 6
+    WORD_RE = re.compile(r"\w+")
+
+    def __init__(self,
+                 cities_path: Optional[str] = None,
+                 min_single_word_population: int = 100000,
+                 common_words: Optional[Iterable[str]] = None):
+        """
+        Initialize a city gazetteer backed by a marisa trie.
+
+        Names are folded (lowercase, accents stripped, punctuation dropped) so
+        lowercase and ASR transcripts match. When several cities share a name
+        the most populous one wins.
+
+        Single-word names are easily ordinary words. From a loaded city list
+        they are kept only for cities of at least min_single_word_population
+        that are not common words, and in text they match only when
+        capitalized mid-sentence or next to a location cue ("in", "weather").
+
+        Args:
+            cities_path (Optional[str]): City list, either a JSON list of
+                {"name", "country", "latitude", "longitude", "population", "aliases"}
+                objects or a GeoNames cities dump (.txt); defaults to a built-in list
+            min_single_word_population (int): Smallest population of a city in a
+                loaded list whose single-word names are matched
+            common_words (Optional[Iterable[str]]): Words never taken as a
+                single-word name from a loaded list (e.g. a pipeline's stop words)
+        """
+        # Set up logging
+        self.logger = logging.getLogger(__name__)
+        self._setup_logging()
+
+        self.common_words = AMBIGUOUS_NAMES | {self.fold(word) for word in common_words or ()}
+        self.cities = self._load_cities(cities_path)
+        self.trie = self._build_trie(self.cities, min_single_word_population if cities_path else 0)
+
+        # First words of all names, so most words are rejected without a trie lookup
+        self.first_words = {key.split(" ", 1)[0] for key in self.trie.keys()}
+        self.logger.info(f"Built gazetteer with {len(self.cities)} cities, {len(self.trie)} names")
+
+    def _setup_logging(self):
+        """Configure logging for the gazetteer"""
+        logging.basicConfig(
+            level=logging.INFO,
+            format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+        )
+
+    @staticmethod
+    def fold(text: str) -> str:
+        """
+        Fold a name or text for matching.
+
+        Args:
+            text (str): Text to fold
+
+        Returns:
+            str: Lowercase ASCII words joined by single spaces
+        """
+        text = unicodedata.normalize("NFKD", text)
+        text = "".join(c for c in text if not unicodedata.combining(c))
+        return " ".join(Gazetteer.WORD_RE.findall(text.lower()))
+
+    def _load_cities(self, cities_path: Optional[str]) -> List[Dict[str, Any]]:
+        """
+        Load the city list.
+
+        Args:
+            cities_path (Optional[str]): Path to a JSON list or GeoNames dump
+
+        Returns:
+            List[Dict[str, Any]]: City records
+        """
+        if cities_path and Path(cities_path).exists():
+            try:
+                if cities_path.endswith(".json"):
+                    with open(cities_path, 'r', encoding='utf-8') as f:
+                        cities = json.load(f)
+                else:
+                    cities = self._load_geonames(cities_path)
+                self.logger.info(f"Loaded city list from {cities_path}")
+                return cities
+            except Exception as e:
+                self.logger.error(f"Error loading city list: {str(e)}")
+        elif cities_path:
+            self.logger.warning(f"City list {cities_path} not found, using built-in cities")
+
+        return [
+            {
+                "name": name,
+                "country": country,
+                "latitude": lat,
+                "longitude": lon,
+                "population": population,
+                "aliases": aliases
+            }
+            for name, country, lat, lon, population, aliases in DEFAULT_CITIES
+        ]
+
+    @staticmethod
+    def _load_geonames(cities_path: str) -> List[Dict[str, Any]]:
+        """Load a tab-separated GeoNames cities dump (e.g. cities15000.txt)"""
+        cities = []
+        with open(cities_path, 'r', encoding='utf-8') as f:
+            for line in f:
+                fields = line.rstrip("\n").split("\t")
+                if len(fields) < 15:
+                    continue
+                cities.append({
+                    "name": fields[1],
+                    "country": fields[8],
+                    "latitude": float(fields[4]),
+                    "longitude": float(fields[5]),
+                    "population": int(fields[14] or 0),
+                    # Alternate names are mostly other scripts; keep the ASCII name
+                    "aliases": [fields[2]] if fields[2] != fields[1] else []
+                })
+        return cities
+
+    def _build_trie(self,
+                    cities: List[Dict[str, Any]],
+                    min_single_word_population: int = 0) -> marisa_trie.RecordTrie:
+        """
+        Map every folded name and alias to its most populous city.
+
+        Args:
+            cities (List[Dict[str, Any]]): City records
+            min_single_word_population (int): Smallest population whose
+                single-word names are kept; when positive, single-word names
+                that are common words are dropped as well
+
+        Returns:
+            marisa_trie.RecordTrie: Folded name -> city index
+        """
+        best: Dict[str, int] = {}
+        for i, city in enumerate(cities):
+            for name in [city["name"], *city.get("aliases", [])]:
+                key = self.fold(name)
+                if not key or len(key.split()) > self.MAX_NAME_WORDS:
+                    continue
+                if min_single_word_population and " " not in key and (
+                        key in self.common_words or city.get("population", 0) < min_single_word_population):
+                    continue
+                current = best.get(key)
+                if current is None or city.get("population", 0) > cities[current].get("population", 0):
+                    best[key] = i
+
+        return marisa_trie.RecordTrie("<I", ((key, (i,)) for key, i in best.items()))
+
+    def find(self, text: str) -> List[Dict[str, Any]]:
+        """
+        Find city names in text, preferring the longest match at each word.
+
+        Args:
+            text (str): Input text
+
+        Returns:
+            List[Dict[str, Any]]: GPE entities with canonical name, country and coordinates
+        """
+        words = []
+        for m in self.WORD_RE.finditer(text):
+            word = m.group()
+            # Only non-ASCII words need the full unicode fold
+            word = word.lower() if word.isascii() else self.fold(word)
+            if word:
+                words.append((m.start(), m.end(), word))
+        entities = []
+        topic = any(word in LOCATION_TOPIC_WORDS for _, _, word in words)
+
+        i = 0
+        while i < len(words):
+            if words[i][2] not in self.first_words:
+                i += 1
+                continue
+            
+            window = words[i:i + self.MAX_NAME_WORDS]
+            query = " ".join(w[2] for w in window)
+
+            # Word ends within the query, so only whole-word prefixes count
+            ends, offset = {}, -1
+            for j, (_, _, word) in enumerate(window):
+                offset += len(word) + 1
+                ends[offset] = j
+
+            match = None
+            for key in self.trie.prefixes(query):
+                if len(key) in ends and (match is None or len(key) > len(match)):
+                    match = key
+
+            if match is None:
+                i += 1
+                continue
+
+            last = i + ends[len(match)]
+            start, end = words[i][0], words[last][1]
+            surface = text[start:end]
+            if last == i and not self._single_word_plausible(text, words, i, match, topic):
+                i += 1
+                continue
+
+            city = self.cities[self.trie[match][0][0]]
+            entities.append({
+                "text": surface,
+                "label": "GPE",
+                "start": start,
+                "end": end,
+                "confidence": 0.95,
+                "canonical": city["name"],
+                "country": city.get("country"),
+                "latitude": city["latitude"],
+                "longitude": city["longitude"],
+                "source": "gazetteer"
+            })
+            i = last + 1
+
+        return entities
+
+    def _single_word_plausible(self, text: str, words: List[tuple], i: int, name: str, topic: bool) -> bool:
+        """
+        Decide whether a single word matching a city name refers to the city.
+
+        Args:
+            text (str): Input text
+            words (List[tuple]): (start, end, folded word) of every word
+            i (int): Index of the matched word
+            name (str): Folded matched name
+            topic (bool): The text mentions the weather or similar
+
+        Returns:
+            bool: True for a location cue or a capitalized, unambiguous use
+        """
+        if topic or (i and words[i - 1][2] in LOCATIVE_WORDS):
+            return True
+        if not text[words[i][0]].isupper():
+            return False
+
+        # "Nice to meet you": sentence-initial capitals say nothing about common words
+        before = text[:words[i][0]].rstrip()
+        sentence_start = not before or before[-1] in ".!?"
+        return not (sentence_start and name in self.common_words)
@@ -0,0 +1,163 @@
+from typing import Any, Dict, List, Tuple
+import logging
+
+from src.nlu.entity_extractor import EntityExtractor
+
+class IncrementalEntitySession:
+    def __init__(self, entity_extractor: EntityExtractor, context_chars: int = 64):
+        """
+        Initialize an entity extraction session over a growing transcript.
+
+        Each update re-analyzes only a suffix window: the changed text plus
+        context_chars of stable text before it, extended back so no entity is
+        cut in half. Entities ending before the window are kept as they are.
+        A session tracks one transcript and is not thread-safe.
+
+        Args:
+            entity_extractor (EntityExtractor): Extractor used for the suffix windows
+            context_chars (int): Characters of unchanged text re-analyzed for context
+        """
+        # Set up logging
+        self.logger = logging.getLogger(__name__)
+        self._setup_logging()
+
+        self.entity_extractor = entity_extractor
+        self.context_chars = context_chars
+
+        self.text = ""
+        self.entities: List[Dict[str, Any]] = []
+        self.analyzed_chars = 0
+
+    def _setup_logging(self):
+        """Configure logging for the incremental session"""
+        logging.basicConfig(
+            level=logging.INFO,
+            format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+        )
+
+    def append(self, text: str) -> Dict[str, List[Dict[str, Any]]]:
+        """
+        Append text to the transcript.
+
+        Args:
+            text (str): Newly recognized text, including any leading space
+
+        Returns:
+            Dict[str, List[Dict[str, Any]]]: Added, changed and retracted entities
+        """
+        return self.update(self.text + text)
+
+    def update(self, transcript: str) -> Dict[str, List[Dict[str, Any]]]:
+        """
+        Replace the transcript with a newer partial result.
+
+        Recognizers may revise the tail of a partial transcript, so the window
+        starts where the new transcript diverges from the old one. If
+        extraction fails the session is left as it was and no deltas are
+        reported, so the next update retries the window.
+
+        Args:
+            transcript (str): Full transcript so far
+
+        Returns:
+            Dict[str, List[Dict[str, Any]]]: Added, changed and retracted entities;
+                every entity carries its group ("standard", "custom", "numeric")
+        """
+        deltas = {"added": [], "changed": [], "retracted": []}
+        if transcript == self.text:
+            return deltas
+
+        try:
+            cut = self._window_start(transcript)
+            stable = [ent for ent in self.entities if ent["end"] <= cut]
+            previous = {self._identity(ent): ent for ent in self.entities if ent["end"] > cut}
+
+            current = []
+            window = transcript[cut:]
+            if window.strip():
+                # A failed extraction raises rather than reporting an empty window,
+                # so the session keeps its entities and text and the next update
+                # re-analyzes the same window
+                extracted = self.entity_extractor.extract_entities(window, raise_errors=True)
+                for group, group_entities in extracted.items():
+                    for entity in group_entities:
+                        entity = dict(entity, group=group,
+                                      start=entity["start"] + cut, end=entity["end"] + cut)
+                        current.append(entity)
+
+            for entity in current:
+                old = previous.pop(self._identity(entity), None)
+                if old is None:
+                    deltas["added"].append(entity)
+                elif old != entity:
+                    deltas["changed"].append(entity)
+            deltas["retracted"] = list(previous.values())
+
+            self.text = transcript
+            self.analyzed_chars += len(window)
+            self.entities = sorted(stable + current, key=lambda ent: (ent["start"], ent["end"]))
+
+        except Exception as e:
+            self.logger.error(f"Error updating entity session: {str(e)}")
+            deltas = {"added": [], "changed": [], "retracted": []}
+
+        return deltas
+
+    def _window_start(self, transcript: str) -> int:
+        """
+        Find where re-analysis of a new transcript has to start.
+
+        Args:
+            transcript (str): New transcript
+
+        Returns:
+            int: Character offset at a word boundary before which nothing changes
+        """
+        # Length of the unchanged prefix
+        common = 0
+        limit = min(len(self.text), len(transcript))
+        while common < limit and self.text[common] == transcript[common]:
+            common += 1
+
+        cut = self._word_boundary(transcript, max(0, common - self.context_chars))
+
+        # Never split an entity that reaches into the window
+        moved = True
+        while moved:
+            moved = False
+            for entity in self.entities:
+                if entity["start"] < cut < entity["end"]:
+                    cut = self._word_boundary(transcript, entity["start"])
+                    moved = True
+        return cut
+
+    @staticmethod
+    def _word_boundary(text: str, offset: int) -> int:
+        """Move an offset back to the start of the word containing it"""
+        while offset > 0 and not text[offset - 1].isspace():
+            offset -= 1
+        return offset
+
+    @staticmethod
+    def _identity(entity: Dict[str, Any]) -> Tuple[str, str, int]:
+        """Entities are the same across updates if group, label and start agree"""
+        return entity["group"], entity["label"], entity["start"]
+
+    def get_entities(self) -> Dict[str, List[Dict[str, Any]]]:
+        """
+        Get the entities of the current transcript.
+
+        Returns:
+            Dict[str, List[Dict[str, Any]]]: Entities grouped as extract_entities returns them
+        """
+        grouped: Dict[str, List[Dict[str, Any]]] = {"standard": [], "custom": [], "numeric": []}
+        for entity in self.entities:
+            entity = dict(entity)
+            grouped.setdefault(entity.pop("group"), []).append(entity)
+        return grouped
+
+    def reset(self):
+        """Start a new transcript"""
+        self.text = ""
+        self.entities = []
+        self.analyzed_chars = 0
@@ -6,14 +6,44 @@ import numpy as np
 from sklearn.preprocessing import LabelEncoder
 import torch
 from transformers import AutoTokenizer, AutoModel
-import re
+import threading
 from collections import defaultdict
 
+from src.nlu.pattern_embeddings import PatternEmbeddingStore
+from src.nlu.pattern_index import PatternIndex, normalize_text
+from src.nlu.ann_index import IVFIndex
+from src.nlu.intent_head import LinearIntentHead
+from src.utils.cache import LRUCache
+from src.utils.model_registry import model_registry
+from src.utils.rw_lock import ReadWriteLock
+
 class IntentClassifier:
+    # Supported inference backends for the transformer encoder
+    BACKENDS = ("fp32", "int8", "torchscript")
+    
+    # Fixed sequence length the torchscript graph is traced with
+    TRACE_MAX_LENGTH = 64
+    
+    # When the transformer tier is loaded
+    LOAD_MODES = ("eager", "lazy", "background")
+    
+    # Intent scores kept on transformer-tier results
+    TOP_K_SCORES = 5
+    
     def __init__(self, 
                  model_name: str = "distilbert-base-uncased",
                  threshold: float = 0.5,
-                 intents_file: Optional[str] = None):
+                 intents_file: Optional[str] = None,
+                 embedding_cache_dir: Optional[str] = "cache/intents",
+                 cache_size: int = 1024,
+                 cache_ttl: Optional[float] = 3600,
+                 backend: str = "fp32",
+                 check_parity: bool = False,
+                 parity_min_agreement: float = 0.98,
+                 load_mode: str = "eager",
+                 ann_min_patterns: int = 5000,
+                 ann_n_probe: int = 8,
+                 use_head: bool = False):
         """
         Initialize the intent classifier.
         
@@ -21,25 +51,82 @@ class IntentClassifier:
             model_name (str): Name of the transformer model to use
             threshold (float): Confidence threshold for intent classification
             intents_file (Optional[str]): Path to custom intents JSON file
+            embedding_cache_dir (Optional[str]): Directory for persisted pattern
+                embeddings (None keeps them in memory only)
+            cache_size (int): Maximum number of cached classifications (0 disables)
+            cache_ttl (Optional[float]): Lifetime of cached classifications in seconds
+            backend (str): Encoder inference backend ("fp32", "int8" or "torchscript")
+            check_parity (bool): Compare a non-fp32 backend against fp32 at startup
+                and fall back to fp32 if intent agreement is too low
+            parity_min_agreement (float): Minimum intent agreement accepted by the parity check
+            load_mode (str): "eager" loads the transformer here, "lazy" on the first
+                fallback, "background" in a warm-up thread; until it is ready,
+                classify serves rule-only results
+            ann_min_patterns (int): Pattern count from which the transformer tier
+                searches an approximate nearest-neighbour index instead of
+                averaging over every pattern
+            ann_n_probe (int): Number of index clusters searched per query
+            use_head (bool): Classify transformer-tier queries with a softmax
+                head trained on the pattern embeddings
         """
         # Set up logging
         self.logger = logging.getLogger(__name__)
         self._setup_logging()
         
         try:
-            # Load transformer model and tokenizer
-            self.tokenizer = AutoTokenizer.from_pretrained(model_name)
-            self.model = AutoModel.from_pretrained(model_name)
+            if load_mode not in self.LOAD_MODES:
+                raise ValueError(f"Unsupported load mode: {load_mode}")
+            
+            self.model_name = model_name
+            self.embedding_cache_dir = embedding_cache_dir
             self.threshold = threshold
+            self.backend = backend
+            self.check_parity = check_parity
+            self.parity_min_agreement = parity_min_agreement
+            self.load_mode = load_mode
+            self.intents_file = intents_file
+            self.ann_min_patterns = ann_min_patterns
+            self.ann_n_probe = ann_n_probe
+            self.use_head = use_head
             
             # Load intent patterns
             self.intents = self._load_intents(intents_file)
             
+            # Transformer tier state, filled in by load_transformer
+            self.tokenizer = None
+            self.tokenizer_handle = None
+            self.model = None
+            self.model_handle = None
+            self.pattern_store = None
+            self.ann_index = None
+            self.head = LinearIntentHead() if use_head else None
+            self._transformer_ready = threading.Event()
+            self._transformer_failed = False
+            self._transformer_lock = threading.RLock()
+            # Held shared by the rule and transformer tiers, exclusively by add_intent
+            self._intents_lock = ReadWriteLock()
+            
+            # Build token inverted index for the rule tier
+            self.pattern_index = PatternIndex()
+            self.pattern_index.rebuild(self.intents)
+            
             # Initialize label encoder
             self.label_encoder = LabelEncoder()
             self.label_encoder.fit(list(self.intents.keys()))
             
-            self.logger.info(f"Initialized intent classifier with model: {model_name}")
+            # Cache of results keyed by normalized utterance; the version lets
+            # add_intent discard results computed from the previous intents
+            self.cache = LRUCache(max_size=cache_size, ttl=cache_ttl)
+            self.intents_version = 0
+            self._cache_lock = threading.Lock()
+            
+            if load_mode == "eager":
+                if not self.load_transformer():
+                    raise RuntimeError(f"Could not load transformer model: {model_name}")
+            elif load_mode == "background":
+                self.warm_up()
+            
+            self.logger.info(f"Initialized intent classifier with model: {model_name} ({load_mode})")
             
         except Exception as e:
             self.logger.error(f"Failed to initialize intent classifier: {str(e)}")
@@ -52,6 +139,88 @@ class IntentClassifier:
             format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
         )
     
+    def load_transformer(self) -> bool:
+        """
+        Load the tokenizer and encoder and precompute pattern embeddings.
+        
+        Safe to call from several threads; the load happens only once.
+        
+        Returns:
+            bool: True if the transformer tier is ready
+        """
+        if self._transformer_ready.is_set():
+            return True
+        
+        with self._transformer_lock:
+            if self._transformer_ready.is_set() or self._transformer_failed:
+                return self._transformer_ready.is_set()
+            
+            try:
+                # Shared with every classifier in the process using the same model
+                self.tokenizer_handle = model_registry.get(
+                    "tokenizer", self.model_name,
+                    lambda: AutoTokenizer.from_pretrained(self.model_name)
+                )
+                self.tokenizer = self.tokenizer_handle.model
+                backend = self.backend
+                self._set_backend(backend)
+                
+                if self.check_parity and backend != "fp32":
+                    parity = self.check_backend_parity()
+                    if parity["intent_agreement"] < self.parity_min_agreement:
+                        self.logger.warning(f"Backend {backend} failed parity check ({parity}), using fp32")
+                        self._set_backend("fp32")
+                
+                self._transformer_ready.set()
+                self.logger.info(f"Loaded transformer model: {self.model_name} ({self.backend})")
+                
+            except Exception as e:
+                self._transformer_failed = True
+                self.logger.error(f"Failed to load transformer model: {str(e)}")
+        
+        return self._transformer_ready.is_set()
+    
+    def warm_up(self) -> threading.Thread:
+        """
+        Load the transformer tier in a background thread.
+        
+        Returns:
+            threading.Thread: The warm-up thread
+        """
+        thread = threading.Thread(target=self.load_transformer, name="intent-warmup")
+        thread.daemon = True
+        thread.start()
+        return thread
+    
+    def is_transformer_ready(self) -> bool:
+        """Check whether the transformer tier has finished loading"""
+        return self._transformer_ready.is_set()
+    
+    def release_models(self):
+        """
+        Give the shared tokenizer and encoder back to the model registry.
+        
+        The registry unloads them once no other classifier uses them. Call this
+        when the classifier is done with the transformer tier; a lazy
+        classifier loads it again on its next fallback.
+        """
+        with self._transformer_lock:
+            self._transformer_ready.clear()
+            for handle in (self.model_handle, self.tokenizer_handle):
+                if handle is not None:
+                    model_registry.release(handle)
+            self.model_handle = self.tokenizer_handle = None
+            self.model = self.tokenizer = None
+            self.logger.info(f"Released transformer model: {self.model_name}")
+    
+    def _transformer_available(self) -> bool:
+        """Check whether a fallback may use the transformer, loading it if lazy"""
+        if self._transformer_ready.is_set():
+            return True
+        if self.load_mode == "lazy":
+            return self.load_transformer()
+        return False
+    
     def _load_intents(self, intents_file: Optional[str]) -> Dict[str, Dict]:
         """
         Load intent patterns from file or use defaults.
@@ -110,57 +279,206 @@ class IntentClassifier:
         
         return default_intents
     
-    def classify(self, text: str) -> Dict[str, Any]:
+    def quick_classify(self, text: str, normalized: Optional[str] = None) -> Optional[Dict[str, Any]]:
+        """
+        Classify from the cache or a confident rule match, without the transformer.
+        
+        Args:
+            text (str): Input text to classify
+            normalized (Optional[str]): The text already passed through
+                normalize_text, when the caller has it
+            
+        Returns:
+            Optional[Dict[str, Any]]: Classification results, None if the
+                transformer tier is needed
+        """
+        if not text:
+            return None
+        
+        try:
+            version = self.intents_version
+            key = normalized if normalized is not None else normalize_text(text)
+            cached = self.cache.get(key)
+            if cached is not None:
+                return self._cached_result(cached)
+            
+            result = self._rule_based_classification(key.split())
+            if result["confidence"] > self.threshold:
+                self._cache_result(key, result, version)
+                return result
+            return None
+            
+        except Exception as e:
+            self.logger.error(f"Error classifying intent: {str(e)}")
+            return None
+    
+    def classify(self, text: str, normalized: Optional[str] = None,
+                 check_cache: bool = True) -> Dict[str, Any]:
         """
         Classify the intent of the input text.
         
         Args:
             text (str): Input text to classify
+            normalized (Optional[str]): The text already passed through
+                normalize_text, when the caller has it
+            check_cache (bool): Look the text up in the cache first (callers that
+                already tried quick_classify skip the repeated lookup)
             
         Returns:
-            Dict[str, Any]: Classification results including intent and confidence
+            Dict[str, Any]: Classification results including intent, confidence
+                and the tier that produced them
         """
         if not text:
             return {"intent": None, "confidence": 0.0, "response": None}
         
         try:
+            version = self.intents_version
+            key = normalized if normalized is not None else normalize_text(text)
+            if check_cache:
+                cached = self.cache.get(key)
+                if cached is not None:
+                    return self._cached_result(cached)
+            
             # First try rule-based matching
-            rule_based_result = self._rule_based_classification(text.lower())
-            if rule_based_result["confidence"] > self.threshold:
-                return rule_based_result
+            result = self._rule_based_classification(key.split())
+            if result["confidence"] <= self.threshold:
+                if not self._transformer_available():
+                    # Serve the rule-only result until the transformer is ready
+                    return result
+                
+                # Fall back to transformer-based classification on the cache key,
+                # so every input sharing the key gets the same result
+                result = self._transformer_classification(key)
             
-            # Fall back to transformer-based classification
-            return self._transformer_classification(text)
+            self._cache_result(key, result, version)
+            return result
             
         except Exception as e:
             self.logger.error(f"Error classifying intent: {str(e)}")
             return {"intent": None, "confidence": 0.0, "response": None}
+
+    def classify_batch(self, texts: List[str], batch_size: int = 32) -> List[Dict[str, Any]]:
+        """
+        Classify the intents of many texts at once.
+
+        The rule tier runs over every text first; only texts it cannot resolve
+        are encoded by the transformer, in length-sorted padded batches.
+
+        Args:
+            texts (List[str]): Input texts to classify
+            batch_size (int): Number of texts per transformer forward pass
+
+        Returns:
+            List[Dict[str, Any]]: Classification results in input order
+        """
+        empty = {"intent": None, "confidence": 0.0, "response": None}
+        results: List[Dict[str, Any]] = [dict(empty) for _ in texts]
+
+        try:
+            version = self.intents_version
+            keys = [normalize_text(text) if text else "" for text in texts]
+            
+            # First try the cache and rule-based matching on the whole batch
+            leftovers = []
+            for i, key in enumerate(keys):
+                if not key:
+                    continue
+                cached = self.cache.get(key)
+                if cached is not None:
+                    results[i] = self._cached_result(cached)
+                    continue
+                rule_based_result = self._rule_based_classification(key.split())
+                results[i] = rule_based_result
+                if rule_based_result["confidence"] > self.threshold:
+                    self._cache_result(key, rule_based_result, version)
+                else:
+                    leftovers.append(i)
+
+            if not leftovers:
+                return results
+
+            if not self._transformer_available():
+                # Keep the rule-only results until the transformer is ready
+                return results
+
+            # Sort by length so each padded batch holds similar-sized inputs
+            leftovers.sort(key=lambda i: len(keys[i]))
+            embeddings = self._embed([keys[i] for i in leftovers], batch_size=batch_size)
+
+            for i, result in zip(leftovers, self._score_embeddings(embeddings)):
+                results[i] = result
+                self._cache_result(keys[i], result, version)
+
+            return results
+
+        except Exception as e:
+            self.logger.error(f"Error classifying intent batch: {str(e)}")
+            return results
+
+    def _cache_result(self, key: str, result: Dict[str, Any], version: int):
+        """
+        Cache a classification unless the intents changed while it was computed.
+        
+        Args:
+            key (str): Normalized utterance
+            result (Dict[str, Any]): Classification results
+            version (int): intents_version read before classifying
+        """
+        with self._cache_lock:
+            if version == self.intents_version:
+                self.cache.put(key, (result["intent"], result["confidence"]))
     
-    def _rule_based_classification(self, text: str) -> Dict[str, Any]:
+    def _cached_result(self, cached: Tuple[Optional[str], float]) -> Dict[str, Any]:
         """
-        Perform rule-based intent classification using pattern matching.
+        Build a classification result from a cached (intent, confidence) pair.
         
         Args:
-            text (str): Input text to classify
+            cached (Tuple[Optional[str], float]): Cached intent and confidence
+            
+        Returns:
+            Dict[str, Any]: Classification results with a freshly chosen response
+        """
+        intent, confidence = cached
+        return self._make_result(intent, confidence, "cache")
+    
+    def _make_result(self, intent: Optional[str], confidence: float, tier: str) -> Dict[str, Any]:
+        """
+        Build a classification result, picking a response for the intent.
+        
+        Args:
+            intent (Optional[str]): Winning intent, None if nothing matched
+            confidence (float): Confidence of the match
+            tier (str): Tier that produced the result ("cache", "rule" or "transformer")
             
         Returns:
             Dict[str, Any]: Classification results
         """
-        best_match = {"intent": None, "confidence": 0.0, "response": None}
+        if intent is None or intent not in self.intents:
+            return {"intent": None, "confidence": confidence, "response": None, "tier": tier}
+        return {
+            "intent": intent,
+            "confidence": confidence,
+            "response": np.random.choice(self.intents[intent]["responses"]),
+            "tier": tier
+        }
+    
+    def _rule_based_classification(self, tokens: List[str]) -> Dict[str, Any]:
+        """
+        Perform rule-based intent classification using pattern matching.
         
-        for intent, data in self.intents.items():
-            for pattern in data["patterns"]:
-                # Calculate similarity score
-                similarity = self._calculate_similarity(text, pattern.lower())
-                
-                if similarity > best_match["confidence"]:
-                    best_match = {
-                        "intent": intent,
-                        "confidence": similarity,
-                        "response": np.random.choice(data["responses"])
-                    }
+        Args:
+            tokens (List[str]): Tokens of the normalized input text
+            
+        Returns:
+            Dict[str, Any]: Classification results
+        """
+        with self._intents_lock.read():
+            intent, similarity = self.pattern_index.best_match(tokens)
+        if intent is None or similarity <= 0.0:
+            return self._make_result(None, 0.0, "rule")
         
-        return best_match
+        # Pick a response only once the winning intent is known
+        return self._make_result(intent, similarity, "rule")
     
     def _transformer_classification(self, text: str) -> Dict[str, Any]:
         """
@@ -172,61 +490,310 @@ class IntentClassifier:
         Returns:
             Dict[str, Any]: Classification results
         """
-        # Tokenize and encode text
-        inputs = self.tokenizer(text, return_tensors="pt", padding=True, truncation=True)
+        # Encode text and compare against the precomputed pattern matrix
+        return self._score_embeddings(self._embed([text]))[0]
+    
+    def _score_embeddings(self, embeddings: np.ndarray) -> List[Dict[str, Any]]:
+        """
+        Classify query embeddings against the intent patterns.
+        
+        Each result also carries the top intent scores under "scores", so
+        callers can inspect the runners-up without another forward pass.
+        
+        Args:
+            embeddings (np.ndarray): Query embeddings of shape (n_queries, dim)
+            
+        Returns:
+            List[Dict[str, Any]]: Classification results, one per query
+        """
+        # Head probabilities are always positive; similarities must be to count
+        use_head = self.head is not None and self.head.is_fitted
+        results = []
+        for scores in self._top_k_scores(embeddings, self.TOP_K_SCORES):
+            if not scores or (not use_head and scores[0][1] <= 0.0):
+                result = self._make_result(None, 0.0, "transformer")
+            else:
+                result = self._make_result(scores[0][0], scores[0][1], "transformer")
+            result["scores"] = scores
+            results.append(result)
+        return results
+    
+    def _top_k_scores(self, embeddings: np.ndarray, k: int) -> List[List[Tuple[str, float]]]:
+        """
+        Score query embeddings against every intent.
+        
+        Uses the trained head when enabled, the ANN index for large catalogs
+        and the mean similarity over every pattern otherwise.
+        
+        Args:
+            embeddings (np.ndarray): Query embeddings of shape (n_queries, dim)
+            k (int): Number of intents to return per query
+            
+        Returns:
+            List[List[Tuple[str, float]]]: (intent, score) pairs per query, best first
+        """
+        # add_intent changes the store, index and head together
+        with self._intents_lock.read():
+            if self.head is not None and self.head.is_fitted:
+                # The head is trained on the normalized pattern matrix
+                return self.head.top_k(self._normalize(embeddings), k=k)
+            if self.ann_index is not None:
+                return [self.ann_index.search(query, k=k) for query in self._normalize(embeddings)]
+            
+            scores = self.pattern_store.intent_scores(embeddings)
+            order = np.argsort(-scores, axis=1)[:, :k]
+            return [
+                [(self.pattern_store.intent_names[i], float(row[i])) for i in indices]
+                for row, indices in zip(scores, order)
+            ]
+    
+    @staticmethod
+    def _normalize(embeddings: np.ndarray) -> np.ndarray:
+        """Scale embeddings to unit length"""
+        return embeddings / np.maximum(np.linalg.norm(embeddings, axis=1, keepdims=True), 1e-12)
+    
+    def top_k_intents(self, text: str, k: int = 5) -> List[Tuple[str, float]]:
+        """
+        Get the k most similar intents according to the transformer tier.
+        
+        Args:
+            text (str): Input text
+            k (int): Number of intents to return
+            
+        Returns:
+            List[Tuple[str, float]]: (intent, score) pairs, best first
+        """
+        if not text or not self.load_transformer():
+            return []
+        
+        return self._top_k_scores(self._embed([normalize_text(text)]), k)[0]
+    
+    def _set_backend(self, backend: str):
+        """
+        Load the encoder for a backend and sync its pattern embeddings.
+        
+        Args:
+            backend (str): Encoder inference backend
+        """
+        handle = model_registry.get(
+            "transformer", self.model_name, lambda: self._load_model(backend), backend=backend
+        )
+        previous, self.model_handle = self.model_handle, handle
+        self.model = handle.model
+        self.backend = backend
+        
+        # A replaced encoder (e.g. after a failed parity check) can be unloaded
+        if previous is not None and previous is not handle:
+            model_registry.release(previous)
+        
+        # Embeddings differ per backend, so each gets its own cache entry
+        self.pattern_store = PatternEmbeddingStore(f"{self.model_name}@{backend}",
+                                                   cache_dir=self.embedding_cache_dir)
+        self.pattern_store.sync(self.intents, self._embed)
+        self._sync_ann_index()
+        self._train_head()
+    
+    def _train_head(self, warm_start: bool = False):
+        """
+        Fit the classification head on the pattern embeddings.
+        
+        Args:
+            warm_start (bool): Continue from the current weights
+        """
+        if self.head is None or not self.pattern_store.rows:
+            return
+        
+        intents = [intent for intent, _ in self.pattern_store.rows]
+        classes = list(self.label_encoder.classes_)
+        self.head.fit(self.pattern_store.matrix, self.label_encoder.transform(intents),
+                      classes, warm_start=warm_start)
+    
+    def _ann_key(self) -> str:
+        """Identify the embeddings an ANN index is built from"""
+        return f"{self.pattern_store.model_name}:{self.pattern_store.intents_hash}"
+    
+    @staticmethod
+    def _ann_file(intents_file: str) -> str:
+        """Get the ANN index file saved alongside an intents file"""
+        return str(Path(intents_file).with_suffix(".ann.npz"))
+    
+    def _sync_ann_index(self):
+        """Load or build the ANN index when the catalog is large enough"""
+        if len(self.pattern_store.rows) < self.ann_min_patterns:
+            self.ann_index = None
+            return
+        
+        index = IVFIndex(n_probe=self.ann_n_probe)
+        if self.intents_file and index.load(self._ann_file(self.intents_file)) \
+                and index.key == self._ann_key():
+            self.ann_index = index
+            return
+        
+        index.build(self.pattern_store.matrix,
+                    [intent for intent, _ in self.pattern_store.rows],
+                    key=self._ann_key())
+        self.ann_index = index
+    
+    def _update_ann_index(self, intent: str, replaced: bool):
+        """Insert the patterns of an added intent into the ANN index"""
+        if self.ann_index is None:
+            self._sync_ann_index()
+            return
+        
+        if replaced:
+            self.ann_index.remove(intent)
+        rows = [i for i, (name, _) in enumerate(self.pattern_store.rows) if name == intent]
+        self.ann_index.add(self.pattern_store.matrix[rows], [intent] * len(rows))
+        self.ann_index.key = self._ann_key()
+    
+    def _load_model(self, backend: str):
+        """
+        Load the transformer encoder for the given inference backend.
         
-        # Get model outputs
-        with torch.no_grad():
-            outputs = self.model(**inputs)
+        Args:
+            backend (str): "fp32", "int8" (dynamically quantized linear layers)
+                or "torchscript" (traced and frozen graph)
+            
+        Returns:
+            The loaded encoder
+        """
+        if backend not in self.BACKENDS:
+            raise ValueError(f"Unsupported backend: {backend}")
         
-        # Get sentence embedding (mean pooling)
-        embeddings = outputs.last_hidden_state.mean(dim=1)
+        if backend == "torchscript":
+            model = AutoModel.from_pretrained(self.model_name, torchscript=True)
+            model.eval()
+            example = self._tokenize(["hello"], backend)
+            with torch.no_grad():
+                traced = torch.jit.trace(
+                    model, (example["input_ids"], example["attention_mask"]), strict=False
+                )
+            return torch.jit.freeze(traced)
         
-        # Calculate similarity with each intent
-        best_match = {"intent": None, "confidence": 0.0, "response": None}
+        model = AutoModel.from_pretrained(self.model_name)
+        if backend == "int8":
+            model = torch.ao.quantization.quantize_dynamic(
+                model, {torch.nn.Linear}, dtype=torch.qint8
+            )
+        return model
+    
+    def _tokenize(self, texts: List[str], backend: str):
+        """Tokenize texts, padding to the traced length for torchscript"""
+        # Fast tokenizers are not safe to call concurrently from several threads
+        with self.tokenizer_handle.lock:
+            if backend == "torchscript":
+                return self.tokenizer(texts, return_tensors="pt", padding="max_length",
+                                      truncation=True, max_length=self.TRACE_MAX_LENGTH)
+            return self.tokenizer(texts, return_tensors="pt", padding=True, truncation=True)
+    
+    def _embed(self, texts: List[str], batch_size: int = 64) -> np.ndarray:
+        """
+        Compute mean-pooled sentence embeddings with the active backend.
         
-        for intent, data in self.intents.items():
-            # Get embeddings for intent patterns
-            pattern_embeddings = []
-            for pattern in data["patterns"]:
-                pattern_inputs = self.tokenizer(pattern, return_tensors="pt", padding=True, truncation=True)
-                with torch.no_grad():
-                    pattern_outputs = self.model(**pattern_inputs)
-                pattern_embeddings.append(pattern_outputs.last_hidden_state.mean(dim=1))
+        Args:
+            texts (List[str]): Texts to embed
+            batch_size (int): Number of texts per forward pass
             
-            # Calculate cosine similarity
-            pattern_embeddings = torch.cat(pattern_embeddings)
-            similarity = torch.nn.functional.cosine_similarity(embeddings, pattern_embeddings).mean().item()
+        Returns:
+            np.ndarray: Embeddings of shape (len(texts), hidden_size)
+        """
+        return self._encode(self.model, self.backend, texts, batch_size)
+    
+    def _encode(self, model, backend: str, texts: List[str], batch_size: int = 64) -> np.ndarray:
+        """
+        Compute mean-pooled sentence embeddings with a given encoder.
+        
+        Args:
+            model: Encoder to run
+            backend (str): Backend the encoder was loaded with
+            texts (List[str]): Texts to embed
+            batch_size (int): Number of texts per forward pass
             
-            if similarity > best_match["confidence"]:
-                best_match = {
-                    "intent": intent,
-                    "confidence": similarity,
-                    "response": np.random.choice(data["responses"])
-                }
+        Returns:
+            np.ndarray: Embeddings of shape (len(texts), hidden_size)
+        """
+        embeddings = []
+        for i in range(0, len(texts), batch_size):
+            inputs = self._tokenize(texts[i:i + batch_size], backend)
+            # Inference-mode forward passes leave the encoder unchanged, so
+            # threads sharing it run them concurrently; only tokenizing is locked
+            with torch.no_grad():
+                if backend == "torchscript":
+                    hidden = model(inputs["input_ids"], inputs["attention_mask"])[0]
+                else:
+                    hidden = model(**inputs).last_hidden_state
+            
+            # Mean pooling over real (non-padding) tokens
+            mask = inputs["attention_mask"].unsqueeze(-1).to(hidden.dtype)
+            summed = (hidden * mask).sum(dim=1)
+            embeddings.append((summed / mask.sum(dim=1).clamp(min=1)).numpy())
+        
+        return np.concatenate(embeddings) if embeddings else np.zeros((0, 0), dtype=np.float32)
+    
+    def check_backend_parity(self) -> Dict[str, Any]:
+        """
+        Compare the active backend against fp32 on the loaded intent patterns.
+        
+        Every pattern is embedded by both encoders and classified, leaving
+        itself out, against the other patterns of each encoder's own matrix, so
+        a pattern's similarity to itself cannot decide its intent.
+        
+        Returns:
+            Dict[str, Any]: Embedding cosine statistics and the fraction of
+                patterns assigned the same intent by both backends
+        """
+        if self.pattern_store is None:
+            self.load_transformer()
         
-        return best_match
+        texts = [pattern for _, pattern in self.pattern_store.rows]
+        if not texts:
+            return {"backend": self.backend, "patterns": 0, "min_cosine": 1.0,
+                    "mean_cosine": 1.0, "intent_agreement": 1.0}
+        
+        active = self._embed(texts)
+        reference = active if self.backend == "fp32" else \
+            self._encode(self._load_model("fp32"), "fp32", texts)
+        
+        active = self._normalize(active)
+        reference = self._normalize(reference)
+        cosines = (active * reference).sum(axis=1)
+        
+        active_intents = self._leave_one_out_intents(active)
+        reference_intents = self._leave_one_out_intents(reference)
+        
+        report = {
+            "backend": self.backend,
+            "patterns": len(texts),
+            "min_cosine": float(cosines.min()),
+            "mean_cosine": float(cosines.mean()),
+            "intent_agreement": float((active_intents == reference_intents).mean())
+        }
+        self.logger.info(f"Backend parity: {report}")
+        return report
     
-    def _calculate_similarity(self, text1: str, text2: str) -> float:
+    def _leave_one_out_intents(self, matrix: np.ndarray) -> np.ndarray:
         """
-        Calculate similarity between two texts using simple metrics.
+        Classify every pattern against all the other patterns.
         
         Args:
-            text1 (str): First text
-            text2 (str): Second text
+            matrix (np.ndarray): Normalized pattern embeddings laid out like the
+                pattern store rows
             
         Returns:
-            float: Similarity score between 0 and 1
+            np.ndarray: Index into the store's intent_names per pattern
         """
-        # Convert to sets of words
-        words1 = set(text1.split())
-        words2 = set(text2.split())
+        similarities = matrix @ matrix.T
+        np.fill_diagonal(similarities, 0.0)
+        sums = np.add.reduceat(similarities, self.pattern_store.intent_starts, axis=1)
         
-        # Calculate Jaccard similarity
-        intersection = len(words1.intersection(words2))
-        union = len(words1.union(words2))
+        # Each pattern's own intent has one pattern fewer to average over
+        counts = np.tile(self.pattern_store.intent_counts, (len(matrix), 1))
+        own = np.repeat(np.arange(len(self.pattern_store.intent_names)),
+                        self.pattern_store.intent_counts.astype(np.int64))
+        counts[np.arange(len(matrix)), own] -= 1
         
-        return intersection / union if union > 0 else 0.0
+        scores = np.where(counts > 0, sums / np.maximum(counts, 1), -np.inf)
+        return scores.argmax(axis=1)
     
     def add_intent(self, intent: str, patterns: List[str], responses: List[str]):
         """
@@ -238,13 +805,46 @@ class IntentClassifier:
             responses (List[str]): List of possible responses
         """
         try:
-            self.intents[intent] = {
-                "patterns": patterns,
-                "responses": responses
-            }
-            
-            # Update label encoder
-            self.label_encoder.fit(list(self.intents.keys()))
+            # Waits for an in-progress transformer load, which reads the intents
+            with self._transformer_lock:
+                # Encode the new patterns before classifications are held off
+                embedded = {}
+                if self._transformer_ready.is_set() and patterns:
+                    embedded = dict(zip(patterns, self._embed(patterns)))
+                
+                def embed_new(texts: List[str]) -> np.ndarray:
+                    missing = [text for text in texts if text not in embedded]
+                    if missing:
+                        embedded.update(zip(missing, self._embed(missing)))
+                    return np.stack([embedded[text] for text in texts])
+                
+                # Classifications see the old or the new intents, never a mix
+                with self._intents_lock.write():
+                    replaced = intent in self.intents
+                    self.intents[intent] = {
+                        "patterns": patterns,
+                        "responses": responses
+                    }
+                    
+                    # Index the new patterns, rebuilding only if old ones must be dropped
+                    if replaced:
+                        self.pattern_index.rebuild(self.intents)
+                    else:
+                        self.pattern_index.add(intent, patterns)
+                    
+                    # Update label encoder
+                    self.label_encoder.fit(list(self.intents.keys()))
+                    
+                    # Store only the new patterns' rows (a later load embeds them all)
+                    if self._transformer_ready.is_set():
+                        self.pattern_store.sync(self.intents, embed_new)
+                        self._update_ann_index(intent, replaced)
+                        self._train_head(warm_start=True)
+                    
+                    # Cached results may no longer hold, nor may those still being computed
+                    with self._cache_lock:
+                        self.intents_version += 1
+                        self.cache.clear()
             
             self.logger.info(f"Added new intent: {intent}")
         except Exception as e:
@@ -259,6 +859,15 @@ class IntentClassifier:
         """
         return {intent: data["patterns"] for intent, data in self.intents.items()}
     
+    def get_cache_stats(self) -> Dict[str, Any]:
+        """
+        Get classification cache statistics.
+        
+        Returns:
+            Dict[str, Any]: Hit/miss counters, hit rate and current size
+        """
+        return self.cache.get_stats()
+    
     def save_intents(self, file_path: str):
         """
         Save current intents to a JSON file.
@@ -270,5 +879,8 @@ class IntentClassifier:
             with open(file_path, 'w') as f:
                 json.dump(self.intents, f, indent=4)
             self.logger.info(f"Saved intents to {file_path}")
+            
+            if self.ann_index is not None:
+                self.ann_index.save(self._ann_file(file_path))
         except Exception as e:
             self.logger.error(f"Error saving intents: {str(e)}")
\ No newline at end of file
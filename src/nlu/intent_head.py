@@ -0,0 +1,239 @@
+from typing import List, Optional, Tuple
+import logging
+import numpy as np
+
+class LinearIntentHead:
+    # Weight of the log-normal prior keeping the fitted temperature near 1
+    TEMPERATURE_PRIOR = 0.01
+
+    def __init__(self,
+                 l2: float = 1e-3,
+                 learning_rate: float = 0.05,
+                 epochs: int = 100,
+                 batch_size: int = 256,
+                 calibration_fraction: float = 0.2,
+                 seed: int = 0):
+        """
+        Initialize a softmax-regression head over pooled sentence embeddings.
+
+        Probabilities are calibrated by temperature scaling: a temperature is
+        fitted on patterns held out from a first fit, then the head is refit
+        on every pattern and keeps that temperature.
+
+        Args:
+            l2 (float): L2 regularization strength
+            learning_rate (float): Adam step size
+            epochs (int): Number of passes over the training data on a full fit
+            batch_size (int): Mini-batch size
+            calibration_fraction (float): Share of each class's patterns held
+                out to fit the temperature (0 disables calibration)
+            seed (int): Random seed for shuffling
+        """
+        # Set up logging
+        self.logger = logging.getLogger(__name__)
+        self._setup_logging()
+
+        self.l2 = l2
+        self.learning_rate = learning_rate
+        self.epochs = epochs
+        self.batch_size = batch_size
+        self.calibration_fraction = calibration_fraction
+        self.rng = np.random.default_rng(seed)
+
+        self.classes: List[str] = []
+        self.weights: Optional[np.ndarray] = None
+        self.bias: Optional[np.ndarray] = None
+        self.mean: Optional[np.ndarray] = None
+        self.scale = 1.0
+        self.temperature = 1.0
+
+    def _setup_logging(self):
+        """Configure logging for the intent head"""
+        logging.basicConfig(
+            level=logging.INFO,
+            format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+        )
+
+    @property
+    def is_fitted(self) -> bool:
+        return self.weights is not None
+
+    def fit(self, features: np.ndarray, labels: np.ndarray, classes: List[str],
+            warm_start: bool = False):
+        """
+        Fit the head on labelled embeddings.
+
+        With warm_start, weights of classes already known are kept and only a
+        quarter of the epochs is run, so adding an intent retrains quickly.
+        Warm starts keep the temperature, since the kept weights have already
+        seen any patterns that could be held out.
+
+        Args:
+            features (np.ndarray): Embeddings of shape (n, dim)
+            labels (np.ndarray): Class index of every embedding, into classes
+            classes (List[str]): Class names
+            warm_start (bool): Start from the current weights
+        """
+        features = np.asarray(features, dtype=np.float32)
+        labels = np.asarray(labels, dtype=np.int64)
+        n_classes, dim = len(classes), features.shape[1]
+
+        weights = np.zeros((dim, n_classes), dtype=np.float32)
+        bias = np.zeros(n_classes, dtype=np.float32)
+        epochs = self.epochs
+
+        if warm_start and self.is_fitted and self.weights.shape[0] == dim:
+            previous = {name: i for i, name in enumerate(self.classes)}
+            for j, name in enumerate(classes):
+                if name in previous:
+                    weights[:, j] = self.weights[:, previous[name]]
+                    bias[j] = self.bias[previous[name]]
+            epochs = max(1, epochs // 4)
+        else:
+            # Standardize once; warm starts keep the original statistics
+            self.mean = features.mean(axis=0)
+            self.scale = float((features - self.mean).std()) or 1.0
+
+        inputs = (features - self.mean) / self.scale
+        targets = np.eye(n_classes, dtype=np.float32)[labels]
+
+        held_out = np.zeros(0, dtype=np.int64) if epochs < self.epochs else self._calibration_split(labels)
+        if len(held_out):
+            train = np.setdiff1d(np.arange(len(inputs)), held_out)
+            trial_weights, trial_bias = self._train(inputs[train], targets[train],
+                                                    weights.copy(), bias.copy(), epochs)
+            self.temperature = self._fit_temperature(inputs[held_out] @ trial_weights + trial_bias,
+                                                     labels[held_out])
+
+        weights, bias = self._train(inputs, targets, weights, bias, epochs)
+
+        # Names may come as numpy strings (e.g. from a LabelEncoder); results carry plain str
+        self.weights, self.bias, self.classes = weights, bias, [str(name) for name in classes]
+        self.logger.info(f"Trained intent head on {len(inputs)} patterns, {n_classes} intents "
+                         f"(temperature {self.temperature:.2f})")
+
+    def _calibration_split(self, labels: np.ndarray) -> np.ndarray:
+        """
+        Pick the patterns held out for calibration.
+
+        Every class with at least two patterns gives up a share of them,
+        always keeping one for training.
+
+        Args:
+            labels (np.ndarray): Class index of every pattern
+
+        Returns:
+            np.ndarray: Indices of the held-out patterns
+        """
+        if self.calibration_fraction <= 0:
+            return np.zeros(0, dtype=np.int64)
+
+        held_out = []
+        for label in np.unique(labels):
+            members = np.flatnonzero(labels == label)
+            if len(members) < 2:
+                continue
+            n_held = min(len(members) - 1, max(1, int(round(self.calibration_fraction * len(members)))))
+            held_out.extend(self.rng.choice(members, size=n_held, replace=False))
+        return np.sort(np.asarray(held_out, dtype=np.int64))
+
+    def _fit_temperature(self, logits: np.ndarray, labels: np.ndarray) -> float:
+        """
+        Find the temperature minimizing the negative log-likelihood of held-out patterns.
+
+        A weak prior towards 1 keeps a handful of perfectly separated held-out
+        patterns from driving the temperature to zero.
+
+        Args:
+            logits (np.ndarray): Held-out logits of shape (n, n_classes)
+            labels (np.ndarray): True class indices
+
+        Returns:
+            float: Temperature dividing the logits
+        """
+        best, best_loss = 1.0, np.inf
+        for temperature in np.exp(np.linspace(np.log(0.05), np.log(20.0), 200)):
+            probs = self._softmax(logits / temperature)
+            loss = -np.log(np.maximum(probs[np.arange(len(labels)), labels], 1e-12)).mean()
+            loss += self.TEMPERATURE_PRIOR * np.log(temperature) ** 2
+            if loss < best_loss:
+                best, best_loss = float(temperature), loss
+        return best
+
+    def _train(self, inputs: np.ndarray, targets: np.ndarray,
+               weights: np.ndarray, bias: np.ndarray, epochs: int) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Run mini-batch Adam on the regularized cross-entropy.
+
+        Args:
+            inputs (np.ndarray): Standardized features
+            targets (np.ndarray): One-hot targets
+            weights (np.ndarray): Initial weights, updated in place
+            bias (np.ndarray): Initial bias, updated in place
+            epochs (int): Number of passes over the data
+
+        Returns:
+            Tuple[np.ndarray, np.ndarray]: Trained weights and bias
+        """
+        params = [weights, bias]
+        moments = [np.zeros_like(p) for p in params]
+        velocities = [np.zeros_like(p) for p in params]
+        beta1, beta2, step = 0.9, 0.999, 0
+
+        for _ in range(epochs):
+            order = self.rng.permutation(len(inputs))
+            for start in range(0, len(order), self.batch_size):
+                batch = order[start:start + self.batch_size]
+                probs = self._softmax(inputs[batch] @ weights + bias)
+                error = (probs - targets[batch]) / len(batch)
+                grads = [inputs[batch].T @ error + self.l2 * weights, error.sum(axis=0)]
+
+                step += 1
+                for p, g, m, v in zip(params, grads, moments, velocities):
+                    m *= beta1
+                    m += (1 - beta1) * g
+                    v *= beta2
+                    v += (1 - beta2) * g * g
+                    m_hat = m / (1 - beta1 ** step)
+                    v_hat = v / (1 - beta2 ** step)
+                    p -= self.learning_rate * m_hat / (np.sqrt(v_hat) + 1e-8)
+
+        return weights, bias
+
+    @staticmethod
+    def _softmax(logits: np.ndarray) -> np.ndarray:
+        """Numerically stable softmax over the last axis"""
+        logits = logits - logits.max(axis=-1, keepdims=True)
+        exp = np.exp(logits)
+        return exp / exp.sum(axis=-1, keepdims=True)
+
+    def predict_proba(self, features: np.ndarray) -> np.ndarray:
+        """
+        Compute calibrated class probabilities.
+
+        Args:
+            features (np.ndarray): Embeddings of shape (n, dim)
+
+        Returns:
+            np.ndarray: Probabilities of shape (n, n_classes) ordered as classes
+        """
+        inputs = (np.asarray(features, dtype=np.float32) - self.mean) / self.scale
+        return self._softmax((inputs @ self.weights + self.bias) / self.temperature)
+
+    def top_k(self, features: np.ndarray, k: int = 5) -> List[List[Tuple[str, float]]]:
+        """
+        Get the k most probable classes for each embedding.
+
+        Args:
+            features (np.ndarray): Embeddings of shape (n, dim)
+            k (int): Number of classes to return
+
+        Returns:
+            List[List[Tuple[str, float]]]: (class, probability) pairs per embedding, best first
+        """
+        probs = self.predict_proba(features)
+        order = np.argsort(-probs, axis=1)[:, :k]
+        return [
+            [(self.classes[j], float(row[j])) for j in indices]
+            for row, indices in zip(probs, order)
+        ]
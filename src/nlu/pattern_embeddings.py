@@ -0,0 +1,209 @@
+from typing import Callable, Dict, List, Optional, Tuple
+import logging
+import hashlib
+import json
+import re
+from pathlib import Path
+import numpy as np
+
+class PatternEmbeddingStore:
+    def __init__(self, model_name: str, cache_dir: Optional[str] = "cache/intents"):
+        """
+        Initialize the pattern embedding store.
+
+        Args:
+            model_name (str): Name of the model the embeddings are computed with
+            cache_dir (Optional[str]): Directory for persisted embedding matrices,
+                created on the first save (None disables persistence)
+        """
+        # Set up logging
+        self.logger = logging.getLogger(__name__)
+        self._setup_logging()
+
+        self.model_name = model_name
+        self.cache_dir = Path(cache_dir) if cache_dir else None
+
+        # One normalized row per (intent, pattern) pair, grouped by intent
+        self.matrix = np.zeros((0, 0), dtype=np.float32)
+        self.rows: List[Tuple[str, str]] = []
+        self.intent_names: List[str] = []
+        self.intent_starts = np.zeros(0, dtype=np.int64)
+        self.intent_counts = np.zeros(0, dtype=np.float32)
+        self.intents_hash = None
+
+    def _setup_logging(self):
+        """Configure logging for the pattern embedding store"""
+        logging.basicConfig(
+            level=logging.INFO,
+            format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+        )
+
+    @staticmethod
+    def hash_intents(intents: Dict[str, Dict]) -> str:
+        """
+        Compute a stable hash of the intent patterns.
+
+        Args:
+            intents (Dict[str, Dict]): Intent definitions
+
+        Returns:
+            str: Hex digest identifying the pattern set
+        """
+        payload = json.dumps(
+            [[intent, list(data["patterns"])] for intent, data in intents.items()],
+            ensure_ascii=False
+        )
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def _model_slug(self) -> str:
+        """Get the file name prefix of the model's matrices"""
+        return re.sub(r'[^\w.-]', '_', self.model_name)
+
+    def _cache_file(self, intents_hash: str) -> Optional[Path]:
+        """Get the matrix file for a model and pattern set"""
+        if not self.cache_dir:
+            return None
+        return self.cache_dir / f"{self._model_slug()}_{intents_hash[:16]}.npy"
+
+    def sync(self,
+             intents: Dict[str, Dict],
+             embed_fn: Callable[[List[str]], np.ndarray]):
+        """
+        Bring the embedding matrix in line with the given intents.
+
+        Loads a persisted matrix when one exists for the pattern set, otherwise
+        reuses rows already computed and embeds only the new patterns.
+
+        Args:
+            intents (Dict[str, Dict]): Intent definitions
+            embed_fn (Callable[[List[str]], np.ndarray]): Function embedding a list of texts
+        """
+        intents_hash = self.hash_intents(intents)
+        if intents_hash == self.intents_hash:
+            return
+
+        rows = [
+            (intent, pattern)
+            for intent, data in intents.items()
+            for pattern in data["patterns"]
+        ]
+
+        matrix = self._load_matrix(intents_hash, len(rows))
+        if matrix is None:
+            matrix = self._build_matrix(rows, embed_fn)
+            self._save_matrix(intents_hash, matrix)
+
+        previous_hash = self.intents_hash
+        self.matrix = matrix
+        self.rows = rows
+        self.intents_hash = intents_hash
+        self._index_intents()
+
+        if previous_hash is not None:
+            self._remove_matrix(previous_hash)
+
+    def _build_matrix(self,
+                      rows: List[Tuple[str, str]],
+                      embed_fn: Callable[[List[str]], np.ndarray]) -> np.ndarray:
+        """Build the normalized matrix, embedding only patterns not seen before"""
+        known = {pattern: self.matrix[i] for i, (_, pattern) in enumerate(self.rows)}
+        missing = list(dict.fromkeys(p for _, p in rows if p not in known))
+
+        if missing:
+            embeddings = np.asarray(embed_fn(missing), dtype=np.float32)
+            norms = np.linalg.norm(embeddings, axis=1, keepdims=True)
+            embeddings = embeddings / np.maximum(norms, 1e-12)
+            known.update(zip(missing, embeddings))
+            self.logger.info(f"Embedded {len(missing)} new intent patterns")
+
+        if not rows:
+            return np.zeros((0, self.matrix.shape[1]), dtype=np.float32)
+        return np.stack([known[pattern] for _, pattern in rows]).astype(np.float32)
+
+    def _load_matrix(self, intents_hash: str, n_rows: int) -> Optional[np.ndarray]:
+        """Memory-map a persisted matrix if present and consistent"""
+        cache_file = self._cache_file(intents_hash)
+        if not cache_file or not cache_file.exists():
+            return None
+
+        try:
+            matrix = np.load(cache_file, mmap_mode='r')
+            if matrix.ndim != 2 or matrix.shape[0] != n_rows:
+                self.logger.warning(f"Ignoring stale embedding cache: {cache_file}")
+                return None
+            self.logger.info(f"Loaded pattern embeddings from {cache_file}")
+            return matrix
+        except Exception as e:
+            self.logger.error(f"Error reading embedding cache: {str(e)}")
+            return None
+
+    def _save_matrix(self, intents_hash: str, matrix: np.ndarray):
+        """Persist the matrix for later memory-mapping"""
+        cache_file = self._cache_file(intents_hash)
+        if not cache_file:
+            return
+
+        try:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            tmp_file = cache_file.with_suffix(".tmp.npy")
+            np.save(tmp_file, matrix)
+            tmp_file.replace(cache_file)
+        except Exception as e:
+            self.logger.error(f"Error writing embedding cache: {str(e)}")
+
+    def _remove_matrix(self, intents_hash: str):
+        """
+        Delete the persisted matrix of a pattern set this store has moved past.
+
+        Only the store's own previous matrix is removed; matrices of other
+        pattern sets may belong to other stores sharing the cache directory.
+        """
+        cache_file = self._cache_file(intents_hash)
+        if not cache_file or not cache_file.exists():
+            return
+
+        try:
+            cache_file.unlink()
+            self.logger.info(f"Removed superseded embedding cache: {cache_file}")
+        except OSError as e:
+            self.logger.warning(f"Could not remove {cache_file}: {str(e)}")
+
+    def _index_intents(self):
+        """Compute the contiguous row range of every intent"""
+        names, starts, counts = [], [], []
+        for i, (intent, _) in enumerate(self.rows):
+            if names and names[-1] == intent:
+                counts[-1] += 1
+            else:
+                names.append(intent)
+                starts.append(i)
+                counts.append(1)
+
+        self.intent_names = names
+        self.intent_starts = np.asarray(starts, dtype=np.int64)
+        self.intent_counts = np.asarray(counts, dtype=np.float32)
+
+    def intent_scores(self,
+                      query_embeddings: np.ndarray,
+                      matrix: Optional[np.ndarray] = None) -> np.ndarray:
+        """
+        Compute the mean cosine similarity of each query to every intent.
+
+        Args:
+            query_embeddings (np.ndarray): Query embeddings of shape (n_queries, dim)
+            matrix (Optional[np.ndarray]): Normalized pattern matrix laid out like
+                the stored one (defaults to the stored matrix)
+
+        Returns:
+            np.ndarray: Scores of shape (n_queries, n_intents) ordered as intent_names
+        """
+        queries = np.asarray(query_embeddings, dtype=np.float32)
+        norms = np.linalg.norm(queries, axis=1, keepdims=True)
+        queries = queries / np.maximum(norms, 1e-12)
+
+        if not self.rows:
+            return np.zeros((len(queries), 0), dtype=np.float32)
+
+        matrix = self.matrix if matrix is None else matrix
+        similarities = queries @ matrix.T
+        return np.add.reduceat(similarities, self.intent_starts, axis=1) / self.intent_counts
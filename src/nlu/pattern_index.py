@@ -0,0 +1,91 @@
+from typing import Dict, Iterable, List, Optional, Tuple
+from collections import defaultdict
+import re
+import numpy as np
+
+def normalize_text(text: str) -> str:
+    """
+    Normalize an utterance for cache lookups and rule matching.
+    
+    Args:
+        text (str): Raw input text
+        
+    Returns:
+        str: Lowercased text with punctuation stripped and whitespace collapsed
+    """
+    return " ".join(re.sub(r"[^\w\s]", "", text.lower()).split())
+
+class PatternIndex:
+    def __init__(self):
+        """
+        Initialize an inverted index from pattern tokens to patterns.
+
+        Patterns are numbered in insertion order; each token maps to the ids of
+        the patterns containing it, so Jaccard scores are only computed for
+        patterns sharing at least one token with the query.
+        """
+        self.postings: Dict[str, List[int]] = defaultdict(list)
+        self.pattern_intents: List[str] = []
+        self.pattern_sizes = np.zeros(0, dtype=np.int32)
+
+    def rebuild(self, intents: Dict[str, Dict]):
+        """
+        Rebuild the index from scratch.
+
+        Args:
+            intents (Dict[str, Dict]): Intent definitions
+        """
+        self.postings = defaultdict(list)
+        self.pattern_intents = []
+        self.pattern_sizes = np.zeros(0, dtype=np.int32)
+
+        for intent, data in intents.items():
+            self.add(intent, data["patterns"])
+
+    def add(self, intent: str, patterns: List[str]):
+        """
+        Append patterns of an intent to the index.
+
+        Args:
+            intent (str): Name of the intent
+            patterns (List[str]): Pattern examples
+        """
+        sizes = []
+        for pattern in patterns:
+            pattern_id = len(self.pattern_intents)
+            tokens = set(normalize_text(pattern).split())
+            for token in tokens:
+                self.postings[token].append(pattern_id)
+            self.pattern_intents.append(intent)
+            sizes.append(len(tokens))
+
+        self.pattern_sizes = np.concatenate(
+            [self.pattern_sizes, np.asarray(sizes, dtype=np.int32)]
+        )
+
+    def best_match(self, tokens: Iterable[str]) -> Tuple[Optional[str], float]:
+        """
+        Find the pattern with the highest Jaccard similarity to the text.
+
+        Args:
+            tokens (Iterable[str]): Tokens of the text, as produced by normalize_text
+
+        Returns:
+            Tuple[Optional[str], float]: Intent of the best pattern and its score
+        """
+        tokens = set(tokens)
+        candidates = [self.postings[t] for t in tokens if t in self.postings]
+        if not candidates:
+            return None, 0.0
+
+        # Intersection size per candidate pattern
+        pattern_ids, intersection = np.unique(
+            np.fromiter((i for ids in candidates for i in ids), dtype=np.int64),
+            return_counts=True
+        )
+        union = len(tokens) + self.pattern_sizes[pattern_ids] - intersection
+        scores = intersection / union
+
+        # argmax keeps the lowest pattern id on ties
+        best = int(np.argmax(scores))
+        return self.pattern_intents[pattern_ids[best]], float(scores[best])
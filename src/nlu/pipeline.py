@@ -0,0 +1,157 @@
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+
+from src.nlu.intent_classifier import IntentClassifier
+from src.nlu.entity_extractor import EntityExtractor
+from src.nlu.pattern_index import normalize_text
+
+@dataclass
+class NLUAnalysis:
+    text: str
+    normalized: str
+    tokens: List[str]
+    intent: Optional[str] = None
+    confidence: float = 0.0
+    tier: Optional[str] = None
+    response: Optional[str] = None
+    # Top (intent, score) pairs, filled when the transformer tier ran
+    intent_scores: List[Tuple[str, float]] = field(default_factory=list)
+    entities: Dict[str, List[Dict[str, Any]]] = field(default_factory=dict)
+    entities_skipped: bool = False
+    timings_ms: Dict[str, float] = field(default_factory=dict)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert the analysis to a JSON-serializable dictionary"""
+        return {
+            "text": self.text,
+            "intent": self.intent,
+            "confidence": self.confidence,
+            "tier": self.tier,
+            "response": self.response,
+            "intent_scores": [list(pair) for pair in self.intent_scores],
+            "entities": self.entities,
+            "entities_skipped": self.entities_skipped,
+            "timings_ms": self.timings_ms
+        }
+
+class NLUPipeline:
+    # Intents whose handlers read no entities
+    DEFAULT_SLOTLESS_INTENTS = ("greeting", "farewell")
+
+    def __init__(self,
+                 intent_classifier: IntentClassifier,
+                 entity_extractor: EntityExtractor,
+                 slotless_intents: Optional[Iterable[str]] = None,
+                 parallel: bool = True,
+                 executor: Optional[ThreadPoolExecutor] = None,
+                 max_workers: int = 4):
+        """
+        Initialize a single-pass NLU pipeline.
+
+        An utterance is normalized and tokenized once; the cache and rule tier
+        of the intent classifier consume those tokens, and entity extraction
+        is skipped for intents whose handlers need no slots. When the cache and
+        rule tier cannot decide, the transformer tier and entity extraction
+        run concurrently, since both release the GIL for most of their work,
+        and the transformer's top intent scores are kept on the analysis.
+
+        Args:
+            intent_classifier (IntentClassifier): Intent classifier
+            entity_extractor (EntityExtractor): Entity extractor
+            slotless_intents (Optional[Iterable[str]]): Intents that need no entities
+            parallel (bool): Overlap transformer classification and entity extraction
+            executor (Optional[ThreadPoolExecutor]): Shared pool for entity extraction
+                (defaults to a pool owned by the pipeline)
+            max_workers (int): Size of the pool created when none is given
+        """
+        # Set up logging
+        self.logger = logging.getLogger(__name__)
+        self._setup_logging()
+
+        self.intent_classifier = intent_classifier
+        self.entity_extractor = entity_extractor
+        self.slotless_intents = set(
+            self.DEFAULT_SLOTLESS_INTENTS if slotless_intents is None else slotless_intents
+        )
+
+        self.parallel = parallel
+        self.executor = executor
+        self._owns_executor = parallel and executor is None
+        if self._owns_executor:
+            self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="nlu")
+
+    def _setup_logging(self):
+        """Configure logging for the NLU pipeline"""
+        logging.basicConfig(
+            level=logging.INFO,
+            format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+        )
+
+    def analyze(self, text: str, intent_result: Optional[Dict[str, Any]] = None) -> NLUAnalysis:
+        """
+        Analyze an utterance.
+
+        Args:
+            text (str): Input text
+            intent_result (Optional[Dict[str, Any]]): Classification already
+                computed elsewhere (e.g. by an IntentWorkerPool), which skips
+                the intent stage
+
+        Returns:
+            NLUAnalysis: Normalized text, tokens, intent, intent scores and entities
+        """
+        normalized = normalize_text(text or "")
+        analysis = NLUAnalysis(text=text, normalized=normalized, tokens=normalized.split())
+        if not analysis.tokens:
+            return analysis
+
+        started = time.perf_counter()
+        if intent_result is None:
+            intent_result = self.intent_classifier.quick_classify(text, normalized=normalized)
+
+        if intent_result is None:
+            if self.parallel:
+                # The transformer tier is needed; extract entities meanwhile
+                entity_future = self.executor.submit(self._extract_entities, text)
+                intent_result = self.intent_classifier.classify(text, normalized=normalized, check_cache=False)
+                analysis.timings_ms["intent"] = (time.perf_counter() - started) * 1000
+
+                analysis.entities, analysis.timings_ms["entities"] = entity_future.result()
+                analysis.timings_ms["nlu"] = (time.perf_counter() - started) * 1000
+                self._apply_intent(analysis, intent_result)
+                return analysis
+
+            intent_result = self.intent_classifier.classify(text, normalized=normalized, check_cache=False)
+        analysis.timings_ms["intent"] = (time.perf_counter() - started) * 1000
+        self._apply_intent(analysis, intent_result)
+
+        if analysis.intent in self.slotless_intents:
+            analysis.entities_skipped = True
+        else:
+            analysis.entities, analysis.timings_ms["entities"] = self._extract_entities(text)
+
+        analysis.timings_ms["nlu"] = (time.perf_counter() - started) * 1000
+        return analysis
+
+    @staticmethod
+    def _apply_intent(analysis: NLUAnalysis, intent_result: Dict[str, Any]):
+        """Copy a classification result into an analysis"""
+        analysis.intent = intent_result["intent"]
+        analysis.confidence = intent_result["confidence"]
+        analysis.tier = intent_result.get("tier")
+        analysis.response = intent_result["response"]
+        analysis.intent_scores = list(intent_result.get("scores", []))
+
+    def _extract_entities(self, text: str) -> Tuple[Dict[str, List[Dict[str, Any]]], float]:
+        """Extract entities, returning them with the elapsed milliseconds"""
+        started = time.perf_counter()
+        entities = self.entity_extractor.extract_entities(text)
+        return entities, (time.perf_counter() - started) * 1000
+
+    def shutdown(self):
+        """Stop the pipeline's own thread pool"""
+        if self._owns_executor:
+            self.executor.shutdown(wait=False)
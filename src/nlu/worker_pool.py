@@ -0,0 +1,165 @@
+from typing import Any, Dict, Iterable, List, Optional
+import gc
+import itertools
+import logging
+import multiprocessing
+import os
+from concurrent.futures import Future, ProcessPoolExecutor
+import torch
+
+from src.nlu.intent_classifier import IntentClassifier
+from src.utils.model_registry import model_registry
+
+# Classifiers handed to forked workers, keyed by pool id. Workers inherit this
+# module state (and the model weights it references) copy-on-write at fork.
+_pool_classifiers: Dict[int, IntentClassifier] = {}
+_pool_ids = itertools.count()
+
+# The classifier used inside a worker process
+_worker_classifier: Optional[IntentClassifier] = None
+
+def _init_worker(pool_id: int, torch_threads: int):
+    """Bind the inherited classifier and size the worker's torch thread pool"""
+    global _worker_classifier
+    _worker_classifier = _pool_classifiers[pool_id]
+    torch.set_num_threads(torch_threads)
+
+def _classify(text: str) -> Dict[str, Any]:
+    """Classify one text inside a worker"""
+    return _worker_classifier.classify(text)
+
+def _classify_batch(texts: List[str], batch_size: int) -> List[Dict[str, Any]]:
+    """Classify a batch of texts inside a worker"""
+    return _worker_classifier.classify_batch(texts, batch_size=batch_size)
+
+class IntentWorkerPool:
+    def __init__(self,
+                 classifier: IntentClassifier,
+                 n_workers: Optional[int] = None,
+                 torch_threads: int = 1):
+        """
+        Initialize a pool of forked classification workers.
+
+        The classifier's transformer and pattern embeddings are loaded once in
+        this process; workers are forked afterwards and share the weights
+        instead of loading their own copy.
+
+        Args:
+            classifier (IntentClassifier): Classifier shared by all workers
+            n_workers (Optional[int]): Number of worker processes
+                (defaults to the CPU count divided by torch_threads)
+            torch_threads (int): Torch intra-op threads per worker
+        """
+        # Set up logging
+        self.logger = logging.getLogger(__name__)
+        self._setup_logging()
+
+        if "fork" not in multiprocessing.get_all_start_methods():
+            raise RuntimeError("IntentWorkerPool requires the 'fork' start method")
+
+        self.torch_threads = max(1, torch_threads)
+        self.n_workers = n_workers or max(1, (os.cpu_count() or 1) // self.torch_threads)
+
+        # Load everything workers need before forking; rule-only workers would
+        # silently serve worse results
+        if not classifier.load_transformer():
+            raise RuntimeError("IntentWorkerPool needs the classifier's transformer tier, which failed to load")
+        if isinstance(classifier.model, torch.nn.Module):
+            classifier.model.share_memory()
+
+        self.pool_id = next(_pool_ids)
+        _pool_classifiers[self.pool_id] = classifier
+
+        # Keep long-lived objects out of the collector so their pages stay shared
+        model_registry.prepare_fork()
+
+        self.executor = ProcessPoolExecutor(
+            max_workers=self.n_workers,
+            mp_context=multiprocessing.get_context("fork"),
+            initializer=_init_worker,
+            initargs=(self.pool_id, self.torch_threads)
+        )
+
+        self.logger.info(f"Started intent worker pool: {self.n_workers} workers x "
+                         f"{self.torch_threads} torch threads")
+
+    def _setup_logging(self):
+        """Configure logging for the worker pool"""
+        logging.basicConfig(
+            level=logging.INFO,
+            format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+        )
+
+    def submit(self, text: str) -> Future:
+        """
+        Queue one text for classification.
+
+        Args:
+            text (str): Input text to classify
+
+        Returns:
+            Future: Resolves to the classification result
+        """
+        return self.executor.submit(_classify, text)
+
+    def submit_batch(self, texts: List[str], batch_size: int = 32) -> Future:
+        """
+        Queue a batch of texts for classification by one worker.
+
+        Args:
+            texts (List[str]): Input texts to classify
+            batch_size (int): Number of texts per transformer forward pass
+
+        Returns:
+            Future: Resolves to the classification results in input order
+        """
+        return self.executor.submit(_classify_batch, list(texts), batch_size)
+
+    @staticmethod
+    def gather(futures: Iterable[Future], timeout: Optional[float] = None) -> List[Any]:
+        """
+        Wait for submitted work and collect the results in submission order.
+
+        Args:
+            futures (Iterable[Future]): Futures returned by submit or submit_batch
+            timeout (Optional[float]): Maximum seconds to wait for each result
+
+        Returns:
+            List[Any]: Results in the order of the futures
+        """
+        return [future.result(timeout=timeout) for future in futures]
+
+    def classify_many(self, texts: List[str], chunk_size: int = 64) -> List[Dict[str, Any]]:
+        """
+        Classify texts across all workers.
+
+        Args:
+            texts (List[str]): Input texts to classify
+            chunk_size (int): Number of texts handed to a worker at once
+
+        Returns:
+            List[Dict[str, Any]]: Classification results in input order
+        """
+        futures = [
+            self.submit_batch(texts[i:i + chunk_size], batch_size=chunk_size)
+            for i in range(0, len(texts), chunk_size)
+        ]
+        return [result for chunk in self.gather(futures) for result in chunk]
+
+    def shutdown(self, wait: bool = True):
+        """
+        Stop the worker processes.
+
+        Args:
+            wait (bool): Wait for queued work to finish
+        """
+        self.executor.shutdown(wait=wait)
+        _pool_classifiers.pop(self.pool_id, None)
+        gc.unfreeze()
+        self.logger.info("Intent worker pool stopped")
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.shutdown()
@@ -0,0 +1,379 @@
+import json
+import logging
+import threading
+import time
+import uuid
+from collections import deque
+from dataclasses import dataclass, field
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable, Dict, List, Optional
+
+from src.assistant import Assistant
+from src.utils.context_manager import ContextManager
+
+@dataclass
+class Session:
+    session_id: str
+    context: ContextManager
+    created: float = field(default_factory=time.time)
+    last_active: float = field(default_factory=time.monotonic)
+    turns: int = 0
+    # Serializes the turns of one session, so its context sees them in order
+    lock: threading.Lock = field(default_factory=threading.Lock)
+    late_responses: deque = field(default_factory=deque)
+
+    def drain_late_responses(self) -> List[str]:
+        """Remove and return the late handler results that arrived so far"""
+        responses = []
+        while self.late_responses:
+            responses.append(self.late_responses.popleft())
+        return responses
+
+class AssistantServer:
+    # Largest accepted request body in bytes
+    MAX_BODY_BYTES = 64 * 1024
+
+    def __init__(self,
+                 assistant: Assistant,
+                 host: str = "127.0.0.1",
+                 port: int = 8765,
+                 max_sessions: int = 64,
+                 idle_timeout: float = 900,
+                 max_inflight: int = 8,
+                 queue_timeout: float = 5.0,
+                 persist_sessions: bool = True):
+        """
+        Initialize a local HTTP server for concurrent text sessions.
+
+        Every session gets its own ContextManager, while the intent classifier,
+        entity extractor, task services and handler pool of the one assistant
+        are shared. Sessions beyond max_sessions are refused, sessions idle for
+        idle_timeout seconds are evicted, and at most max_inflight utterances
+        are processed at once. Their encoder passes and spaCy calls run
+        concurrently; only the fast tokenizer is serialized.
+
+        Args:
+            assistant (Assistant): Assistant created with enable_speech=False
+            host (str): Interface to bind (local only by default)
+            port (int): Port to listen on
+            max_sessions (int): Maximum number of open sessions
+            idle_timeout (float): Seconds without a message before a session is evicted
+            max_inflight (int): Maximum utterances processed concurrently
+            queue_timeout (float): Seconds a message waits for a processing slot
+                before it is refused as busy
+            persist_sessions (bool): Store session contexts and history in the
+                configured conversation database
+        """
+        # Set up logging
+        self.logger = logging.getLogger(__name__)
+        self._setup_logging()
+
+        self.assistant = assistant
+        self.host = host
+        self.port = port
+        self.max_sessions = max(1, max_sessions)
+        self.idle_timeout = idle_timeout
+        self.queue_timeout = queue_timeout
+
+        config = assistant.config
+        self.db_path = config.get('database', 'path') if persist_sessions else None
+        self.context_ttl = config.get('database', 'context_ttl', 300)
+        self.max_history = config.get('database', 'max_history', 10)
+
+        self.sessions: Dict[str, Session] = {}
+        self._sessions_lock = threading.Lock()
+        self._inflight = threading.BoundedSemaphore(max(1, max_inflight))
+
+        self.stats = {"created": 0, "closed": 0, "evicted": 0, "rejected": 0, "busy": 0, "messages": 0}
+        self._stats_lock = threading.Lock()
+
+        self._stopped = threading.Event()
+        self.httpd: Optional[ThreadingHTTPServer] = None
+
+    def _setup_logging(self):
+        """Configure logging for the assistant server"""
+        logging.basicConfig(
+            level=logging.INFO,
+            format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+        )
+
+    def _count(self, key: str):
+        """Increment a statistics counter"""
+        with self._stats_lock:
+            self.stats[key] += 1
+
+    def create_session(self) -> Optional[Session]:
+        """
+        Open a new session if the session limit allows it.
+
+        Returns:
+            Optional[Session]: The new session, None if the server is full
+        """
+        self.evict_idle_sessions()
+        with self._sessions_lock:
+            if len(self.sessions) >= self.max_sessions:
+                self._count("rejected")
+                self.logger.warning("Session limit reached, refusing a new session")
+                return None
+            session_id = uuid.uuid4().hex
+            # Reserve the slot; the context is set up outside the lock
+            self.sessions[session_id] = None
+
+        try:
+            context = ContextManager(context_ttl=self.context_ttl, max_history=self.max_history,
+                                     db_path=self.db_path)
+            context.start_session(session_id)
+        except Exception:
+            with self._sessions_lock:
+                del self.sessions[session_id]
+            raise
+
+        session = Session(session_id, context)
+        with self._sessions_lock:
+            self.sessions[session_id] = session
+        self._count("created")
+        return session
+
+    def get_session(self, session_id: str) -> Optional[Session]:
+        """
+        Look up an open session.
+
+        Args:
+            session_id (str): Session ID
+
+        Returns:
+            Optional[Session]: The session, None if it is unknown or closed
+        """
+        with self._sessions_lock:
+            return self.sessions.get(session_id)
+
+    def close_session(self, session_id: str) -> bool:
+        """
+        Close a session.
+
+        Args:
+            session_id (str): Session ID
+
+        Returns:
+            bool: True if the session was open
+        """
+        with self._sessions_lock:
+            session = self.sessions.get(session_id)
+            if session is None:
+                return False
+            del self.sessions[session_id]
+        self._count("closed")
+        self.logger.info(f"Closed session {session_id}")
+        return True
+
+    def evict_idle_sessions(self) -> List[str]:
+        """
+        Close sessions idle for longer than idle_timeout.
+
+        Returns:
+            List[str]: IDs of the evicted sessions
+        """
+        if self.idle_timeout is None:
+            return []
+
+        now = time.monotonic()
+        with self._sessions_lock:
+            evicted = [
+                session_id for session_id, session in self.sessions.items()
+                if session is not None and not session.lock.locked()
+                and now - session.last_active > self.idle_timeout
+            ]
+            for session_id in evicted:
+                del self.sessions[session_id]
+
+        for _ in evicted:
+            self._count("evicted")
+        if evicted:
+            self.logger.info(f"Evicted {len(evicted)} idle sessions")
+        return evicted
+
+    def _late_result_callback(self, session: Session) -> Callable[[str, Optional[str]], None]:
+        """Build the callback queuing late handler results on a session"""
+        def deliver(intent: str, response: Optional[str]):
+            if response:
+                session.late_responses.append(response)
+        return deliver
+
+    def handle_message(self, session: Session, text: str) -> Optional[Dict[str, Any]]:
+        """
+        Process one utterance of a session.
+
+        Args:
+            session (Session): Open session
+            text (str): User input
+
+        Returns:
+            Optional[Dict[str, Any]]: Result of Assistant.process_text plus the
+                late responses of earlier turns, None if no processing slot
+                freed up within queue_timeout
+        """
+        if not self._inflight.acquire(timeout=self.queue_timeout):
+            self._count("busy")
+            return None
+
+        try:
+            with session.lock:
+                session.last_active = time.monotonic()
+                result = self.assistant.process_text(
+                    text, context=session.context,
+                    on_late_result=self._late_result_callback(session)
+                )
+                session.turns += 1
+                session.last_active = time.monotonic()
+        finally:
+            self._inflight.release()
+        self._count("messages")
+
+        result["session_id"] = session.session_id
+        result["late_responses"] = session.drain_late_responses()
+        if result["intent"] == "farewell":
+            result["session_closed"] = self.close_session(session.session_id)
+        return result
+
+    def describe_session(self, session: Session) -> Dict[str, Any]:
+        """
+        Summarize a session, handing over its pending late responses.
+
+        Args:
+            session (Session): Open session
+
+        Returns:
+            Dict[str, Any]: Session state, context, history and late responses
+        """
+        return {
+            "session_id": session.session_id,
+            "created": session.created,
+            "idle_s": time.monotonic() - session.last_active,
+            "turns": session.turns,
+            "context": session.context.get_context(),
+            "history": session.context.get_history(),
+            "late_responses": session.drain_late_responses()
+        }
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get session statistics.
+
+        Returns:
+            Dict[str, Any]: Open sessions, limits and lifetime counters
+        """
+        with self._stats_lock:
+            stats = dict(self.stats)
+        with self._sessions_lock:
+            stats["open"] = len(self.sessions)
+        stats["max_sessions"] = self.max_sessions
+        return stats
+
+    def _eviction_loop(self):
+        """Evict idle sessions periodically until the server stops"""
+        interval = max(1.0, self.idle_timeout / 4)
+        while not self._stopped.wait(interval):
+            try:
+                self.evict_idle_sessions()
+            except Exception as e:
+                self.logger.error(f"Error evicting idle sessions: {str(e)}")
+
+    def _make_handler(self):
+        """Build the request handler class bound to this server"""
+        server = self
+
+        class SessionRequestHandler(BaseHTTPRequestHandler):
+            def _send_json(self, status: int, payload: Any = None):
+                body = b"" if payload is None else json.dumps(payload, default=str).encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def _read_json(self) -> Any:
+                length = int(self.headers.get("Content-Length") or 0)
+                if length > server.MAX_BODY_BYTES:
+                    raise ValueError("request body too large")
+                return json.loads(self.rfile.read(length) or b"{}")
+
+            def _route(self) -> List[str]:
+                return [part for part in self.path.split("?", 1)[0].split("/") if part]
+
+            def _session(self, session_id: str) -> Optional[Session]:
+                session = server.get_session(session_id)
+                if session is None:
+                    self._send_json(404, {"error": "unknown session"})
+                return session
+
+            def do_GET(self):
+                route = self._route()
+                if route == ["status"]:
+                    self._send_json(200, {"server": server.get_stats(), "assistant": server.assistant.get_status()})
+                elif len(route) == 2 and route[0] == "sessions":
+                    session = self._session(route[1])
+                    if session is not None:
+                        self._send_json(200, server.describe_session(session))
+                else:
+                    self._send_json(404, {"error": "not found"})
+
+            def do_POST(self):
+                route = self._route()
+                try:
+                    if route == ["sessions"]:
+                        session = server.create_session()
+                        if session is None:
+                            self._send_json(503, {"error": "session limit reached"})
+                        else:
+                            self._send_json(201, {"session_id": session.session_id})
+                    elif len(route) == 3 and route[0] == "sessions" and route[2] == "messages":
+                        session = self._session(route[1])
+                        if session is None:
+                            return
+                        request = self._read_json()
+                        if not isinstance(request, dict) or not isinstance(request.get("text"), str):
+                            self._send_json(400, {"error": "expected an object with a 'text' field"})
+                            return
+                        result = server.handle_message(session, request["text"])
+                        if result is None:
+                            self._send_json(503, {"error": "server busy"})
+                        else:
+                            self._send_json(200, result)
+                    else:
+                        self._send_json(404, {"error": "not found"})
+                except ValueError as e:
+                    self._send_json(400, {"error": f"invalid request: {str(e)}"})
+                except Exception as e:
+                    server.logger.error(f"Error handling request {self.path}: {str(e)}")
+                    self._send_json(500, {"error": "internal error"})
+
+            def do_DELETE(self):
+                route = self._route()
+                if len(route) == 2 and route[0] == "sessions" and server.close_session(route[1]):
+                    self._send_json(204)
+                else:
+                    self._send_json(404, {"error": "unknown session"})
+
+            def log_message(self, format, *args):
+                server.logger.debug(format % args)
+
+        return SessionRequestHandler
+
+    def serve_forever(self):
+        """Serve sessions until shutdown is called or the process is interrupted"""
+        self.httpd = ThreadingHTTPServer((self.host, self.port), self._make_handler())
+        self.httpd.daemon_threads = True
+        threading.Thread(target=self._eviction_loop, name="session-eviction", daemon=True).start()
+
+        self.logger.info(f"Serving sessions on http://{self.host}:{self.httpd.server_address[1]}")
+        try:
+            self.httpd.serve_forever()
+        finally:
+            self._stopped.set()
+            self.httpd.server_close()
+
+    def shutdown(self):
+        """Stop serving"""
+        self._stopped.set()
+        if self.httpd is not None:
+            self.httpd.shutdown()
@@ -3,6 +3,7 @@ import logging
 from typing import Dict, Optional, Any
 from datetime import datetime
 import json
+import threading
 from pathlib import Path
 from dataclasses import dataclass
 from src.config import Config
@@ -239,7 +240,10 @@ class WeatherService:
                 'icon': weather.icon
             }
             
-            cache_file.write_text(json.dumps(data, indent=2))
+            # Write then rename, so concurrent readers never see a partial file
+            temp_file = cache_file.with_name(f"{cache_file.name}.{threading.get_ident()}.tmp")
+            temp_file.write_text(json.dumps(data, indent=2))
+            temp_file.replace(cache_file)
             
         except Exception as e:
             self.logger.error(f"Error writing cache: {str(e)}")
@@ -80,14 +80,18 @@ class ContextManager:
             self.logger.error(f"Database initialization error: {str(e)}")
             self.db_path = None
     
-    def start_session(self) -> str:
+    def start_session(self, session_id: Optional[str] = None) -> str:
         """
         Start a new conversation session.
         
+        Args:
+            session_id (Optional[str]): Session ID to use (defaults to the
+                current time, which is only unique for one session per second)
+        
         Returns:
             str: Session ID
         """
-        session_id = datetime.now().strftime("%Y%m%d_%H%M%S")
+        session_id = session_id or datetime.now().strftime("%Y%m%d_%H%M%S")
         self.active_session = session_id
         
         if self.db_path:
@@ -228,7 +232,7 @@ class ContextManager:
                     SET context = ?, last_updated = ?
                     WHERE session_id = ?
                 """, (
-                    json.dumps(self.current_context),
+                    json.dumps(self.current_context, default=str),
                     datetime.now(),
                     self.active_session
                 ))
@@ -261,7 +265,13 @@ class ContextManager:
                 result = cursor.fetchone()
                 
                 if result:
-                    self.current_context = json.loads(result[0])
+                    self.current_context = {
+                        key: {
+                            'value': data['value'],
+                            'timestamp': datetime.fromisoformat(data['timestamp'])
+                        }
+                        for key, data in json.loads(result[0]).items()
+                    }
                     self.active_session = session_id
                     
                     # Load recent history
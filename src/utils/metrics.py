@@ -0,0 +1,298 @@
+from typing import Any, Dict, List, Optional
+import contextlib
+import json
+import logging
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+class LatencyHistogram:
+    # Sub-buckets per power of two; 32 bounds the relative error at about 3%
+    SUB_BUCKET_BITS = 5
+    SUB_BUCKETS = 1 << SUB_BUCKET_BITS
+    # Largest power of two tracked, in microseconds (about 19 hours)
+    MAX_EXPONENT = 36
+
+    def __init__(self):
+        """
+        Initialize an HDR-style latency histogram.
+
+        Values are recorded in microseconds into log-linear buckets: exact
+        below 32us, then 32 linear sub-buckets per power of two, so memory is
+        fixed and percentiles keep a bounded relative error.
+        """
+        self.counts = [0] * ((self.MAX_EXPONENT - self.SUB_BUCKET_BITS + 2) * self.SUB_BUCKETS)
+        self.total = 0
+        self.errors = 0
+        self.sum_us = 0
+        self.max_us = 0
+
+    def _index(self, value_us: int) -> int:
+        """Map a value to its bucket"""
+        if value_us < self.SUB_BUCKETS:
+            return value_us
+        shift = value_us.bit_length() - self.SUB_BUCKET_BITS - 1
+        return min((shift + 1) * self.SUB_BUCKETS + (value_us >> shift) - self.SUB_BUCKETS,
+                   len(self.counts) - 1)
+
+    def _value(self, index: int) -> int:
+        """Upper bound of a bucket in microseconds"""
+        if index < self.SUB_BUCKETS:
+            return index
+        shift = index // self.SUB_BUCKETS - 1
+        return ((index % self.SUB_BUCKETS + self.SUB_BUCKETS + 1) << shift) - 1
+
+    def record(self, value_ms: float, error: bool = False):
+        """
+        Record a latency.
+
+        Args:
+            value_ms (float): Latency in milliseconds
+            error (bool): The timed operation failed
+        """
+        value_us = max(0, int(value_ms * 1000))
+        self.counts[self._index(value_us)] += 1
+        self.total += 1
+        self.errors += error
+        self.sum_us += value_us
+        self.max_us = max(self.max_us, value_us)
+
+    def merge(self, other: "LatencyHistogram"):
+        """
+        Add the recordings of another histogram.
+
+        Args:
+            other (LatencyHistogram): Histogram to add
+        """
+        self.counts = [a + b for a, b in zip(self.counts, other.counts)]
+        self.total += other.total
+        self.errors += other.errors
+        self.sum_us += other.sum_us
+        self.max_us = max(self.max_us, other.max_us)
+
+    def percentiles(self, quantiles: List[float]) -> List[float]:
+        """
+        Estimate percentiles.
+
+        Args:
+            quantiles (List[float]): Quantiles between 0 and 1, ascending
+
+        Returns:
+            List[float]: Bucket upper bounds in milliseconds
+        """
+        results = []
+        if not self.total:
+            return [0.0] * len(quantiles)
+
+        targets = [max(1, int(q * self.total + 0.5)) for q in quantiles]
+        seen, t = 0, 0
+        for index, count in enumerate(self.counts):
+            seen += count
+            while t < len(targets) and seen >= targets[t]:
+                results.append(min(self._value(index), self.max_us) / 1000)
+                t += 1
+            if t == len(targets):
+                break
+        return results
+
+    def summary(self) -> Dict[str, Any]:
+        """
+        Summarize the histogram.
+
+        Returns:
+            Dict[str, Any]: Count, errors, mean, p50/p95/p99 and max in milliseconds
+        """
+        p50, p95, p99 = self.percentiles([0.5, 0.95, 0.99])
+        return {
+            "count": self.total,
+            "errors": self.errors,
+            "mean": self.sum_us / self.total / 1000 if self.total else 0.0,
+            "p50": p50,
+            "p95": p95,
+            "p99": p99,
+            "max": self.max_us / 1000
+        }
+
+class MetricsRecorder:
+    def __init__(self, enabled: bool = True, window: float = 300):
+        """
+        Initialize per-stage latency metrics.
+
+        Every stage (and every stage per intent) keeps two histograms that are
+        rotated every window seconds, so summaries cover the last one to two
+        windows. When disabled, record and span return immediately.
+
+        Args:
+            enabled (bool): Record metrics
+            window (float): Rotation period of the rolling histograms in seconds
+        """
+        # Set up logging
+        self.logger = logging.getLogger(__name__)
+        self._setup_logging()
+
+        self.enabled = enabled
+        self.window = window
+
+        self._current: Dict[tuple, LatencyHistogram] = {}
+        self._previous: Dict[tuple, LatencyHistogram] = {}
+        self._rotated_at = time.monotonic()
+        self._lock = threading.Lock()
+        self._server = None
+
+    def _setup_logging(self):
+        """Configure logging for the metrics recorder"""
+        logging.basicConfig(
+            level=logging.INFO,
+            format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+        )
+
+    def record(self, stage: str, value_ms: float, intent: Optional[str] = None, error: bool = False):
+        """
+        Record the latency of a stage.
+
+        Args:
+            stage (str): Stage name (e.g. "listen", "intent.transformer", "handler")
+            value_ms (float): Latency in milliseconds
+            intent (Optional[str]): Intent the stage ran for, also recorded per intent
+            error (bool): The stage failed
+        """
+        if not self.enabled:
+            return
+
+        with self._lock:
+            if time.monotonic() - self._rotated_at > self.window:
+                self._previous, self._current = self._current, {}
+                self._rotated_at = time.monotonic()
+
+            keys = [(stage, None)] if intent is None else [(stage, None), (stage, intent)]
+            for key in keys:
+                histogram = self._current.get(key)
+                if histogram is None:
+                    histogram = self._current[key] = LatencyHistogram()
+                histogram.record(value_ms, error)
+
+    @contextlib.contextmanager
+    def _timed(self, stage: str, intent: Optional[str]):
+        """Time the enclosed block, counting exceptions as errors"""
+        started = time.perf_counter()
+        error = False
+        try:
+            yield
+        except BaseException:
+            error = True
+            raise
+        finally:
+            self.record(stage, (time.perf_counter() - started) * 1000, intent, error)
+
+    def span(self, stage: str, intent: Optional[str] = None):
+        """
+        Time a block of code as a stage.
+
+        Args:
+            stage (str): Stage name
+            intent (Optional[str]): Intent the stage runs for
+
+        Returns:
+            ContextManager: Timing context (a no-op when disabled)
+        """
+        if not self.enabled:
+            return contextlib.nullcontext()
+        return self._timed(stage, intent)
+
+    def get_snapshot(self) -> Dict[str, Any]:
+        """
+        Summarize the rolling histograms.
+
+        Returns:
+            Dict[str, Any]: Summaries per stage and per intent and stage
+        """
+        if not self.enabled:
+            return {"enabled": False}
+
+        with self._lock:
+            merged: Dict[tuple, LatencyHistogram] = {}
+            for histograms in (self._previous, self._current):
+                for key, histogram in histograms.items():
+                    merged.setdefault(key, LatencyHistogram()).merge(histogram)
+
+        snapshot = {"enabled": True, "window_s": self.window, "stages": {}, "intents": {}}
+        for (stage, intent), histogram in sorted(merged.items(), key=lambda item: (item[0][0], item[0][1] or "")):
+            if intent is None:
+                snapshot["stages"][stage] = histogram.summary()
+            else:
+                snapshot["intents"].setdefault(intent, {})[stage] = histogram.summary()
+        return snapshot
+
+    def write_file(self, file_path: str):
+        """
+        Write a snapshot as JSON.
+
+        Args:
+            file_path (str): Destination file
+        """
+        try:
+            with open(file_path, 'w') as f:
+                json.dump({"timestamp": time.time(), **self.get_snapshot()}, f, indent=4)
+        except Exception as e:
+            self.logger.error(f"Error writing metrics file: {str(e)}")
+
+    def start_file_writer(self, file_path: str, interval: float = 10) -> threading.Thread:
+        """
+        Rewrite the metrics file periodically in a daemon thread.
+
+        Args:
+            file_path (str): Destination file
+            interval (float): Seconds between writes
+
+        Returns:
+            threading.Thread: The writer thread
+        """
+        def write_loop():
+            while True:
+                time.sleep(interval)
+                self.write_file(file_path)
+
+        thread = threading.Thread(target=write_loop, name="metrics-writer", daemon=True)
+        thread.start()
+        self.logger.info(f"Writing metrics to {file_path} every {interval}s")
+        return thread
+
+    def start_server(self, port: int, host: str = "127.0.0.1") -> ThreadingHTTPServer:
+        """
+        Serve snapshots as JSON at http://host:port/metrics from a daemon thread.
+
+        Args:
+            port (int): Port to listen on
+            host (str): Interface to bind (local only by default)
+
+        Returns:
+            ThreadingHTTPServer: The running server
+        """
+        recorder = self
+
+        class MetricsHandler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.split("?", 1)[0] != "/metrics":
+                    self.send_error(404)
+                    return
+                body = json.dumps(recorder.get_snapshot()).encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                recorder.logger.debug(format % args)
+
+        self._server = ThreadingHTTPServer((host, port), MetricsHandler)
+        threading.Thread(target=self._server.serve_forever, name="metrics-server", daemon=True).start()
+        self.logger.info(f"Serving metrics on http://{host}:{self._server.server_address[1]}/metrics")
+        return self._server
+
+    def stop_server(self):
+        """Stop the metrics endpoint"""
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
@@ -0,0 +1,223 @@
+from typing import Any, Callable, Dict, List, Optional
+import gc
+import json
+import logging
+import threading
+import time
+
+class ModelHandle:
+    def __init__(self, kind: str, name: str, options: Dict[str, Any], model: Any):
+        """
+        Initialize a handle to a shared model.
+
+        Args:
+            kind (str): Model family (e.g. "spacy", "transformer", "tokenizer")
+            name (str): Model name
+            options (Dict[str, Any]): Options the model was loaded with
+            model (Any): The loaded model
+        """
+        self.kind = kind
+        self.name = name
+        self.options = options
+        self.model = model
+        self.loaded_at = time.time()
+        self.users = 0
+        self.memory_bytes = estimate_memory(model)
+
+        # Serializes callers that mutate the model or are not re-entrant
+        self.lock = threading.RLock()
+
+    def __enter__(self) -> Any:
+        self.lock.acquire()
+        return self.model
+
+    def __exit__(self, exc_type, exc, tb):
+        self.lock.release()
+
+    def describe(self) -> Dict[str, Any]:
+        """
+        Describe the handle for reporting.
+
+        Returns:
+            Dict[str, Any]: Kind, name, options, user count and memory estimate
+        """
+        return {
+            "kind": self.kind,
+            "name": self.name,
+            "options": self.options,
+            "users": self.users,
+            "memory_bytes": self.memory_bytes,
+            "loaded_at": self.loaded_at
+        }
+
+def estimate_memory(model: Any) -> Optional[int]:
+    """
+    Estimate the memory held by a model's weights.
+
+    Args:
+        model (Any): Torch module, spaCy pipeline or other model
+
+    Returns:
+        Optional[int]: Size in bytes, None if the model type is unknown
+    """
+    try:
+        if hasattr(model, "state_dict"):
+            # Torch modules, including quantized and scripted ones
+            total = 0
+            for value in model.state_dict().values():
+                tensors = value if isinstance(value, (tuple, list)) else [value]
+                for tensor in tensors:
+                    if hasattr(tensor, "element_size"):
+                        total += tensor.numel() * tensor.element_size()
+            return total
+
+        if hasattr(model, "pipeline") and hasattr(model, "vocab"):
+            # spaCy pipelines: thinc parameters plus static vectors
+            total = model.vocab.vectors.data.nbytes
+            for _, component in model.pipeline:
+                thinc_model = getattr(component, "model", None)
+                if thinc_model is None or not hasattr(thinc_model, "walk"):
+                    continue
+                for node in thinc_model.walk():
+                    for param in node.param_names:
+                        if node.has_param(param):
+                            total += node.get_param(param).nbytes
+            return total
+    except Exception:
+        pass
+
+    return None
+
+class ModelRegistry:
+    def __init__(self):
+        """
+        Initialize a registry of models shared across the process.
+
+        Models are keyed by kind, name and load options; every caller asking
+        for the same key gets the same handle, so weights are held only once.
+        """
+        # Set up logging
+        self.logger = logging.getLogger(__name__)
+        self._setup_logging()
+
+        self._handles: Dict[str, ModelHandle] = {}
+        self._key_locks: Dict[str, threading.Lock] = {}
+        self._lock = threading.Lock()
+
+    def _setup_logging(self):
+        """Configure logging for the model registry"""
+        logging.basicConfig(
+            level=logging.INFO,
+            format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+        )
+
+    @staticmethod
+    def _key(kind: str, name: str, options: Dict[str, Any]) -> str:
+        """Build the registry key for a model"""
+        return json.dumps([kind, name, options], sort_keys=True, default=str)
+
+    def get(self, kind: str, name: str, loader: Callable[[], Any], **options) -> ModelHandle:
+        """
+        Get a shared model, loading it once if needed.
+
+        Concurrent requests for the same key wait for a single load; different
+        keys load in parallel.
+
+        Args:
+            kind (str): Model family
+            name (str): Model name
+            loader (Callable[[], Any]): Function loading the model on a miss
+            **options: Load options that distinguish variants of the same model
+
+        Returns:
+            ModelHandle: Handle to the shared model
+        """
+        key = self._key(kind, name, options)
+
+        with self._lock:
+            handle = self._handles.get(key)
+            if handle is None:
+                key_lock = self._key_locks.setdefault(key, threading.Lock())
+
+        if handle is None:
+            with key_lock:
+                handle = self._handles.get(key)
+                if handle is None:
+                    started = time.perf_counter()
+                    handle = ModelHandle(kind, name, options, loader())
+                    with self._lock:
+                        self._handles[key] = handle
+                    self.logger.info(f"Loaded shared {kind} model {name} {options or ''} "
+                                     f"in {time.perf_counter() - started:.2f}s")
+
+        with self._lock:
+            handle.users += 1
+        return handle
+
+    def unload(self, kind: str, name: str, **options) -> bool:
+        """
+        Drop a model from the registry.
+
+        Objects that still reference the model keep it alive until they are released.
+
+        Args:
+            kind (str): Model family
+            name (str): Model name
+            **options: Load options the model was registered with
+
+        Returns:
+            bool: True if the model was registered
+        """
+        with self._lock:
+            handle = self._handles.pop(self._key(kind, name, options), None)
+        if handle is None:
+            return False
+
+        self.logger.info(f"Unloaded shared {kind} model {name}")
+        gc.collect()
+        return True
+
+    def release(self, handle: ModelHandle) -> bool:
+        """
+        Give back a handle obtained from get, unloading the model once no user holds it.
+
+        Args:
+            handle (ModelHandle): Handle returned by get
+
+        Returns:
+            bool: True if the model was unloaded
+        """
+        key = self._key(handle.kind, handle.name, handle.options)
+        with self._lock:
+            handle.users = max(0, handle.users - 1)
+            if handle.users or self._handles.get(key) is not handle:
+                return False
+            del self._handles[key]
+
+        self.logger.info(f"Released shared {handle.kind} model {handle.name}")
+        gc.collect()
+        return True
+
+    def prepare_fork(self):
+        """
+        Prepare loaded models to be shared copy-on-write with forked workers.
+
+        Moves every currently tracked object to the permanent GC generation so
+        the collector does not touch (and thereby copy) their pages in children.
+        """
+        gc.collect()
+        gc.freeze()
+        self.logger.info(f"Prepared {len(self._handles)} shared models for fork")
+
+    def get_memory_report(self) -> List[Dict[str, Any]]:
+        """
+        Report the loaded models and their estimated memory use.
+
+        Returns:
+            List[Dict[str, Any]]: One description per loaded model
+        """
+        with self._lock:
+            return [handle.describe() for handle in self._handles.values()]
+
+# Process-wide registry
+model_registry = ModelRegistry()
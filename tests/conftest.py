@@ -0,0 +1,19 @@
+import pytest
+import spacy
+
+from src.utils.model_registry import model_registry
+
+@pytest.fixture
+def blank_spacy(monkeypatch):
+    """Load a blank English pipeline in place of any installed spaCy model"""
+    monkeypatch.setattr(spacy, "load", lambda name, **kwargs: spacy.blank("en"))
+    yield
+    # Models are shared process-wide; drop them so each test loads its own
+    for report in model_registry.get_memory_report():
+        model_registry.unload(report["kind"], report["name"], **report["options"])
+
+@pytest.fixture
+def extractor(blank_spacy):
+    """Entity extractor on a blank pipeline, without gazetteer or result cache"""
+    from src.nlu.entity_extractor import EntityExtractor
+    return EntityExtractor(use_gazetteer=False, cache_size=0)
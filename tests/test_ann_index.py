@@ -0,0 +1,63 @@
+import numpy as np
+
+from src.nlu.ann_index import IVFIndex
+
+def clustered_vectors(n_labels=200, per_label=5, dim=32, seed=0):
+    """Normalized vectors scattered around one random direction per label"""
+    rng = np.random.default_rng(seed)
+    centers = rng.normal(size=(n_labels, dim))
+    vectors = np.repeat(centers, per_label, axis=0) + 0.3 * rng.normal(size=(n_labels * per_label, dim))
+    vectors /= np.linalg.norm(vectors, axis=1, keepdims=True)
+    labels = [f"intent{i}" for i in range(n_labels) for _ in range(per_label)]
+    return vectors.astype(np.float32), labels
+
+def exact_best(vectors, labels, query):
+    return labels[int(np.argmax(vectors @ query))]
+
+def test_recall_against_exact_search():
+    vectors, labels = clustered_vectors()
+    index = IVFIndex(n_probe=8)
+    index.build(vectors, labels)
+    assert len(index) == len(vectors)
+
+    rng = np.random.default_rng(1)
+    queries = vectors[rng.choice(len(vectors), 200, replace=False)] + 0.1 * rng.normal(size=(200, vectors.shape[1]))
+    queries /= np.linalg.norm(queries, axis=1, keepdims=True)
+    hits = sum(index.search(q, k=1)[0][0] == exact_best(vectors, labels, q) for q in queries)
+    assert hits / len(queries) >= 0.95
+
+def test_probing_every_list_is_exact():
+    vectors, labels = clustered_vectors(n_labels=50)
+    index = IVFIndex(n_lists=8, n_probe=8)
+    index.build(vectors, labels)
+    for query in vectors[::7]:
+        results = index.search(query, k=3)
+        assert results[0][0] == exact_best(vectors, labels, query)
+        assert len({label for label, _ in results}) == 3
+        assert [score for _, score in results] == sorted((score for _, score in results), reverse=True)
+
+def test_add_and_remove_labels():
+    vectors, labels = clustered_vectors(n_labels=20)
+    index = IVFIndex(n_probe=100)
+    index.build(vectors, labels)
+
+    extra = -vectors[:1]
+    index.add(extra, ["opposite"])
+    assert index.search(extra[0], k=1)[0][0] == "opposite"
+
+    index.remove("opposite")
+    assert len(index) == len(vectors)
+    assert index.search(extra[0], k=1)[0][0] != "opposite"
+
+def test_save_and_load_round_trip(tmp_path):
+    vectors, labels = clustered_vectors(n_labels=30)
+    index = IVFIndex()
+    index.build(vectors, labels, key="abc")
+    path = tmp_path / "index.npz"
+    index.save(str(path))
+
+    loaded = IVFIndex()
+    assert loaded.load(str(path))
+    assert loaded.key == "abc" and len(loaded) == len(index)
+    assert loaded.search(vectors[0], k=3) == index.search(vectors[0], k=3)
+    assert not IVFIndex().load(str(tmp_path / "missing.npz"))
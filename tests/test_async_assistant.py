@@ -0,0 +1,62 @@
+import threading
+import time
+
+import pytest
+
+# Needs the assistant's speech and model dependencies
+AsyncAssistant = pytest.importorskip("src.async_assistant").AsyncAssistant
+
+class FakeAssistant:
+    """Scripted speech I/O that records whether the microphone was open during speech"""
+
+    def __init__(self, utterances, listen_s=0.02, speak_s=0.05):
+        self.utterances = list(utterances)
+        self.listen_s = listen_s
+        self.speak_s = speak_s
+        self.is_listening = False
+        self.speaking = threading.Event()
+        self.heard_speech = {}
+        self.spoken = []
+
+    def listen(self):
+        if not self.utterances:
+            self.is_listening = False
+            return {"success": False, "error": "no more input"}
+        text = self.utterances.pop(0)
+        overlapped = self.speaking.is_set()
+        time.sleep(self.listen_s)
+        overlapped = overlapped or self.speaking.is_set()
+        self.heard_speech[text] = overlapped
+        return {"success": True, "text": text}
+
+    def handle_input(self, text):
+        return f"you said {text}"
+
+    def speak(self, text):
+        self.speaking.set()
+        time.sleep(self.speak_s)
+        self.spoken.append(text)
+        self.speaking.clear()
+
+    def stop(self):
+        self.is_listening = False
+
+def test_capture_pauses_while_speaking_by_default():
+    assistant = FakeAssistant(["one", "two", "three"])
+    pipeline = AsyncAssistant(assistant)
+    pipeline.start()
+
+    stats = pipeline.get_stats()
+    assert stats["captured"] + stats["discarded"] == 3
+    # Only captures that did not overlap speech were handled
+    handled = [text for text, overlapped in assistant.heard_speech.items() if not overlapped]
+    assert assistant.spoken == ["Hello! How can I help you today?"] + [f"you said {text}" for text in handled]
+
+def test_full_duplex_keeps_capturing_during_speech():
+    assistant = FakeAssistant(["one", "two", "three"], listen_s=0.03, speak_s=0.1)
+    pipeline = AsyncAssistant(assistant, listen_while_speaking=True)
+    pipeline.start()
+
+    assert pipeline.get_stats()["captured"] == 3
+    assert any(assistant.heard_speech.values())
+    assert assistant.spoken[1:] == ["you said one", "you said two", "you said three"]
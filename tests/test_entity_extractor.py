@@ -0,0 +1,76 @@
+import time
+
+def labels(entities, group="custom"):
+    return [(entity["label"], entity["text"]) for entity in entities.get(group, [])]
+
+def test_default_patterns_overlap_across_types(extractor):
+    entities = extractor.extract_entities("mail bob@example.com tomorrow at 10:30 pm")
+    assert ("email_patterns", "bob@example.com") in labels(entities)
+    assert ("datetime_patterns", "tomorrow") in labels(entities)
+    assert ("datetime_patterns", "10:30 pm") in labels(entities)
+
+def test_inline_flag_pattern_matches_without_breaking_others(extractor):
+    extractor.add_custom_pattern("product", "(?i)widget")
+    entities = extractor.extract_entities("Order a WIDGET tomorrow")
+    assert ("product", "WIDGET") in labels(entities)
+    assert ("datetime_patterns", "tomorrow") in labels(entities)
+
+def test_inline_flag_pattern_in_existing_type(extractor):
+    extractor.add_custom_pattern("datetime_patterns", "(?i)tonight")
+    entities = extractor.extract_entities("TONIGHT or tomorrow")
+    assert labels(entities) == [("datetime_patterns", "TONIGHT"), ("datetime_patterns", "tomorrow")]
+
+def test_backreference_pattern_keeps_its_group(extractor):
+    extractor.add_custom_pattern("product", r"(\d+)")
+    extractor.add_custom_pattern("product", r"\b(\w)\1\w*")
+    entities = extractor.extract_entities("see ooze and 42")
+    assert labels(entities) == [("product", "ooze"), ("product", "42")]
+
+def test_invalid_pattern_is_rejected(extractor):
+    extractor.add_custom_pattern("product", "(unclosed")
+    assert "product" not in extractor.custom_patterns
+    assert ("datetime_patterns", "tomorrow") in labels(extractor.extract_entities("tomorrow"))
+
+def test_batch_matches_single_extraction(extractor):
+    extractor.add_custom_pattern("product", "(?i)widget")
+    texts = ["a Widget today", "", "call +1 555 123 4567"]
+    assert list(extractor.extract_entities_batch(texts)) == [
+        extractor.extract_entities(text) for text in texts
+    ]
+
+def test_added_pattern_invalidates_cached_results(blank_spacy):
+    from src.nlu.entity_extractor import EntityExtractor
+    cached = EntityExtractor(use_gazetteer=False, cache_size=16)
+    assert labels(cached.extract_entities("a widget")) == []
+    cached.add_custom_pattern("product", "widget")
+    assert labels(cached.extract_entities("a widget")) == [("product", "widget")]
+
+def test_idle_language_pipeline_is_released_without_further_calls(blank_spacy):
+    from src.nlu.entity_extractor import EntityExtractor
+    from src.utils.model_registry import model_registry
+    extractor = EntityExtractor(use_gazetteer=False, language_models={"de": "de_test"},
+                                language_idle_timeout=0.1)
+    extractor.extract_entities("guten Morgen", language="de")
+    assert list(extractor._pipelines) == ["de"]
+
+    deadline = time.monotonic() + 2
+    while extractor._pipelines and time.monotonic() < deadline:
+        time.sleep(0.05)
+    assert not extractor._pipelines
+    assert [report["name"] for report in model_registry.get_memory_report()] == ["en_core_web_sm"]
+
+def test_language_lru_keeps_a_bounded_number_of_pipelines(blank_spacy):
+    from src.nlu.entity_extractor import EntityExtractor
+    extractor = EntityExtractor(use_gazetteer=False, max_loaded_languages=1, language_idle_timeout=None,
+                                language_models={"de": "de_test", "fr": "fr_test"})
+    extractor.get_pipeline("de")
+    extractor.get_pipeline("fr")
+    assert list(extractor._pipelines) == ["fr"]
+
+def test_gazetteer_locations_join_the_standard_group(blank_spacy):
+    from src.nlu.entity_extractor import EntityExtractor
+    extractor = EntityExtractor(cache_size=0)
+    standard = extractor.extract_entities("what's the weather in paris")["standard"]
+    assert [(entity["label"], entity["canonical"]) for entity in standard] == [("GPE", "Paris")]
+    assert "latitude" in standard[0]
+    assert extractor.extract_entities("Nice to meet you")["standard"] == []
@@ -0,0 +1,49 @@
+import pytest
+
+from src.nlu.gazetteer import Gazetteer
+
+@pytest.fixture(scope="module")
+def builtin():
+    return Gazetteer()
+
+def names(entities):
+    return [entity["canonical"] for entity in entities]
+
+def test_prefers_the_longest_name_and_keeps_offsets(builtin):
+    text = "Flights from New York City to Rio de Janeiro"
+    entities = builtin.find(text)
+    assert names(entities) == ["New York", "Rio de Janeiro"]
+    assert [text[e["start"]:e["end"]] for e in entities] == ["New York City", "Rio de Janeiro"]
+
+def test_folds_case_and_accents(builtin):
+    assert names(builtin.find("weather in SÃO PAULO and montréal")) == ["Sao Paulo", "Montreal"]
+
+def test_single_word_needs_a_cue_or_capitals(builtin):
+    assert names(builtin.find("I flew to paris")) == ["Paris"]
+    assert names(builtin.find("paris weather")) == ["Paris"]
+    assert names(builtin.find("I like Paris a lot")) == ["Paris"]
+    assert builtin.find("i like paris a lot") == []
+
+def test_common_words_are_not_cities_at_sentence_start(builtin):
+    assert builtin.find("Nice to meet you") == []
+    assert builtin.find("That was nice") == []
+    assert names(builtin.find("Is it sunny in nice")) == ["Nice"]
+    assert names(builtin.find("Paris is lovely")) == ["Paris"]
+
+def write_geonames(path, rows):
+    lines = []
+    for geoname_id, (name, population) in enumerate(rows):
+        fields = [str(geoname_id), name, name, "", "10.0", "20.0", "P", "PPL", "XX"] + [""] * 5 + [str(population)]
+        lines.append("\t".join(fields))
+    path.write_text("\n".join(lines) + "\n", encoding="utf-8")
+
+def test_loaded_list_drops_small_and_common_single_word_names(tmp_path):
+    dump = tmp_path / "cities.txt"
+    write_geonames(dump, [("Of", 500000), ("Orange", 28000), ("Mobile", 187000),
+                          ("Springfield", 150000), ("Little Rock", 200000)])
+    gazetteer = Gazetteer(str(dump), min_single_word_population=100000, common_words={"of"})
+    assert sorted(gazetteer.trie.keys()) == ["little rock", "springfield"]
+    assert gazetteer.find("the weather of orange county") == []
+    assert gazetteer.find("my Mobile phone") == []
+    assert names(gazetteer.find("I moved to Springfield")) == ["Springfield"]
+    assert names(gazetteer.find("weather in little rock")) == ["Little Rock"]
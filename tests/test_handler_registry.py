@@ -0,0 +1,72 @@
+import threading
+import time
+
+import pytest
+
+from src.handler_registry import HandlerRegistry
+
+@pytest.fixture
+def registry():
+    registry = HandlerRegistry(max_workers=2, default_deadline=0.2)
+    yield registry
+    registry.shutdown()
+
+def test_unknown_intent_gets_the_fallback(registry):
+    assert registry.dispatch("unknown", {}) == HandlerRegistry.FALLBACK_RESPONSE
+
+def test_fast_handler_answers_within_its_deadline(registry):
+    registry.register("greeting", lambda entities: f"Hello {entities['name']}")
+    assert registry.dispatch("greeting", {"name": "Ada"}) == "Hello Ada"
+
+def test_inline_handler_runs_on_the_caller_thread(registry):
+    registry.register("whoami", lambda entities: threading.current_thread().name, deadline=None)
+    assert registry.dispatch("whoami", {}) == threading.current_thread().name
+
+def test_late_handler_returns_pending_response_then_delivers(registry):
+    release = threading.Event()
+    delivered = []
+    done = threading.Event()
+
+    def slow(entities):
+        release.wait(2)
+        return "Sunny"
+
+    def on_late_result(intent, response):
+        delivered.append((intent, response))
+        done.set()
+
+    registry.register("weather", slow, deadline=0.05, pending_response="Checking...")
+    started = time.monotonic()
+    assert registry.dispatch("weather", {}, on_late_result=on_late_result) == "Checking..."
+    assert time.monotonic() - started < 1
+
+    release.set()
+    assert done.wait(2)
+    assert delivered == [("weather", "Sunny")]
+    assert registry.get_stats()["late"] == 1
+
+def test_wait_ignores_the_deadline(registry):
+    registry.register("slow", lambda entities: time.sleep(0.1) or "done", deadline=0.01)
+    assert registry.dispatch("slow", {}, wait=True) == "done"
+
+def test_handler_errors_become_the_error_response(registry):
+    registry.register("broken", lambda entities: 1 / 0)
+    assert registry.dispatch("broken", {}) == HandlerRegistry.ERROR_RESPONSE
+    assert registry.get_stats()["errors"] == 1
+
+def test_busy_pool_rejects_within_the_deadline(registry):
+    release = threading.Event()
+    registry.register("block", lambda entities: release.wait(2) and "done", deadline=0.05)
+    try:
+        assert registry.dispatch("block", {}) != HandlerRegistry.BUSY_RESPONSE
+        assert registry.dispatch("block", {}) != HandlerRegistry.BUSY_RESPONSE
+        started = time.monotonic()
+        assert registry.dispatch("block", {}) == HandlerRegistry.BUSY_RESPONSE
+        assert time.monotonic() - started < 1
+        assert registry.get_stats()["rejected"] == 1
+    finally:
+        release.set()
+
+def test_load_modules_skips_broken_modules(registry):
+    registry.load_modules(["no_such_handler_module"])
+    assert registry.get_stats()["intents"] == []
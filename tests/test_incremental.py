@@ -0,0 +1,50 @@
+from src.nlu.incremental import IncrementalEntitySession
+
+def custom(deltas, kind):
+    return [(entity["label"], entity["text"]) for entity in deltas[kind] if entity["group"] == "custom"]
+
+def test_append_reports_entities_once(extractor):
+    session = IncrementalEntitySession(extractor, context_chars=8)
+    assert custom(session.append("remind me tomorrow"), "added") == [("datetime_patterns", "tomorrow")]
+    deltas = session.append(" and mail bob@example.com")
+    assert custom(deltas, "added") == [("email_patterns", "bob@example.com")]
+    assert deltas["retracted"] == []
+    assert session.get_entities()["custom"] == [
+        {key: value for key, value in entity.items() if key != "group"}
+        for entity in session.entities
+    ]
+
+def test_only_the_window_is_reanalyzed(extractor):
+    session = IncrementalEntitySession(extractor, context_chars=4)
+    session.append("word " * 40)
+    analyzed = session.analyzed_chars
+    session.append("tomorrow")
+    assert session.analyzed_chars - analyzed < 20
+
+def test_revised_tail_retracts_and_changes(extractor):
+    session = IncrementalEntitySession(extractor, context_chars=4)
+    session.update("call me at 10:30")
+    deltas = session.update("call me at 10:30 pm")
+    assert custom(deltas, "changed") == [("datetime_patterns", "10:30 pm")]
+
+    deltas = session.update("call me at noon")
+    assert custom(deltas, "retracted") == [("datetime_patterns", "10:30 pm")]
+    assert session.text == "call me at noon"
+
+def test_extractor_failure_keeps_previous_state(extractor, monkeypatch):
+    session = IncrementalEntitySession(extractor)
+    session.append("remind me tomorrow")
+    entities, analyzed = list(session.entities), session.analyzed_chars
+
+    def fail(text):
+        raise RuntimeError("pipeline unavailable")
+
+    monkeypatch.setattr(extractor, "get_pipeline", lambda language=None: fail)
+    assert session.append(" at 10:30") == {"added": [], "changed": [], "retracted": []}
+    assert session.text == "remind me tomorrow"
+    assert session.entities == entities and session.analyzed_chars == analyzed
+
+    monkeypatch.undo()
+    deltas = session.append(" at 10:30")
+    assert custom(deltas, "added") == [("datetime_patterns", "10:30")]
+    assert deltas["retracted"] == []
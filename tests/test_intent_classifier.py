@@ -0,0 +1,81 @@
+import threading
+
+import numpy as np
+import pytest
+
+pytest.importorskip("torch")
+from src.nlu.intent_classifier import IntentClassifier
+from src.nlu.pattern_embeddings import PatternEmbeddingStore
+
+def fake_embed(texts, batch_size=64):
+    """Embed each word as its own axis, so texts sharing words are similar"""
+    vectors = np.zeros((len(texts), 64), dtype=np.float32)
+    for row, text in enumerate(texts):
+        for word in text.split():
+            vectors[row, sum(map(ord, word)) % 64] += 1.0
+    return vectors
+
+def make_classifier(monkeypatch, **kwargs):
+    """Build a classifier whose transformer tier runs on fake embeddings"""
+    classifier = IntentClassifier(load_mode="lazy", embedding_cache_dir=None, cache_size=64, **kwargs)
+    monkeypatch.setattr(classifier, "_embed", fake_embed)
+    classifier.pattern_store = PatternEmbeddingStore("fake", cache_dir=None)
+    classifier.pattern_store.sync(classifier.intents, fake_embed)
+    classifier._train_head()
+    classifier._transformer_ready.set()
+    return classifier
+
+@pytest.fixture
+def classifier(monkeypatch):
+    return make_classifier(monkeypatch)
+
+def test_rule_tier_ignores_case_and_punctuation(classifier):
+    result = classifier.classify("Hello!!")
+    assert (result["intent"], result["tier"]) == ("greeting", "rule")
+    assert classifier.classify("hello")["tier"] == "cache"
+
+def test_transformer_tier_reports_top_scores(classifier):
+    result = classifier.classify("weather aaa bbb ccc ddd")
+    assert result["tier"] == "transformer"
+    assert result["intent"] == result["scores"][0][0] == "weather"
+    assert [score for _, score in result["scores"]] == sorted((score for _, score in result["scores"]), reverse=True)
+
+def test_batch_matches_single_classification(classifier):
+    texts = ["hi", "", "weather aaa bbb ccc ddd", "remind me please"]
+    batch = classifier.classify_batch(texts)
+    classifier.cache.clear()
+    assert [result["intent"] for result in batch] == [classifier.classify(text)["intent"] for text in texts]
+
+def test_add_intent_invalidates_cache_and_is_classified(classifier):
+    assert classifier.classify("order pizza now")["intent"] != "food"
+    classifier.add_intent("food", ["order pizza now", "order food"], ["Ordering."])
+    assert classifier.classify("order pizza now")["intent"] == "food"
+    assert classifier.top_k_intents("order pizza", k=1)[0][0] == "food"
+
+def test_classification_during_add_intent_sees_a_consistent_catalog(classifier):
+    errors = []
+    stop = threading.Event()
+
+    def classify_loop():
+        while not stop.is_set():
+            for result in classifier.classify_batch(["weather aaa bbb ccc ddd", "zzz qqq"]):
+                if result["intent"] is not None and result["intent"] not in classifier.intents:
+                    errors.append(result)
+
+    threads = [threading.Thread(target=classify_loop) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for i in range(30):
+        classifier.add_intent(f"extra{i}", [f"extra pattern {i}", f"more words {i}"], ["ok"])
+    stop.set()
+    for thread in threads:
+        thread.join(5)
+    assert errors == []
+    assert classifier.pattern_store.intent_names[-1] == "extra29"
+
+def test_head_results_carry_plain_string_intents(monkeypatch):
+    classifier = make_classifier(monkeypatch, use_head=True)
+    result = classifier.classify("weather aaa bbb ccc ddd")
+    assert result["tier"] == "transformer"
+    assert type(result["intent"]) is str
+    assert all(type(name) is str for name, _ in result["scores"] + classifier.top_k_intents("weather"))
@@ -0,0 +1,51 @@
+import numpy as np
+
+from src.nlu.intent_head import LinearIntentHead
+
+def clusters(n_per_class=20, n_classes=3, dim=16, noise=0.3, seed=0):
+    rng = np.random.default_rng(seed)
+    centers = rng.normal(size=(n_classes, dim))
+    labels = np.repeat(np.arange(n_classes), n_per_class)
+    return centers[labels] + noise * rng.normal(size=(len(labels), dim)), labels
+
+def test_fits_separable_clusters_with_normalized_probabilities():
+    features, labels = clusters()
+    head = LinearIntentHead()
+    head.fit(features, labels, ["a", "b", "c"])
+    probs = head.predict_proba(features)
+    np.testing.assert_allclose(probs.sum(axis=1), 1.0, rtol=1e-5)
+    assert (probs.argmax(axis=1) == labels).mean() > 0.95
+
+def test_class_names_are_plain_strings():
+    features, labels = clusters()
+    head = LinearIntentHead()
+    head.fit(features, labels, list(np.array(["a", "b", "c"])))
+    names = [name for name, _ in head.top_k(features[:1], k=3)[0]]
+    assert sorted(names) == ["a", "b", "c"]
+    assert all(type(name) is str for name in names + head.classes)
+
+def test_temperature_softens_overconfident_logits():
+    head = LinearIntentHead()
+    rng = np.random.default_rng(0)
+    labels = rng.integers(0, 3, size=200)
+    # Right only 60% of the time, yet very confident
+    predicted = np.where(rng.random(200) < 0.6, labels, (labels + 1) % 3)
+    logits = 10.0 * np.eye(3)[predicted]
+    assert head._fit_temperature(logits, labels) > 2.0
+
+def test_temperature_stays_near_one_on_a_few_perfect_patterns():
+    head = LinearIntentHead()
+    logits = 5.0 * np.eye(3)
+    assert 0.2 < head._fit_temperature(logits, np.arange(3)) <= 1.0
+
+def test_warm_start_keeps_known_classes_and_temperature():
+    features, labels = clusters(n_classes=3)
+    head = LinearIntentHead()
+    head.fit(features[labels < 2], labels[labels < 2], ["a", "b"])
+    temperature, weights_a = head.temperature, head.weights[:, 0].copy()
+
+    head.fit(features, labels, ["a", "b", "c"], warm_start=True)
+    assert head.classes == ["a", "b", "c"]
+    assert head.temperature == temperature
+    assert np.corrcoef(weights_a, head.weights[:, 0])[0, 1] > 0.5
+    assert (head.predict_proba(features).argmax(axis=1) == labels).mean() > 0.9
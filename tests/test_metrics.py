@@ -0,0 +1,76 @@
+import random
+
+from src.utils.metrics import LatencyHistogram, MetricsRecorder
+
+def test_small_values_are_exact():
+    histogram = LatencyHistogram()
+    for value_us in range(LatencyHistogram.SUB_BUCKETS):
+        assert histogram._value(histogram._index(value_us)) == value_us
+
+def test_bucket_bounds_cover_values_within_relative_error():
+    histogram = LatencyHistogram()
+    rng = random.Random(0)
+    values = [rng.randrange(1, 2 ** LatencyHistogram.MAX_EXPONENT) for _ in range(5000)]
+    values += [2 ** n + d for n in range(5, LatencyHistogram.MAX_EXPONENT) for d in (-1, 0, 1)]
+    previous = -1
+    for value_us in sorted(values):
+        index = histogram._index(value_us)
+        upper = histogram._value(index)
+        assert index >= previous
+        assert value_us <= upper <= value_us * (1 + 1 / LatencyHistogram.SUB_BUCKETS)
+        # The bucket below ends before the value
+        assert index == 0 or histogram._value(index - 1) < value_us
+        previous = index
+
+def test_oversized_values_land_in_the_last_bucket():
+    histogram = LatencyHistogram()
+    histogram.record(10 ** 12)
+    assert histogram.counts[-1] == 1
+    assert histogram.summary()["max"] == 10 ** 12
+
+def test_percentiles_and_summary():
+    histogram = LatencyHistogram()
+    for value_ms in range(1, 101):
+        histogram.record(value_ms, error=value_ms > 98)
+    summary = histogram.summary()
+    assert (summary["count"], summary["errors"]) == (100, 2)
+    assert summary["mean"] == 50.5 and summary["max"] == 100
+    for quantile, expected in (("p50", 50), ("p95", 95), ("p99", 99)):
+        assert expected <= summary[quantile] <= expected * 1.04
+    assert LatencyHistogram().percentiles([0.5, 0.99]) == [0.0, 0.0]
+
+def test_merge_adds_recordings():
+    first, second = LatencyHistogram(), LatencyHistogram()
+    first.record(1)
+    second.record(3, error=True)
+    first.merge(second)
+    assert (first.total, first.errors, first.max_us) == (2, 1, 3000)
+
+def test_recorder_groups_stages_and_intents():
+    recorder = MetricsRecorder()
+    recorder.record("handler", 5, intent="weather")
+    recorder.record("handler", 7)
+    try:
+        with recorder.span("intent.rule"):
+            raise ValueError
+    except ValueError:
+        pass
+    snapshot = recorder.get_snapshot()
+    assert snapshot["stages"]["handler"]["count"] == 2
+    assert snapshot["intents"]["weather"]["handler"]["count"] == 1
+    assert snapshot["stages"]["intent.rule"]["errors"] == 1
+
+def test_recorder_rotates_windows():
+    recorder = MetricsRecorder(window=0)
+    recorder.record("listen", 1)
+    recorder.record("listen", 1)
+    recorder.record("listen", 1)
+    # Only the previous and current windows are summarized
+    assert recorder.get_snapshot()["stages"]["listen"]["count"] == 2
+
+def test_disabled_recorder_is_a_no_op():
+    recorder = MetricsRecorder(enabled=False)
+    recorder.record("listen", 1)
+    with recorder.span("listen"):
+        pass
+    assert recorder.get_snapshot() == {"enabled": False}
@@ -0,0 +1,56 @@
+import numpy as np
+
+from src.nlu.pattern_embeddings import PatternEmbeddingStore
+
+class FakeEncoder:
+    """Deterministic embeddings that count how many texts were encoded"""
+
+    def __init__(self):
+        self.encoded = []
+
+    def __call__(self, texts):
+        self.encoded.extend(texts)
+        return np.stack([np.random.default_rng(abs(hash(text)) % 2**32).normal(size=8) for text in texts])
+
+def intents(**patterns):
+    return {intent: {"patterns": list(values), "responses": ["ok"]} for intent, values in patterns.items()}
+
+def matrices(cache_dir):
+    return sorted(path.name for path in cache_dir.glob("*.npy"))
+
+def test_reloads_persisted_matrix_without_encoding(tmp_path):
+    catalog = intents(greeting=["hello", "hi"], weather=["weather today"])
+    PatternEmbeddingStore("model", cache_dir=str(tmp_path)).sync(catalog, FakeEncoder())
+
+    encoder = FakeEncoder()
+    store = PatternEmbeddingStore("model", cache_dir=str(tmp_path))
+    store.sync(catalog, encoder)
+    assert encoder.encoded == []
+    assert store.matrix.shape == (3, 8)
+    np.testing.assert_allclose(np.linalg.norm(store.matrix, axis=1), 1.0, rtol=1e-5)
+
+def test_stores_with_other_pattern_sets_keep_each_others_matrices(tmp_path):
+    first = PatternEmbeddingStore("model", cache_dir=str(tmp_path))
+    first.sync(intents(greeting=["hello"]), FakeEncoder())
+    second = PatternEmbeddingStore("model", cache_dir=str(tmp_path))
+    second.sync(intents(greeting=["hello"], weather=["rain"]), FakeEncoder())
+    assert len(matrices(tmp_path)) == 2
+
+def test_resync_embeds_only_new_patterns_and_replaces_own_matrix(tmp_path):
+    store = PatternEmbeddingStore("model", cache_dir=str(tmp_path))
+    store.sync(intents(greeting=["hello"]), FakeEncoder())
+    before = matrices(tmp_path)
+
+    encoder = FakeEncoder()
+    store.sync(intents(greeting=["hello"], weather=["rain", "sun"]), encoder)
+    assert encoder.encoded == ["rain", "sun"]
+    after = matrices(tmp_path)
+    assert len(after) == 1 and after != before
+
+def test_intent_scores_average_over_each_intents_patterns():
+    store = PatternEmbeddingStore("model", cache_dir=None)
+    vectors = {"a1": [1, 0], "a2": [0, 1], "b1": [-1, 0]}
+    store.sync(intents(a=["a1", "a2"], b=["b1"]), lambda texts: np.array([vectors[t] for t in texts], dtype=float))
+    scores = store.intent_scores(np.array([[1.0, 0.0]]))
+    assert store.intent_names == ["a", "b"]
+    np.testing.assert_allclose(scores, [[0.5, -1.0]])
@@ -0,0 +1,58 @@
+import random
+
+from src.nlu.pattern_index import PatternIndex, normalize_text
+
+INTENTS = {
+    "greeting": {"patterns": ["Hello there!", "hi", "good morning"]},
+    "weather": {"patterns": ["what's the weather like", "is it going to rain today"]},
+    "farewell": {"patterns": ["goodbye", "see you later"]},
+}
+
+def brute_force(intents, tokens):
+    """Reference scan computing Jaccard similarity against every pattern"""
+    best, best_score = None, 0.0
+    for intent, data in intents.items():
+        for pattern in data["patterns"]:
+            pattern_tokens = set(normalize_text(pattern).split())
+            union = tokens | pattern_tokens
+            score = len(tokens & pattern_tokens) / len(union) if union else 0.0
+            if score > best_score:
+                best, best_score = intent, score
+    return best, best_score
+
+def test_normalize_text_strips_punctuation_and_case():
+    assert normalize_text("  What's   the WEATHER?! ") == "whats the weather"
+
+def test_best_match_scores_jaccard():
+    index = PatternIndex()
+    index.rebuild(INTENTS)
+    assert index.best_match(["hello", "there"]) == ("greeting", 1.0)
+    intent, score = index.best_match(normalize_text("will it rain today").split())
+    assert intent == "weather" and abs(score - 3 / 7) < 1e-9
+
+def test_no_shared_token_means_no_match():
+    index = PatternIndex()
+    index.rebuild(INTENTS)
+    assert index.best_match(["quantum"]) == (None, 0.0)
+
+def test_ties_go_to_the_earliest_pattern():
+    index = PatternIndex()
+    index.rebuild({"first": {"patterns": ["play music"]}, "second": {"patterns": ["play music"]}})
+    assert index.best_match(["play", "music"])[0] == "first"
+
+def test_added_patterns_match_brute_force():
+    rng = random.Random(0)
+    vocabulary = [f"w{i}" for i in range(30)]
+    intents = {}
+    index = PatternIndex()
+    for n in range(20):
+        patterns = [" ".join(rng.sample(vocabulary, rng.randint(1, 5))) for _ in range(3)]
+        intents[f"intent{n}"] = {"patterns": patterns}
+        index.add(f"intent{n}", patterns)
+
+    for _ in range(100):
+        tokens = set(rng.sample(vocabulary, rng.randint(1, 6)))
+        intent, score = index.best_match(tokens)
+        expected_intent, expected_score = brute_force(intents, tokens)
+        assert abs(score - expected_score) < 1e-9
+        assert intent == expected_intent
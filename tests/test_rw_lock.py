@@ -0,0 +1,50 @@
+import threading
+import time
+
+from src.utils.rw_lock import ReadWriteLock
+
+def test_readers_share_the_lock():
+    lock = ReadWriteLock()
+    inside = threading.Barrier(3, timeout=2)
+
+    def reader():
+        with lock.read():
+            inside.wait()
+
+    threads = [threading.Thread(target=reader) for _ in range(3)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(2)
+    assert not any(thread.is_alive() for thread in threads)
+
+def test_writer_excludes_readers_and_goes_first():
+    lock = ReadWriteLock()
+    events = []
+    reading = threading.Event()
+
+    def first_reader():
+        with lock.read():
+            reading.set()
+            time.sleep(0.1)
+            events.append("first read done")
+
+    def writer():
+        with lock.write():
+            events.append("write")
+
+    def late_reader():
+        with lock.read():
+            events.append("late read")
+
+    threads = [threading.Thread(target=first_reader)]
+    threads[0].start()
+    reading.wait(2)
+    threads.append(threading.Thread(target=writer))
+    threads[1].start()
+    time.sleep(0.02)
+    threads.append(threading.Thread(target=late_reader))
+    threads[2].start()
+    for thread in threads:
+        thread.join(2)
+    assert events == ["first read done", "write", "late read"]
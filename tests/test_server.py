@@ -0,0 +1,124 @@
+import json
+import threading
+import time
+import urllib.error
+import urllib.request
+
+import pytest
+
+# Needs the assistant's speech and model dependencies
+AssistantServer = pytest.importorskip("src.server").AssistantServer
+
+class FakeConfig:
+    def get(self, section, key, default=None):
+        return default
+
+class FakeAssistant:
+    """Answers every utterance by echo, holding a turn until release is set"""
+
+    def __init__(self):
+        self.config = FakeConfig()
+        self.release = threading.Event()
+        self.release.set()
+
+    def process_text(self, text, context=None, on_late_result=None):
+        self.release.wait(2)
+        intent = "farewell" if text == "bye" else "echo"
+        context.add_to_history(text, text, intent)
+        if text == "late" and on_late_result is not None:
+            on_late_result(intent, "late result")
+        return {"intent": intent, "response": text}
+
+    def get_status(self):
+        return {"ok": True}
+
+def make_server(**kwargs):
+    kwargs.setdefault("persist_sessions", False)
+    return AssistantServer(FakeAssistant(), port=0, **kwargs)
+
+@pytest.fixture
+def http_server():
+    server = make_server(max_sessions=2)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    while server.httpd is None:
+        time.sleep(0.01)
+    yield server, f"http://127.0.0.1:{server.httpd.server_address[1]}"
+    server.shutdown()
+    thread.join(2)
+
+def request(base, method, path, body=None):
+    data = None if body is None else json.dumps(body).encode("utf-8")
+    try:
+        with urllib.request.urlopen(urllib.request.Request(base + path, data=data, method=method)) as response:
+            payload = response.read()
+            return response.status, json.loads(payload) if payload else None
+    except urllib.error.HTTPError as e:
+        return e.code, json.loads(e.read() or b"null")
+
+def test_session_lifecycle_over_http(http_server):
+    server, base = http_server
+    status, created = request(base, "POST", "/sessions")
+    assert status == 201
+    session_path = f"/sessions/{created['session_id']}"
+
+    status, result = request(base, "POST", session_path + "/messages", {"text": "hello"})
+    assert (status, result["response"], result["session_id"]) == (200, "hello", created["session_id"])
+    status, described = request(base, "GET", session_path)
+    assert status == 200 and described["turns"] == 1 and len(described["history"]) == 1
+
+    assert request(base, "DELETE", session_path)[0] == 204
+    assert request(base, "GET", session_path)[0] == 404
+    assert request(base, "POST", session_path + "/messages", {"text": "hello"})[0] == 404
+    stats = request(base, "GET", "/status")[1]["server"]
+    assert (stats["created"], stats["closed"], stats["open"]) == (1, 1, 0)
+
+def test_session_limit_and_bad_requests(http_server):
+    server, base = http_server
+    first = request(base, "POST", "/sessions")[1]["session_id"]
+    request(base, "POST", "/sessions")
+    assert request(base, "POST", "/sessions")[0] == 503
+    assert request(base, "POST", f"/sessions/{first}/messages", {"message": "hi"})[0] == 400
+    assert request(base, "GET", "/nowhere")[0] == 404
+
+def test_farewell_closes_the_session():
+    server = make_server()
+    session = server.create_session()
+    assert server.handle_message(session, "bye")["session_closed"] is True
+    assert server.get_session(session.session_id) is None
+
+def test_late_results_are_handed_over_once():
+    server = make_server()
+    session = server.create_session()
+    assert server.handle_message(session, "late")["late_responses"] == ["late result"]
+    assert server.describe_session(session)["late_responses"] == []
+
+def test_idle_sessions_are_evicted_but_busy_ones_kept():
+    server = make_server(idle_timeout=0.05)
+    idle, busy = server.create_session(), server.create_session()
+    time.sleep(0.1)
+    with busy.lock:
+        assert server.evict_idle_sessions() == [idle.session_id]
+    assert server.get_session(busy.session_id) is busy
+    assert server.get_stats()["evicted"] == 1
+
+def test_full_server_refuses_new_sessions():
+    server = make_server(max_sessions=1, idle_timeout=None)
+    assert server.create_session() is not None
+    assert server.create_session() is None
+    assert server.get_stats()["rejected"] == 1
+
+def test_messages_beyond_max_inflight_are_refused_as_busy():
+    server = make_server(max_inflight=1, queue_timeout=0.05)
+    first, second = server.create_session(), server.create_session()
+    server.assistant.release.clear()
+    worker = threading.Thread(target=server.handle_message, args=(first, "slow"))
+    worker.start()
+    time.sleep(0.05)
+    try:
+        assert server.handle_message(second, "hello") is None
+        assert server.get_stats()["busy"] == 1
+    finally:
+        server.assistant.release.set()
+        worker.join(2)
+    assert server.handle_message(second, "hello")["response"] == "hello"